@@ -19,6 +19,19 @@ g_vbo_control_points = None
 g_vao_curve_points = None
 g_vbo_curve_points = None
 
+# number of curve points & float32 buffer to store them
+g_num_curve_points = 101
+g_curve_points = None
+
+# cubic Bezier basis matrix
+g_bezier_basis_matrix = np.array([[-1, 3, -3, 1],
+                                  [3, -6, 3, 0],
+                                  [-3, 3, 0, 0],
+                                  [1, 0, 0, 0]], np.float32)
+
+# cache of (num_samples,4) T @ M tables, keyed by num_samples
+g_bezier_basis_tables = {}
+
 g_vertex_shader_src = '''
 #version 330 core
 
@@ -136,8 +149,8 @@ def cursor_callback(window, xpos, ypos):
 
         # generate curve points from updated control points
         # and copy them to g_vbo_curve_points
-        curve_points = generate_curve_points(g_control_points)
-        copy_points_data(curve_points, g_vbo_curve_points)
+        generate_curve_points(g_control_points, g_num_curve_points, g_curve_points)
+        copy_points_data(g_curve_points, g_vbo_curve_points)
 
 def initialize_vao_for_points(points):
     # create and activate VAO (vertex array object)
@@ -149,7 +162,7 @@ def initialize_vao_for_points(points):
     glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
 
     # only allocate VBO and not copy data by specifying the third argument to None
-    vertices = glm.array(points)
+    vertices = points if isinstance(points, np.ndarray) else glm.array(points)
     glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, None, GL_DYNAMIC_DRAW)
 
     # configure vertex attributes
@@ -162,35 +175,40 @@ def initialize_vao_for_points(points):
 def copy_points_data(points, vbo):
     glBindBuffer(GL_ARRAY_BUFFER, vbo)  # activate VBO
 
-    # prepare vertex data (in main memory)
-    vertices = glm.array(points)
-
     # only copy vertex data to VBO and not allocating it
     # glBufferSubData(target, offset, size, data)
-    glBufferSubData(GL_ARRAY_BUFFER, 0, vertices.nbytes, vertices.ptr)
-
-def generate_curve_points(control_points):
-    curve_points = []
-
-    for t in np.linspace(0, 1, 101): # linspace(start, stop, num)
-        T = np.array([t**3, t**2, t, 1])
-
-        # cubic Bezier basis matrix
-        M = np.array([[-1, 3, -3, 1],
-                      [3, -6, 3, 0],
-                      [-3, 3, 0, 0],
-                      [1, 0, 0, 0]], float)
-
-        P = np.array(control_points)
-        p = T @ M @ P
-
-        curve_points.append(glm.vec3(p))
-
-    return curve_points
+    if isinstance(points, np.ndarray):
+        # float32 (N,3) array can be copied as it is
+        glBufferSubData(GL_ARRAY_BUFFER, 0, points.nbytes, points)
+    else:
+        # prepare vertex data (in main memory)
+        vertices = glm.array(points)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, vertices.nbytes, vertices.ptr)
+
+def get_bezier_basis_table(num_samples):
+    # T @ M for all sample parameters t - each row is [t**3, t**2, t, 1] @ M
+    table = g_bezier_basis_tables.get(num_samples)
+    if table is None:
+        t = np.linspace(0, 1, num_samples, dtype=np.float32) # linspace(start, stop, num)
+        T = np.stack([t**3, t**2, t, np.ones_like(t)], axis=1)
+        table = T @ g_bezier_basis_matrix
+        g_bezier_basis_tables[num_samples] = table
+    return table
+
+def generate_curve_points(control_points, num_samples=101, out=None):
+    # curve points = (T @ M) @ P, evaluated for all samples with a single matrix product
+    # out: (num_samples,3) float32 array to store the result, allocated if not given
+    if out is None:
+        out = np.empty((num_samples, 3), np.float32)
+
+    P = np.array(control_points, np.float32)
+    np.matmul(get_bezier_basis_table(num_samples), P, out=out)
+
+    return out
 
 def main():
     global g_vao_control_points, g_vao_curve_points
-    global g_vbo_control_points, g_vbo_curve_points
+    global g_vbo_control_points, g_vbo_curve_points, g_curve_points
 
     # initialize glfw
     if not glfwInit():
@@ -224,11 +242,11 @@ def main():
     copy_points_data(g_control_points, g_vbo_control_points)
 
     # generate initial curve points
-    curve_points = generate_curve_points(g_control_points)
+    g_curve_points = generate_curve_points(g_control_points, g_num_curve_points)
 
     # prepare curve points vao & vbo
-    g_vao_curve_points, g_vbo_curve_points = initialize_vao_for_points(curve_points)
-    copy_points_data(curve_points, g_vbo_curve_points)
+    g_vao_curve_points, g_vbo_curve_points = initialize_vao_for_points(g_curve_points)
+    copy_points_data(g_curve_points, g_vbo_curve_points)
 
     # set point size (for drawing control points)
     glPointSize(20)
@@ -254,7 +272,7 @@ def main():
         # draw curve
         glUniform3f(unif_locs['color'], 1, 1, 1)
         glBindVertexArray(g_vao_curve_points)
-        glDrawArrays(GL_LINE_STRIP, 0, len(curve_points))
+        glDrawArrays(GL_LINE_STRIP, 0, len(g_curve_points))
 
         # swap front and back buffers
         glfwSwapBuffers(window)
@@ -0,0 +1,461 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import numpy as np
+
+WINDOW_WIDTH = 800
+WINDOW_HEIGHT = 800
+
+# basis matrices of cubic splines (for T = [t**3, t**2, t, 1])
+# and the index step between the first control points of consecutive segments
+g_spline_types = {
+    'bezier': (np.array([[-1, 3, -3, 1],
+                         [3, -6, 3, 0],
+                         [-3, 3, 0, 0],
+                         [1, 0, 0, 0]], np.float32), 3),
+    'catmull-rom': (np.array([[-1, 3, -3, 1],
+                              [2, -5, 4, -1],
+                              [-1, 0, 1, 0],
+                              [0, 2, 0, 0]], np.float32) / 2, 1),
+    'b-spline': (np.array([[-1, 3, -3, 1],
+                           [3, -6, 3, 0],
+                           [-3, 0, 3, 0],
+                           [1, 4, 1, 0]], np.float32) / 6, 1),
+}
+
+g_spline = None
+g_num_segments = 8
+g_moving_index = None
+
+# spatial index for picking control points & picking radius in pixels
+g_control_point_grid = None
+g_hit_radius = 10
+
+# adaptive tessellation - max distance between the curve and its polyline in pixels
+g_use_adaptive = False
+g_flatness_tolerance = .25
+
+g_vao_control_points = None
+g_vbo_control_points = None
+g_vao_curve_points = None
+g_vbo_curve_points = None
+g_vbo_curve_points_capacity = 0   # number of points g_vbo_curve_points can hold
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos;
+
+uniform mat4 MVP;
+
+void main()
+{
+    gl_Position = MVP * vec4(vin_pos, 1.0);
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+out vec4 FragColor;
+
+uniform vec3 color;
+
+void main()
+{
+    FragColor = vec4(color, 1.0);
+}
+'''
+
+# cubic Bezier basis matrix, used to convert segments of any spline type to the Bezier form
+g_bezier_basis_matrix = g_spline_types['bezier'][0]
+
+class Spline:
+    # piecewise cubic spline over an arbitrary number of control points
+    # segment i is evaluated from control points [step*i, step*i+3]
+    # tolerance: None for fixed num_samples_per_segment points per segment,
+    #            or the max distance between the curve and its polyline for adaptive tessellation
+    def __init__(self, spline_type, control_points, tolerance=None, num_samples_per_segment=32):
+        self.spline_type = spline_type
+        self.basis_matrix, self.step = g_spline_types[spline_type]
+        self.control_points = np.array(control_points, np.float32)  # (N,3)
+        self.tolerance = tolerance
+        self.num_samples = num_samples_per_segment
+
+        # M_bezier^-1 @ M - converts the control points of a segment to its Bezier control points
+        self.to_bezier = np.linalg.inv(g_bezier_basis_matrix) @ self.basis_matrix
+
+        # curve points of all segments - segment i occupies rows [offsets[i], offsets[i+1])
+        self.num_segments = (len(self.control_points) - 4) // self.step + 1
+        self.counts = np.zeros(self.num_segments, np.int64)
+        self.offsets = np.zeros(self.num_segments + 1, np.int64)
+        self.curve_points = np.empty((0, 3), np.float32)
+        self.tessellate_segments(0, self.num_segments)
+
+    def get_segment_control_points(self, first, last):
+        # (last-first,4,3) control points of segments [first, last)
+        indices = self.step * np.arange(first, last)[:, np.newaxis] + np.arange(4)
+        return self.control_points[indices]
+
+    def get_sample_counts(self, G):
+        if self.tolerance is None:
+            return np.full(len(G), self.num_samples, np.int64)
+
+        # Wang's formula: a cubic Bezier curve evaluated at n+1 uniform parameters deviates from
+        # the polyline by at most tolerance if n >= sqrt(3*2 / (8*tolerance) * max|b[k] - 2*b[k+1] + b[k+2]|)
+        B = self.to_bezier @ G
+        second_diffs = B[:, :2] - 2*B[:, 1:3] + B[:, 2:]
+        L = np.linalg.norm(second_diffs, axis=2).max(axis=1)
+        n = np.ceil(np.sqrt(6. / (8. * self.tolerance) * L))
+        return np.clip(n, 1, 1024).astype(np.int64) + 1
+
+    def tessellate_segments(self, first, last):
+        # re-evaluate segments [first, last)
+        # returns the range of changed curve point rows [start, end)
+        G = self.get_segment_control_points(first, last)
+        counts = self.get_sample_counts(G)
+
+        # sample parameters of all segments at once - each segment has its own number of samples
+        segment_ids = np.repeat(np.arange(last - first), counts)
+        starts = np.cumsum(counts) - counts
+        t = ((np.arange(len(segment_ids)) - starts[segment_ids]) / (counts[segment_ids] - 1)).astype(np.float32)
+        T = np.stack([t**3, t**2, t, np.ones_like(t)], axis=1)
+
+        # p = (T @ M) @ G for each sample, evaluated together
+        W = T @ self.basis_matrix
+        points = np.einsum('kj,kjd->kd', W, G[segment_ids]).astype(np.float32)
+
+        start = self.offsets[first]
+        if np.array_equal(counts, self.counts[first:last]):
+            # same number of points - overwrite in place, only this range is changed
+            self.curve_points[start : start + len(points)] = points
+            return start, start + len(points)
+        else:
+            # number of points changed - all the following points are shifted
+            self.curve_points = np.concatenate([self.curve_points[:start], points, self.curve_points[self.offsets[last]:]])
+            self.counts[first:last] = counts
+            self.offsets[1:] = np.cumsum(self.counts)
+            return start, len(self.curve_points)
+
+    def get_affected_segments(self, index):
+        # segments that use the index-th control point: step*i <= index <= step*i + 3
+        first = max(0, -((3 - index) // self.step))    # ceil((index-3) / step)
+        last = min(self.num_segments, index // self.step + 1)
+        return first, last
+
+    def move_control_point(self, index, pos):
+        # update a control point and re-tessellate only the segments using it
+        # returns the range of changed curve point rows [start, end)
+        self.control_points[index] = pos
+        first, last = self.get_affected_segments(index)
+        return self.tessellate_segments(first, last)
+
+    def get_points_data(self, start, end):
+        # curve points of rows [start, end) and their byte offset in the whole curve point buffer
+        data = self.curve_points[start:end]
+        offset = start * self.curve_points.itemsize * 3
+        return offset, data
+
+class ControlPointGrid:
+    # uniform grid over control point screen positions for picking
+    # each cell keeps the indices of the control points inside it
+    def __init__(self, points, cell_size):
+        self.points = points    # (N,3) array, shared with the spline and updated in place
+        self.cell_size = cell_size
+        self.cell_keys = np.floor(points[:, :2] / cell_size).astype(np.int64)  # (N,2) cell of each point
+        self.cells = {}
+        for i, key in enumerate(map(tuple, self.cell_keys)):
+            self.cells.setdefault(key, []).append(i)
+
+    def update_point(self, index):
+        # move index-th point to its new cell, call after self.points[index] is changed
+        new_key = np.floor(self.points[index, :2] / self.cell_size).astype(np.int64)
+        old_key = self.cell_keys[index]
+        if np.array_equal(new_key, old_key):
+            return
+
+        cell = self.cells[tuple(old_key)]
+        cell.remove(index)
+        if not cell:
+            del self.cells[tuple(old_key)]
+        self.cells.setdefault(tuple(new_key), []).append(index)
+        self.cell_keys[index] = new_key
+
+    def query(self, x, y, radius):
+        # index of the nearest point with |dx| < radius and |dy| < radius, or None
+        # only the cells overlapping the query box are visited
+        x0, y0 = np.floor((np.array([x, y]) - radius) / self.cell_size).astype(np.int64)
+        x1, y1 = np.floor((np.array([x, y]) + radius) / self.cell_size).astype(np.int64)
+        candidates = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                candidates.extend(self.cells.get((cx, cy), ()))
+        if not candidates:
+            return None
+
+        # distance test for all candidates at once
+        candidates = np.array(candidates)
+        dists = np.abs(self.points[candidates, :2] - (x, y)).max(axis=1)
+        hit = dists < radius
+        if not np.any(hit):
+            return None
+        return int(candidates[hit][np.argmin(dists[hit])])
+
+def generate_control_points(num_segments, step):
+    # control points on a sine wave across the window
+    num_points = step * (num_segments - 1) + 4
+    x = np.linspace(50, WINDOW_WIDTH-50, num_points)
+    y = WINDOW_HEIGHT/2 + 150*np.sin(x / 40)
+    return np.stack([x, y, np.zeros_like(x)], axis=1).astype(np.float32)
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def get_projection_matrix():
+    # to make our camera space to have the same size as glfw screen space
+    return glm.ortho(0,WINDOW_WIDTH, 0,WINDOW_HEIGHT, -1,1)
+
+def get_tolerance():
+    if not g_use_adaptive:
+        return None
+    # convert g_flatness_tolerance in pixels to camera space units
+    # P[0][0] scales x to NDC [-1,1], which is then mapped to WINDOW_WIDTH pixels
+    pixels_per_unit = get_projection_matrix()[0][0] * WINDOW_WIDTH / 2
+    return g_flatness_tolerance / pixels_per_unit
+
+def key_callback(window, key, scancode, action, mods):
+    global g_num_segments, g_use_adaptive, g_flatness_tolerance
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    elif action==GLFW_PRESS:
+        # change spline type
+        if key==GLFW_KEY_1:
+            reset_spline('bezier', g_spline.control_points)
+        elif key==GLFW_KEY_2:
+            reset_spline('catmull-rom', g_spline.control_points)
+        elif key==GLFW_KEY_3:
+            reset_spline('b-spline', g_spline.control_points)
+
+        # change the number of segments (control points are regenerated)
+        elif key==GLFW_KEY_UP or key==GLFW_KEY_DOWN:
+            if key==GLFW_KEY_UP:
+                g_num_segments = min(g_num_segments * 2, 4096)
+            else:
+                g_num_segments = max(g_num_segments // 2, 1)
+            reset_spline(g_spline.spline_type, generate_control_points(g_num_segments, g_spline.step))
+
+        # toggle adaptive tessellation / change its tolerance
+        elif key==GLFW_KEY_A:
+            g_use_adaptive = not g_use_adaptive
+            reset_spline(g_spline.spline_type, g_spline.control_points)
+        elif key==GLFW_KEY_LEFT_BRACKET or key==GLFW_KEY_RIGHT_BRACKET:
+            if key==GLFW_KEY_LEFT_BRACKET:
+                g_flatness_tolerance = max(g_flatness_tolerance / 2, 1/64)
+            else:
+                g_flatness_tolerance = min(g_flatness_tolerance * 2, 16)
+            reset_spline(g_spline.spline_type, g_spline.control_points)
+
+def button_callback(window, button, action, mod):
+    global g_moving_index
+
+    if button==GLFW_MOUSE_BUTTON_LEFT:
+        x, y = glfwGetCursorPos(window)
+
+        # convert from glfw screen coordinates (relative to the top-left corner)
+        # to our camera space coordinates (relative to bottom-left corner)
+        y = WINDOW_HEIGHT - y
+
+        if action==GLFW_PRESS:
+            g_moving_index = g_control_point_grid.query(x, y, g_hit_radius)
+
+        elif action==GLFW_RELEASE:
+            g_moving_index = None
+
+def cursor_callback(window, xpos, ypos):
+    ypos = WINDOW_HEIGHT - ypos
+
+    if g_moving_index is not None:
+
+        # update the moving control point position and re-tessellate the affected segments only
+        start, end = g_spline.move_control_point(g_moving_index, (xpos, ypos, 0))
+        g_control_point_grid.update_point(g_moving_index)
+
+        # copy the moved control point only to g_vbo_control_points
+        point = g_spline.control_points[g_moving_index]
+        copy_points_data(point, g_vbo_control_points, g_moving_index * point.nbytes)
+
+        # copy the changed curve points only to g_vbo_curve_points
+        update_curve_points_vbo(start, end)
+
+def update_curve_points_vbo(start, end):
+    global g_vbo_curve_points_capacity
+
+    glBindBuffer(GL_ARRAY_BUFFER, g_vbo_curve_points)
+
+    # reallocate VBO only when the number of curve points exceeds its capacity
+    num_points = len(g_spline.curve_points)
+    if num_points > g_vbo_curve_points_capacity:
+        g_vbo_curve_points_capacity = max(num_points, 2 * g_vbo_curve_points_capacity)
+        glBufferData(GL_ARRAY_BUFFER, g_vbo_curve_points_capacity * 3 * glm.sizeof(glm.float32), None, GL_DYNAMIC_DRAW)
+        start, end = 0, num_points
+
+    offset, curve_points = g_spline.get_points_data(start, end)
+    copy_points_data(curve_points, g_vbo_curve_points, offset)
+
+def initialize_vao_for_points(points):
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # only allocate VBO and not copy data by specifying the third argument to None
+    glBufferData(GL_ARRAY_BUFFER, points.nbytes, None, GL_DYNAMIC_DRAW)
+
+    # configure vertex attributes
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 3 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # return VBO along with VAO as it is needed when copying updated point position to VBO
+    return VAO, VBO
+
+def copy_points_data(points, vbo, offset=0):
+    glBindBuffer(GL_ARRAY_BUFFER, vbo)  # activate VBO
+
+    # only copy vertex data (float32 numpy array) to the byte range [offset, offset+points.nbytes) of VBO
+    # glBufferSubData(target, offset, size, data)
+    glBufferSubData(GL_ARRAY_BUFFER, offset, points.nbytes, points)
+
+def reset_spline(spline_type, control_points):
+    global g_spline, g_moving_index, g_control_point_grid
+    global g_vao_control_points, g_vao_curve_points
+    global g_vbo_control_points, g_vbo_curve_points, g_vbo_curve_points_capacity
+
+    g_spline = Spline(spline_type, control_points, get_tolerance())
+    g_control_point_grid = ControlPointGrid(g_spline.control_points, 2 * g_hit_radius)
+    g_moving_index = None
+
+    # the number of points may change - recreate vaos & vbos
+    if g_vao_control_points is not None:
+        glDeleteVertexArrays(2, [g_vao_control_points, g_vao_curve_points])
+        glDeleteBuffers(2, [g_vbo_control_points, g_vbo_curve_points])
+
+    # prepare control points vao & vbo
+    g_vao_control_points, g_vbo_control_points = initialize_vao_for_points(g_spline.control_points)
+    copy_points_data(g_spline.control_points, g_vbo_control_points)
+
+    # prepare curve points vao & vbo
+    g_vao_curve_points, g_vbo_curve_points = initialize_vao_for_points(g_spline.curve_points)
+    g_vbo_curve_points_capacity = len(g_spline.curve_points)
+    copy_points_data(g_spline.curve_points, g_vbo_curve_points)
+
+def main():
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(WINDOW_WIDTH, WINDOW_HEIGHT, '2-interactive-spline', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+    glfwSetMouseButtonCallback(window, button_callback)
+    glfwSetCursorPosCallback(window, cursor_callback)
+
+    # load shaders & get uniform locations
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+    unif_names = ['color', 'MVP']
+    unif_locs = {}
+    for name in unif_names:
+        unif_locs[name] = glGetUniformLocation(shader_program, name)
+
+    # create the initial spline and its vaos & vbos
+    reset_spline('bezier', generate_control_points(g_num_segments, 3))
+
+    # set point size (for drawing control points)
+    glPointSize(10)
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        glClear(GL_COLOR_BUFFER_BIT)
+
+        glUseProgram(shader_program)
+
+        # projection matrix & set MVP uniform
+        P = get_projection_matrix()
+        MVP = P
+        glUniformMatrix4fv(unif_locs['MVP'], 1, GL_FALSE, glm.value_ptr(MVP))
+
+        # draw control polygon
+        glUniform3f(unif_locs['color'], 0, 1, 0)
+        glBindVertexArray(g_vao_control_points)
+        glDrawArrays(GL_LINE_STRIP, 0, len(g_spline.control_points))
+        glDrawArrays(GL_POINTS, 0, len(g_spline.control_points))
+
+        # draw curve
+        glUniform3f(unif_locs['color'], 1, 1, 1)
+        glBindVertexArray(g_vao_curve_points)
+        glDrawArrays(GL_LINE_STRIP, 0, len(g_spline.curve_points))
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+
+WINDOW_WIDTH = 800
+WINDOW_HEIGHT = 800
+
+g_control_points = [
+    glm.vec3(250, 350, 0),
+    glm.vec3(350, 450, 0),
+    glm.vec3(450, 450, 0),
+    glm.vec3(550, 350, 0),
+    ]
+g_moving_index = None
+
+g_vao_control_points = None
+g_vbo_control_points = None
+
+# number of curve points evaluated on the GPU
+g_num_curve_points = 101
+
+# True: evaluate the curve in the tessellation shaders (OpenGL 4.0+) / False: in the geometry shader
+g_use_tessellation = False
+g_tessellation_available = False
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos;
+
+uniform mat4 MVP;
+
+void main()
+{
+    gl_Position = MVP * vec4(vin_pos, 1.0);
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+out vec4 FragColor;
+
+uniform vec3 color;
+
+void main()
+{
+    FragColor = vec4(color, 1.0);
+}
+'''
+
+# control points are passed to the next stage as they are (MVP is applied after the curve evaluation)
+g_vertex_shader_src_curve = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos;
+
+void main()
+{
+    gl_Position = vec4(vin_pos, 1.0);
+}
+'''
+
+# geometry shader version - 4 control points are drawn as a GL_LINES_ADJACENCY primitive
+g_geometry_shader_src_curve = '''
+#version 330 core
+
+layout (lines_adjacency) in;
+layout (line_strip, max_vertices = 256) out;
+
+uniform mat4 MVP;
+uniform int num_curve_points;
+
+void main()
+{
+    int n = clamp(num_curve_points, 2, 256);
+    for (int i = 0; i < n; i++)
+    {
+        float t = float(i) / float(n - 1);
+        float s = 1.0 - t;
+
+        // cubic Bezier basis functions
+        vec4 p = s*s*s * gl_in[0].gl_Position
+               + 3.0*s*s*t * gl_in[1].gl_Position
+               + 3.0*s*t*t * gl_in[2].gl_Position
+               + t*t*t * gl_in[3].gl_Position;
+
+        gl_Position = MVP * p;
+        EmitVertex();
+    }
+    EndPrimitive();
+}
+'''
+
+# tessellation shader version - 4 control points are drawn as a patch
+g_tess_control_shader_src_curve = '''
+#version 400 core
+
+layout (vertices = 4) out;
+
+uniform int num_curve_points;
+
+void main()
+{
+    gl_out[gl_InvocationID].gl_Position = gl_in[gl_InvocationID].gl_Position;
+
+    // isolines: level 0 is the number of lines, level 1 is the number of line segments per line
+    gl_TessLevelOuter[0] = 1.0;
+    gl_TessLevelOuter[1] = float(num_curve_points - 1);
+}
+'''
+
+g_tess_evaluation_shader_src_curve = '''
+#version 400 core
+
+layout (isolines, equal_spacing) in;
+
+uniform mat4 MVP;
+
+void main()
+{
+    float t = gl_TessCoord.x;
+    float s = 1.0 - t;
+
+    // cubic Bezier basis functions
+    vec4 p = s*s*s * gl_in[0].gl_Position
+           + 3.0*s*s*t * gl_in[1].gl_Position
+           + 3.0*s*t*t * gl_in[2].gl_Position
+           + t*t*t * gl_in[3].gl_Position;
+
+    gl_Position = MVP * p;
+}
+'''
+
+def compile_shader(shader_type, shader_source, shader_name):
+    shader = glCreateShader(shader_type)    # create an empty shader object
+    glShaderSource(shader, shader_source)   # provide shader source code
+    glCompileShader(shader)                 # compile the shader object
+
+    # check for shader compile errors
+    success = glGetShaderiv(shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(shader)
+        print("ERROR::SHADER::" + shader_name + "::COMPILATION_FAILED\n" + infoLog.decode())
+
+    return shader
+
+def load_shaders(vertex_shader_source, fragment_shader_source, geometry_shader_source=None,
+                 tess_control_shader_source=None, tess_evaluation_shader_source=None):
+    # build and compile our shader program
+    # ------------------------------------
+
+    # compile all given shader stages
+    stages = [
+        (GL_VERTEX_SHADER, vertex_shader_source, 'VERTEX'),
+        (GL_TESS_CONTROL_SHADER, tess_control_shader_source, 'TESS_CONTROL'),
+        (GL_TESS_EVALUATION_SHADER, tess_evaluation_shader_source, 'TESS_EVALUATION'),
+        (GL_GEOMETRY_SHADER, geometry_shader_source, 'GEOMETRY'),
+        (GL_FRAGMENT_SHADER, fragment_shader_source, 'FRAGMENT'),
+    ]
+    shaders = []
+    for shader_type, shader_source, shader_name in stages:
+        if shader_source is not None:
+            shaders.append(compile_shader(shader_type, shader_source, shader_name))
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    for shader in shaders:
+        glAttachShader(shader_program, shader)       # attach the shader objects to the program object
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+
+    for shader in shaders:
+        glDeleteShader(shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_num_curve_points, g_use_tessellation
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    elif action==GLFW_PRESS or action==GLFW_REPEAT:
+        # change the number of curve points - only a uniform is changed
+        if key==GLFW_KEY_UP:
+            g_num_curve_points = min(g_num_curve_points + 10, get_max_curve_points())
+        elif key==GLFW_KEY_DOWN:
+            g_num_curve_points = max(g_num_curve_points - 10, 2)
+
+        # switch between geometry shader & tessellation shaders
+        elif key==GLFW_KEY_T and action==GLFW_PRESS and g_tessellation_available:
+            g_use_tessellation = not g_use_tessellation
+            g_num_curve_points = min(g_num_curve_points, get_max_curve_points())
+
+def get_max_curve_points():
+    if g_use_tessellation:
+        # max tessellation level (at least 64) + 1
+        return int(glGetIntegerv(GL_MAX_TESS_GEN_LEVEL)) + 1
+    else:
+        # max_vertices of the geometry shader
+        return 256
+
+def hittest(x, y, control_point):
+    if glm.abs(x-control_point.x)<10 and glm.abs(y-control_point.y)<10:
+        return True
+    else:
+        return False
+
+def button_callback(window, button, action, mod):
+    global g_control_points, g_moving_index
+
+    if button==GLFW_MOUSE_BUTTON_LEFT:
+        x, y = glfwGetCursorPos(window)
+
+        # convert from glfw screen coordinates (relative to the top-left corner)
+        # to our camera space coordinates (relative to bottom-left corner)
+        y = WINDOW_HEIGHT - y
+
+        if action==GLFW_PRESS:
+            g_moving_index = None
+            for i in range(len(g_control_points)):
+                if hittest(x, y, g_control_points[i]):
+                    g_moving_index = i
+                    break
+
+        elif action==GLFW_RELEASE:
+            g_moving_index = None
+
+def cursor_callback(window, xpos, ypos):
+    global g_control_points, g_moving_index
+    global g_vbo_control_points
+
+    ypos = WINDOW_HEIGHT - ypos
+
+    if g_moving_index is not None:
+
+        # update the moving control point position
+        g_control_points[g_moving_index].x = xpos
+        g_control_points[g_moving_index].y = ypos
+
+        # copy updateded control point positions to g_vbo_control_points
+        # the curve is evaluated from them on the GPU - only 4 * 12 bytes are copied
+        copy_points_data(g_control_points, g_vbo_control_points)
+
+def initialize_vao_for_points(points):
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # only allocate VBO and not copy data by specifying the third argument to None
+    vertices = glm.array(points)
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, None, GL_DYNAMIC_DRAW)
+
+    # configure vertex attributes
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 3 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # return VBO along with VAO as it is needed when copying updated point position to VBO
+    return VAO, VBO
+
+def copy_points_data(points, vbo):
+    glBindBuffer(GL_ARRAY_BUFFER, vbo)  # activate VBO
+
+    # prepare vertex data (in main memory)
+    vertices = glm.array(points)
+
+    # only copy vertex data to VBO and not allocating it
+    # glBufferSubData(target, offset, size, data)
+    glBufferSubData(GL_ARRAY_BUFFER, 0, vertices.nbytes, vertices.ptr)
+
+def create_window():
+    # try OpenGL 4.1 first for tessellation shaders (4.1 is the highest version on macOS),
+    # then fall back to OpenGL 3.3 with geometry shaders only
+    for major, minor in [(4, 1), (3, 3)]:
+        glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, major)
+        glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, minor)
+        glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+        glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+        # create a window and OpenGL context
+        window = glfwCreateWindow(WINDOW_WIDTH, WINDOW_HEIGHT, '3-gpu-bezier', None, None)
+        if window:
+            return window
+    return None
+
+def main():
+    global g_vao_control_points, g_vbo_control_points
+    global g_tessellation_available
+
+    # initialize glfw
+    if not glfwInit():
+        return
+
+    # create a window and OpenGL context
+    window = create_window()
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+    glfwSetMouseButtonCallback(window, button_callback)
+    glfwSetCursorPosCallback(window, cursor_callback)
+
+    # load shaders & get uniform locations
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+    unif_names = ['color', 'MVP']
+    unif_locs = {}
+    for name in unif_names:
+        unif_locs[name] = glGetUniformLocation(shader_program, name)
+
+    shader_curve_geometry = load_shaders(g_vertex_shader_src_curve, g_fragment_shader_src,
+                                         geometry_shader_source=g_geometry_shader_src_curve)
+    unif_names = ['color', 'MVP', 'num_curve_points']
+    unif_locs_curve_geometry = {}
+    for name in unif_names:
+        unif_locs_curve_geometry[name] = glGetUniformLocation(shader_curve_geometry, name)
+
+    # tessellation shaders are only available in OpenGL 4.0+
+    g_tessellation_available = glGetIntegerv(GL_MAJOR_VERSION) >= 4
+    if g_tessellation_available:
+        shader_curve_tessellation = load_shaders(g_vertex_shader_src_curve, g_fragment_shader_src,
+                                                 tess_control_shader_source=g_tess_control_shader_src_curve,
+                                                 tess_evaluation_shader_source=g_tess_evaluation_shader_src_curve)
+        unif_locs_curve_tessellation = {}
+        for name in unif_names:
+            unif_locs_curve_tessellation[name] = glGetUniformLocation(shader_curve_tessellation, name)
+
+        # a patch consists of 4 control points
+        glPatchParameteri(GL_PATCH_VERTICES, 4)
+
+    # prepare control points vao & vbo
+    # the same vao is used for both of drawing the control polygon and the curve
+    g_vao_control_points, g_vbo_control_points = initialize_vao_for_points(g_control_points)
+    copy_points_data(g_control_points, g_vbo_control_points)
+
+    # set point size (for drawing control points)
+    glPointSize(20)
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        glClear(GL_COLOR_BUFFER_BIT)
+
+        # projection matrix & MVP
+        # to make our camera space to have the same size as glfw screen space
+        P = glm.ortho(0,WINDOW_WIDTH, 0,WINDOW_HEIGHT, -1,1)
+        MVP = P
+
+        # draw control polygon
+        glUseProgram(shader_program)
+        glUniformMatrix4fv(unif_locs['MVP'], 1, GL_FALSE, glm.value_ptr(MVP))
+        glUniform3f(unif_locs['color'], 0, 1, 0)
+        glBindVertexArray(g_vao_control_points)
+        glDrawArrays(GL_LINE_LOOP, 0, len(g_control_points))
+        glDrawArrays(GL_POINTS, 0, len(g_control_points))
+
+        # draw curve - evaluated on the GPU from the 4 control points
+        if g_use_tessellation:
+            glUseProgram(shader_curve_tessellation)
+            unif_locs_curve = unif_locs_curve_tessellation
+        else:
+            glUseProgram(shader_curve_geometry)
+            unif_locs_curve = unif_locs_curve_geometry
+        glUniformMatrix4fv(unif_locs_curve['MVP'], 1, GL_FALSE, glm.value_ptr(MVP))
+        glUniform3f(unif_locs_curve['color'], 1, 1, 1)
+        glUniform1i(unif_locs_curve['num_curve_points'], g_num_curve_points)
+        glBindVertexArray(g_vao_control_points)
+        if g_use_tessellation:
+            glDrawArrays(GL_PATCHES, 0, 4)
+        else:
+            glDrawArrays(GL_LINES_ADJACENCY, 0, 4)
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import numpy as np
+from PIL import Image
+
+g_cam_ang = 0.
+g_cam_height = 3.
+
+# textures packed into a single texture array; the cube grid cycles through them
+g_texture_paths = [
+    './320px-Solarsystemscope_texture_8k_earth_daymap.jpg',
+    './320px-Solarsystemscope_texture_8k_earth_daymap-grayscale.jpg',
+    './plain-checkerboard.jpg',
+]
+g_grid_size = 4
+
+# size of each texture array layer. larger images are scaled down to fit
+g_layer_width = 512
+g_layer_height = 512
+
+# max number of layers (size of the uv_scales uniform array)
+g_max_layers = 64
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+layout (location = 2) in vec2 vin_uv; 
+
+out vec2 vout_uv;
+
+uniform mat4 MVP;
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_uv = vin_uv;
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+in vec2 vout_uv;  // interpolated texture coordinates
+
+out vec4 FragColor;
+
+uniform sampler2DArray texture_array;
+uniform int layer;
+uniform vec2 uv_scales[%d];  // part of each layer covered by its image
+
+void main()
+{
+    FragColor = texture(texture_array, vec3(vout_uv * uv_scales[layer], layer));
+}
+'''%g_max_layers
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += 1.
+            elif key==GLFW_KEY_W:
+                g_cam_height += -1.
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 36 vertices for 12 triangles
+    vertices = glm.array(glm.float32,
+        # position     # normal  # texture coordinates
+        -1 ,  1 ,  1 ,  0, 0, 1,  0.0, 1.0,  # v0
+         1 , -1 ,  1 ,  0, 0, 1,  1.0, 0.0,  # v2
+         1 ,  1 ,  1 ,  0, 0, 1,  1.0, 1.0,  # v1
+
+        -1 ,  1 ,  1 ,  0, 0, 1,  0.0, 1.0,  # v0
+        -1 , -1 ,  1 ,  0, 0, 1,  0.0, 0.0,  # v3
+         1 , -1 ,  1 ,  0, 0, 1,  1.0, 0.0,  # v2
+
+        -1 ,  1 , -1 ,  0, 0,-1,  0.0, 1.0,  # v4
+         1 ,  1 , -1 ,  0, 0,-1,  1.0, 1.0,  # v5
+         1 , -1 , -1 ,  0, 0,-1,  1.0, 0.0,  # v6
+                                             
+        -1 ,  1 , -1 ,  0, 0,-1,  0.0, 1.0,  # v4
+         1 , -1 , -1 ,  0, 0,-1,  1.0, 0.0,  # v6
+        -1 , -1 , -1 ,  0, 0,-1,  0.0, 0.0,  # v7
+
+        -1 ,  1 ,  1 ,  0, 1, 0,  0.0, 1.0,  # v0
+         1 ,  1 ,  1 ,  0, 1, 0,  1.0, 1.0,  # v1
+         1 ,  1 , -1 ,  0, 1, 0,  1.0, 0.0,  # v5
+                                             
+        -1 ,  1 ,  1 ,  0, 1, 0,  0.0, 1.0,  # v0
+         1 ,  1 , -1 ,  0, 1, 0,  1.0, 0.0,  # v5
+        -1 ,  1 , -1 ,  0, 1, 0,  0.0, 0.0,  # v4
+ 
+        -1 , -1 ,  1 ,  0,-1, 0,  0.0, 1.0,  # v3
+         1 , -1 , -1 ,  0,-1, 0,  1.0, 0.0,  # v6
+         1 , -1 ,  1 ,  0,-1, 0,  1.0, 1.0,  # v2
+                                             
+        -1 , -1 ,  1 ,  0,-1, 0,  0.0, 1.0,  # v3
+        -1 , -1 , -1 ,  0,-1, 0,  0.0, 0.0,  # v7
+         1 , -1 , -1 ,  0,-1, 0,  1.0, 0.0,  # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0,  1.0, 1.0,  # v1
+         1 , -1 ,  1 ,  1, 0, 0,  0.0, 1.0,  # v2
+         1 , -1 , -1 ,  1, 0, 0,  0.0, 0.0,  # v6
+                                             
+         1 ,  1 ,  1 ,  1, 0, 0,  1.0, 1.0,  # v1
+         1 , -1 , -1 ,  1, 0, 0,  0.0, 0.0,  # v6
+         1 ,  1 , -1 ,  1, 0, 0,  1.0, 0.0,  # v5
+
+        -1 ,  1 ,  1 , -1, 0, 0,  1.0, 1.0,  # v0
+        -1 , -1 , -1 , -1, 0, 0,  0.0, 0.0,  # v7
+        -1 , -1 ,  1 , -1, 0, 0,  0.0, 1.0,  # v3
+                                             
+        -1 ,  1 ,  1 , -1, 0, 0,  1.0, 1.0,  # v0
+        -1 ,  1 , -1 , -1, 0, 0,  1.0, 0.0,  # v4
+        -1 , -1 , -1 , -1, 0, 0,  0.0, 0.0,  # v7
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    # configure texture coordinates
+    glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(6*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(2)
+
+    return VAO
+
+def load_image(path):
+    img = Image.open(path)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    # vertically filp the image 
+    # because OpenGL expects 0.0 on y-axis to be on the bottom edge, but images usually have 0.0 at the top of the y-axis
+    img = img.transpose(Image.FLIP_TOP_BOTTOM)
+
+    # scale down images larger than a layer, keeping the aspect ratio
+    scale = min(1., g_layer_width / img.width, g_layer_height / img.height)
+    if scale < 1.:
+        img = img.resize((max(1, int(img.width*scale)), max(1, int(img.height*scale))), Image.BOX)
+
+    pixels = np.asarray(img)
+    img.close()
+    return pixels
+
+class TextureArrayPacker:
+    # packs RGB images into the layers of one GL_TEXTURE_2D_ARRAY, one image per layer.
+    # each image sits at the bottom-left corner of its layer; the rest of the layer is filled by
+    # repeating the image's edge pixels so that mipmaps and linear filtering do not bleed in other colors.
+    # shaders scale texture coordinates by get_uv_scale(layer).
+    def __init__(self, layer_width, layer_height):
+        self.layer_width = layer_width
+        self.layer_height = layer_height
+        self.images = []
+
+    def add(self, pixels):
+        # pixels: (height, width, 3) uint8 array no larger than a layer. return the layer index
+        height, width = pixels.shape[:2]
+        assert width <= self.layer_width and height <= self.layer_height
+        assert len(self.images) < g_max_layers
+        self.images.append(pixels)
+        return len(self.images) - 1
+
+    def get_uv_scale(self, layer):
+        height, width = self.images[layer].shape[:2]
+        return width / self.layer_width, height / self.layer_height
+
+    def get_occupancy(self):
+        # fraction of layer texels covered by images
+        if not self.images:
+            return 0.
+        used = sum(pixels.shape[0]*pixels.shape[1] for pixels in self.images)
+        return used / (len(self.images)*self.layer_width*self.layer_height)
+
+    def get_memory_bytes(self):
+        # GPU memory of all layers including the mip chain (about 4/3 of level 0), assuming 4 bytes per texel
+        return len(self.images)*self.layer_width*self.layer_height*4*4//3
+
+    def build(self):
+        texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D_ARRAY, texture)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+
+        # allocate all layers at once
+        glTexImage3D(GL_TEXTURE_2D_ARRAY, 0, GL_RGB8, self.layer_width, self.layer_height, len(self.images), 0, GL_RGB, GL_UNSIGNED_BYTE, None)
+
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        for layer, pixels in enumerate(self.images):
+            height, width = pixels.shape[:2]
+            padded = np.pad(pixels, ((0, self.layer_height-height), (0, self.layer_width-width), (0, 0)), mode='edge')
+            glTexSubImage3D(GL_TEXTURE_2D_ARRAY, 0, 0, 0, layer, self.layer_width, self.layer_height, 1, GL_RGB, GL_UNSIGNED_BYTE, padded)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+
+        glGenerateMipmap(GL_TEXTURE_2D_ARRAY)
+        return texture
+
+def main():
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '10-texture-array', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+
+    # get uniform locations
+    loc_MVP = glGetUniformLocation(shader_program, 'MVP')
+    loc_layer = glGetUniformLocation(shader_program, 'layer')
+    loc_uv_scales = glGetUniformLocation(shader_program, 'uv_scales')
+
+    # prepare vaos
+    vao_cube = prepare_vao_cube()
+
+    ############################################
+    # pack all textures into one texture array
+
+    packer = TextureArrayPacker(g_layer_width, g_layer_height)
+    layers = []
+    for path in g_texture_paths:
+        try:
+            layers.append(packer.add(load_image(path)))
+        except:
+            print("Failed to load texture")
+    if not layers:
+        # no image could be loaded - use a single white texel so the cubes are still drawn
+        layers.append(packer.add(np.full((1, 1, 3), 255, np.uint8)))
+    texture_array = packer.build()
+
+    print('texture array: %d layers of %dx%d, %.1f%% occupancy, %.2f MB'%(len(layers), g_layer_width, g_layer_height, packer.get_occupancy()*100, packer.get_memory_bytes()/(1<<20)))
+
+    ############################################
+
+    glUseProgram(shader_program)
+    uv_scales = np.array([packer.get_uv_scale(layer) for layer in layers], np.float32)
+    glUniform2fv(loc_uv_scales, len(layers), uv_scales)
+
+    # the texture array stays bound for all draw calls
+    glUniform1i(glGetUniformLocation(shader_program, 'texture_array'), 0)
+    glActiveTexture(GL_TEXTURE0)
+    glBindTexture(GL_TEXTURE_2D_ARRAY, texture_array)
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        # projection matrix
+        P = glm.perspective(45, 1, 1, 50)
+
+        # view matrix
+        view_pos = glm.vec3(10*np.sin(g_cam_ang),g_cam_height,10*np.cos(g_cam_ang))
+        V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+        # draw cube grid; switching textures only changes the layer uniform, no texture rebinds
+        glUseProgram(shader_program)
+        glBindVertexArray(vao_cube)
+        for i in range(g_grid_size):
+            for j in range(g_grid_size):
+                M = glm.translate(glm.vec3(2*(i - (g_grid_size-1)*.5), 2*(j - (g_grid_size-1)*.5), 0)) * glm.scale(glm.vec3(.7,.7,.7))
+                MVP = P*V*M
+                glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
+                glUniform1i(loc_layer, layers[(i*g_grid_size + j) % len(layers)])
+                glDrawArrays(GL_TRIANGLES, 0, 36)
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
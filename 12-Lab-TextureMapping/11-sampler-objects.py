@@ -0,0 +1,354 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import numpy as np
+from PIL import Image
+
+g_cam_ang = 0.
+g_cam_height = .1
+
+# filter modes cycled with the F key: (name, min filter, mag filter, max anisotropy)
+g_filter_modes = [
+    ('nearest', GL_NEAREST, GL_NEAREST, 1.),
+    ('linear', GL_LINEAR, GL_LINEAR, 1.),
+    ('trilinear', GL_LINEAR_MIPMAP_LINEAR, GL_LINEAR, 1.),
+    ('anisotropic x16', GL_LINEAR_MIPMAP_LINEAR, GL_LINEAR, 16.),
+]
+g_filter_mode_index = 2
+
+# wrap mode of each of the four triangles
+g_wrap_modes = [GL_REPEAT, GL_MIRRORED_REPEAT, GL_CLAMP_TO_EDGE, GL_CLAMP_TO_BORDER]
+
+# GL_TEXTURE_MAX_ANISOTROPY / GL_MAX_TEXTURE_MAX_ANISOTROPY (core in 4.6, GL_EXT_texture_filter_anisotropic before)
+g_GL_TEXTURE_MAX_ANISOTROPY = 0x84FE
+g_GL_MAX_TEXTURE_MAX_ANISOTROPY = 0x84FF
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_color; 
+layout (location = 2) in vec2 vin_uv; 
+
+out vec4 vout_color;
+out vec2 vout_uv;
+
+uniform mat4 MVP;
+
+void main()
+{
+    // 3D points in homogeneous coordinates
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_color = vec4(vin_color, 1.);
+    vout_uv = vin_uv;
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+in vec4 vout_color;
+in vec2 vout_uv;  // interpolated texture coordinates
+
+out vec4 FragColor;
+
+uniform sampler2D texture1;
+
+void main()
+{
+    FragColor = texture(texture1, vout_uv);
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height, g_filter_mode_index
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+            elif key==GLFW_KEY_F and action==GLFW_PRESS:
+                g_filter_mode_index = (g_filter_mode_index + 1) % len(g_filter_modes)
+
+def prepare_vao_triangle():
+    # prepare vertex data (in main memory)
+    vertices = glm.array(glm.float32,
+        # position      # color         # texture coordinates
+         0.0, 0.0, 0.0,  1.0, 0.0, 0.0,  -.5, -.5,  # v0
+         0.5, 0.0, 0.0,  0.0, 1.0, 0.0,  2.0, -.5,  # v1
+         0.0, 0.5, 0.0,  0.0, 0.0, 1.0,  -.5, 2.0,  # v2
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex colors
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    # configure texture coordinates
+    glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(6*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(2)
+
+    return VAO
+
+
+
+def has_extension(name):
+    for i in range(glGetIntegerv(GL_NUM_EXTENSIONS)):
+        if glGetStringi(GL_EXTENSIONS, i).decode() == name:
+            return True
+    return False
+
+class SamplerRegistry:
+    # sampler objects keyed by (min filter, mag filter, wrap s, wrap t, max anisotropy).
+    # a sampler bound to a texture unit overrides the sampling parameters of the texture bound to it,
+    # so changing how a texture is filtered only means binding another (cached) sampler.
+    def __init__(self):
+        self.samplers = {}
+        self.max_anisotropy = 1.
+        if has_extension('GL_EXT_texture_filter_anisotropic') or has_extension('GL_ARB_texture_filter_anisotropic'):
+            self.max_anisotropy = glGetFloatv(g_GL_MAX_TEXTURE_MAX_ANISOTROPY)
+
+    def get(self, min_filter, mag_filter, wrap_s, wrap_t, anisotropy=1.):
+        anisotropy = min(anisotropy, self.max_anisotropy)
+        key = (min_filter, mag_filter, wrap_s, wrap_t, anisotropy)
+        sampler = self.samplers.get(key)
+        if sampler is None:
+            sampler = glGenSamplers(1)
+            glSamplerParameteri(sampler, GL_TEXTURE_MIN_FILTER, min_filter)
+            glSamplerParameteri(sampler, GL_TEXTURE_MAG_FILTER, mag_filter)
+            glSamplerParameteri(sampler, GL_TEXTURE_WRAP_S, wrap_s)
+            glSamplerParameteri(sampler, GL_TEXTURE_WRAP_T, wrap_t)
+            if anisotropy > 1.:
+                glSamplerParameterf(sampler, g_GL_TEXTURE_MAX_ANISOTROPY, anisotropy)
+            self.samplers[key] = sampler
+        return sampler
+
+    def delete(self):
+        for sampler in self.samplers.values():
+            glDeleteSamplers(1, [sampler])
+        self.samplers = {}
+
+class TextureBindingCache:
+    # remembers the active texture unit and what is bound to each unit,
+    # and skips glActiveTexture / glBindTexture / glBindSampler calls that would not change anything.
+    # call reset() if textures or samplers were bound without going through the cache.
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.active_unit = None
+        self.textures = {}  # (unit, target) -> texture
+        self.samplers = {}  # unit -> sampler
+        self.num_calls = 0
+        self.num_skipped = 0
+
+    def reset_stats(self):
+        self.num_calls = 0
+        self.num_skipped = 0
+
+    def activate(self, unit):
+        if self.active_unit == unit:
+            self.num_skipped += 1
+            return
+        glActiveTexture(GL_TEXTURE0 + unit)
+        self.active_unit = unit
+        self.num_calls += 1
+
+    def bind(self, unit, target, texture, sampler=0):
+        if self.textures.get((unit, target)) == texture:
+            self.num_skipped += 1
+        else:
+            self.activate(unit)
+            glBindTexture(target, texture)
+            self.textures[(unit, target)] = texture
+            self.num_calls += 1
+
+        # glBindSampler takes the unit index directly, no need to activate the unit
+        if self.samplers.get(unit) == sampler:
+            self.num_skipped += 1
+        else:
+            glBindSampler(unit, sampler)
+            self.samplers[unit] = sampler
+            self.num_calls += 1
+
+def main():
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '11-sampler-objects', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+
+    # get uniform locations
+    loc_MVP = glGetUniformLocation(shader_program, 'MVP')
+    
+    # prepare vaos
+    vao_triangle = prepare_vao_triangle()
+
+    ############################################
+    # texture
+
+    # create texture
+    # filtering and wrap parameters are not set on the texture; they come from sampler objects
+    texture1 = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture1)
+
+    try:
+        img = Image.open('./320px-Solarsystemscope_texture_8k_earth_daymap.jpg')
+        
+        # vertically filp the image 
+        # because OpenGL expects 0.0 on y-axis to be on the bottom edge, but images usually have 0.0 at the top of the y-axis
+        img = img.transpose(Image.FLIP_TOP_BOTTOM)
+
+        # glTexImage2D(target, level, texture internalformat, width, height, border, image data format, image data type, data)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, img.width, img.height, 0, GL_RGB, GL_UNSIGNED_BYTE, img.tobytes())
+    
+        # generate mipmaps
+        glGenerateMipmap(GL_TEXTURE_2D)
+
+        img.close()
+
+    except:
+        print("Failed to load texture")
+
+    ############################################
+
+    sampler_registry = SamplerRegistry()
+    binding_cache = TextureBindingCache()
+
+    glUseProgram(shader_program)
+    glUniform1i(glGetUniformLocation(shader_program, 'texture1'), 0)
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        glUseProgram(shader_program)
+
+        # projection matrix
+        # use orthogonal projection (we'll see details later)
+        P = glm.ortho(-1,1,-1,1,-1,1)
+
+        # view matrix
+        # rotate camera position with g_cam_ang / move camera up & down with g_cam_height
+        V = glm.lookAt(glm.vec3(.1*np.sin(g_cam_ang),g_cam_height,.1*np.cos(g_cam_ang)), glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+        # switching the filter mode only selects other samplers; texture1 is never modified
+        name, min_filter, mag_filter, anisotropy = g_filter_modes[g_filter_mode_index]
+
+        # draw one triangle per wrap mode, in the four quadrants
+        binding_cache.reset_stats()
+        glBindVertexArray(vao_triangle)
+        for i, wrap in enumerate(g_wrap_modes):
+            sampler = sampler_registry.get(min_filter, mag_filter, wrap, wrap, anisotropy)
+            binding_cache.bind(0, GL_TEXTURE_2D, texture1, sampler)
+
+            # modeling matrix
+            M = glm.translate(glm.vec3(-.9 + (i%2), -.9 + (i//2), 0)) * glm.scale(glm.vec3(1.6,1.6,1.6))
+
+            # current frame: P*V*M
+            MVP = P*V*M
+            glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
+
+            # draw triangle w.r.t. the current frame
+            glDrawArrays(GL_TRIANGLES, 0, 3)
+
+        glfwSetWindowTitle(window, '11-sampler-objects (%s, %d binding calls, %d skipped)'%(name, binding_cache.num_calls, binding_cache.num_skipped))
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    sampler_registry.delete()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
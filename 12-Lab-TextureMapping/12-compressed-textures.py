@@ -0,0 +1,640 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import os
+import struct
+import hashlib
+import numpy as np
+from PIL import Image
+
+g_cam_ang = 0.
+g_cam_height = .1
+
+# compressed textures (block data of the full mip chain) are cached here
+g_texture_cache_dir = './texture_cache'
+
+# cache file header: magic, block format, width, height, num_levels, source size, source mtime (ns), source sha256
+# followed by the compressed blocks of each mip level (level 0 first)
+g_compressed_cache_magic = b'BCC1'
+g_compressed_cache_header = struct.Struct('<4sIIIIQQ32s')
+
+# block formats: BC1 (DXT1) for RGB images, BC3 (DXT5) for RGBA images
+g_BC1 = 0
+g_BC3 = 1
+g_block_bytes = {g_BC1: 8, g_BC3: 16}
+
+# GL_EXT_texture_compression_s3tc internal formats
+g_GL_COMPRESSED_RGB_S3TC_DXT1_EXT = 0x83F0
+g_GL_COMPRESSED_RGBA_S3TC_DXT5_EXT = 0x83F3
+
+# show compressed (True) or uncompressed (False) textures; toggled with the C key
+g_show_compressed = True
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+layout (location = 2) in vec2 vin_uv; 
+
+out vec3 vout_surface_pos;
+out vec3 vout_normal;
+out vec2 vout_uv;
+
+uniform mat4 MVP;
+uniform mat4 M;
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_surface_pos = vec3(M * vec4(vin_pos, 1));
+    vout_normal = normalize( mat3(inverse(transpose(M)) ) * vin_normal);
+    vout_uv = vin_uv;
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+in vec3 vout_surface_pos;
+in vec3 vout_normal;  // interpolated normal
+in vec2 vout_uv;  // interpolated texture coordinates
+
+out vec4 FragColor;
+
+uniform vec3 view_pos;
+uniform sampler2D texture_diffuse;
+uniform sampler2D texture_specular;
+
+void main()
+{
+    // light and material properties
+    vec3 light_pos = vec3(3,2,4);
+    vec3 light_color = vec3(1,1,1);
+
+    //vec3 material_color = vec3(1,0,0);
+    vec3 material_color = vec3(texture(texture_diffuse, vout_uv));
+
+    float material_shininess = 32.0;
+
+    // light components
+    vec3 light_ambient = 0.1*light_color;
+    vec3 light_diffuse = light_color;
+    vec3 light_specular = light_color;
+
+    // material components
+    vec3 material_ambient = material_color;
+    vec3 material_diffuse = material_color;
+
+    //vec3 material_specular = vec3(1,1,1);  // for non-metal material
+    vec3 material_specular = vec3(texture(texture_specular, vout_uv));
+
+    // ambient
+    vec3 ambient = light_ambient * material_ambient;
+
+    // for diffiuse and specular
+    vec3 normal = normalize(vout_normal);
+    vec3 surface_pos = vout_surface_pos;
+    vec3 light_dir = normalize(light_pos - surface_pos);
+
+    // diffuse
+    float diff = max(dot(normal, light_dir), 0);
+    vec3 diffuse = diff * light_diffuse * material_diffuse;
+
+    // specular
+    vec3 view_dir = normalize(view_pos - surface_pos);
+    vec3 reflect_dir = reflect(-light_dir, normal);
+    float spec = pow( max(dot(view_dir, reflect_dir), 0.0), material_shininess);
+    vec3 specular = spec * light_specular * material_specular;
+
+    vec3 color = ambient + diffuse + specular;
+    FragColor = vec4(color, 1.);
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height, g_show_compressed
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+            elif key==GLFW_KEY_C and action==GLFW_PRESS:
+                g_show_compressed = not g_show_compressed
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 36 vertices for 12 triangles
+    vertices = glm.array(glm.float32,
+        # position     # normal  # texture coordinates
+        -1 ,  1 ,  1 ,  0, 0, 1,  0.0, 1.0,  # v0
+         1 , -1 ,  1 ,  0, 0, 1,  1.0, 0.0,  # v2
+         1 ,  1 ,  1 ,  0, 0, 1,  1.0, 1.0,  # v1
+
+        -1 ,  1 ,  1 ,  0, 0, 1,  0.0, 1.0,  # v0
+        -1 , -1 ,  1 ,  0, 0, 1,  0.0, 0.0,  # v3
+         1 , -1 ,  1 ,  0, 0, 1,  1.0, 0.0,  # v2
+
+        -1 ,  1 , -1 ,  0, 0,-1,  0.0, 1.0,  # v4
+         1 ,  1 , -1 ,  0, 0,-1,  1.0, 1.0,  # v5
+         1 , -1 , -1 ,  0, 0,-1,  1.0, 0.0,  # v6
+                                             
+        -1 ,  1 , -1 ,  0, 0,-1,  0.0, 1.0,  # v4
+         1 , -1 , -1 ,  0, 0,-1,  1.0, 0.0,  # v6
+        -1 , -1 , -1 ,  0, 0,-1,  0.0, 0.0,  # v7
+
+        -1 ,  1 ,  1 ,  0, 1, 0,  0.0, 1.0,  # v0
+         1 ,  1 ,  1 ,  0, 1, 0,  1.0, 1.0,  # v1
+         1 ,  1 , -1 ,  0, 1, 0,  1.0, 0.0,  # v5
+                                             
+        -1 ,  1 ,  1 ,  0, 1, 0,  0.0, 1.0,  # v0
+         1 ,  1 , -1 ,  0, 1, 0,  1.0, 0.0,  # v5
+        -1 ,  1 , -1 ,  0, 1, 0,  0.0, 0.0,  # v4
+ 
+        -1 , -1 ,  1 ,  0,-1, 0,  0.0, 1.0,  # v3
+         1 , -1 , -1 ,  0,-1, 0,  1.0, 0.0,  # v6
+         1 , -1 ,  1 ,  0,-1, 0,  1.0, 1.0,  # v2
+                                             
+        -1 , -1 ,  1 ,  0,-1, 0,  0.0, 1.0,  # v3
+        -1 , -1 , -1 ,  0,-1, 0,  0.0, 0.0,  # v7
+         1 , -1 , -1 ,  0,-1, 0,  1.0, 0.0,  # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0,  1.0, 1.0,  # v1
+         1 , -1 ,  1 ,  1, 0, 0,  0.0, 1.0,  # v2
+         1 , -1 , -1 ,  1, 0, 0,  0.0, 0.0,  # v6
+                                             
+         1 ,  1 ,  1 ,  1, 0, 0,  1.0, 1.0,  # v1
+         1 , -1 , -1 ,  1, 0, 0,  0.0, 0.0,  # v6
+         1 ,  1 , -1 ,  1, 0, 0,  1.0, 0.0,  # v5
+
+        -1 ,  1 ,  1 , -1, 0, 0,  1.0, 1.0,  # v0
+        -1 , -1 , -1 , -1, 0, 0,  0.0, 0.0,  # v7
+        -1 , -1 ,  1 , -1, 0, 0,  0.0, 1.0,  # v3
+                                             
+        -1 ,  1 ,  1 , -1, 0, 0,  1.0, 1.0,  # v0
+        -1 ,  1 , -1 , -1, 0, 0,  1.0, 0.0,  # v4
+        -1 , -1 , -1 , -1, 0, 0,  0.0, 0.0,  # v7
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    # configure texture coordinates
+    glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(6*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(2)
+
+    return VAO
+
+def get_texture_cache_path(path):
+    # one cache file per source file
+    key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(g_texture_cache_dir, key + '.bc')
+
+def hash_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1<<20), b''):
+            h.update(chunk)
+    return h.digest()
+
+def get_mip_level_size(width, height, level):
+    return max(1, width >> level), max(1, height >> level)
+
+def get_num_mip_levels(width, height):
+    return int(np.floor(np.log2(max(width, height)))) + 1
+
+def build_mip_chain(img):
+    # img: flipped PIL image. return a list of (height, width, channels) uint8 arrays, level 0 first
+    levels = [np.asarray(img)]
+    for level in range(1, get_num_mip_levels(img.width, img.height)):
+        levels.append(np.asarray(img.resize(get_mip_level_size(img.width, img.height, level), Image.BOX)))
+    return levels
+
+def has_extension(name):
+    for i in range(glGetIntegerv(GL_NUM_EXTENSIONS)):
+        if glGetStringi(GL_EXTENSIONS, i).decode() == name:
+            return True
+    return False
+
+def get_blocks(pixels):
+    # split a (height, width, channels) image into 4x4 blocks: return a (num_blocks, 16, channels) float32 array.
+    # the image is padded to a multiple of 4 by repeating edge pixels; blocks are ordered row by row from row 0
+    height, width, channels = pixels.shape
+    padded = np.pad(pixels, ((0, -height % 4), (0, -width % 4), (0, 0)), mode='edge')
+    nby, nbx = padded.shape[0]//4, padded.shape[1]//4
+    blocks = padded.reshape(nby, 4, nbx, 4, channels).transpose(0, 2, 1, 3, 4)
+    return blocks.reshape(nby*nbx, 16, channels).astype(np.float32)
+
+def pack_rgb565(colors):
+    # colors: (..., 3) float in [0, 255]. return (rgb565 uint16 values, the 8-bit colors they decode to)
+    r = np.round(colors[..., 0]*(31/255)).astype(np.uint16)
+    g = np.round(colors[..., 1]*(63/255)).astype(np.uint16)
+    b = np.round(colors[..., 2]*(31/255)).astype(np.uint16)
+    packed = (r << 11) | (g << 5) | b
+    decoded = np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)], axis=-1).astype(np.float32)
+    return packed, decoded
+
+def encode_bc1_blocks(rgb):
+    # rgb: (num_blocks, 16, 3) float32. return (num_blocks, 8) uint8 BC1 color blocks (always in 4-color mode)
+    num_blocks = rgb.shape[0]
+
+    # endpoints: extremes of the block's colors along their principal axis (found by power iteration)
+    mean = rgb.mean(axis=1)
+    d = rgb - mean[:, None, :]
+    cov = np.einsum('nki,nkj->nij', d, d)
+    axis = np.ones((num_blocks, 3), np.float32)
+    for i in range(8):
+        new_axis = np.einsum('nij,nj->ni', cov, axis)
+        norm = np.linalg.norm(new_axis, axis=1, keepdims=True)
+        axis = np.where(norm > 1e-6, new_axis / np.maximum(norm, 1e-6), axis)
+    t = np.einsum('nki,ni->nk', d, axis)
+    endpoint0 = np.clip(mean + axis*t.max(axis=1, keepdims=True), 0, 255)
+    endpoint1 = np.clip(mean + axis*t.min(axis=1, keepdims=True), 0, 255)
+
+    c0, color0 = pack_rgb565(endpoint0)
+    c1, color1 = pack_rgb565(endpoint1)
+
+    # 4-color mode requires c0 > c1
+    swap = c0 < c1
+    c0, c1 = np.where(swap, c1, c0), np.where(swap, c0, c1)
+    color0, color1 = np.where(swap[:, None], color1, color0), np.where(swap[:, None], color0, color1)
+
+    # pick the closest of the 4 palette colors for each texel.
+    # one palette entry at a time, so temporaries stay the size of rgb instead of 4x
+    palette = [color0, color1, (2*color0 + color1)/3, (color0 + 2*color1)/3]
+    indices = np.zeros(rgb.shape[:2], np.uint32)
+    best_dist = ((rgb - palette[0][:, None, :])**2).sum(axis=-1)
+    for k in range(1, 4):
+        dist = ((rgb - palette[k][:, None, :])**2).sum(axis=-1)
+        closer = dist < best_dist   # ties keep the earlier entry, like argmin
+        indices[closer] = k
+        best_dist = np.minimum(best_dist, dist)
+    indices[c0 == c1] = 0  # single color block
+
+    blocks = np.empty(num_blocks, np.dtype([('c0', '<u2'), ('c1', '<u2'), ('indices', '<u4')]))
+    blocks['c0'] = c0
+    blocks['c1'] = c1
+    blocks['indices'] = (indices << (2*np.arange(16, dtype=np.uint32))).sum(axis=1, dtype=np.uint32)
+    return blocks.view(np.uint8).reshape(num_blocks, 8)
+
+def encode_bc3_alpha_blocks(alpha):
+    # alpha: (num_blocks, 16) float32. return (num_blocks, 8) uint8 BC3 alpha blocks (8-alpha mode)
+    num_blocks = alpha.shape[0]
+    a0 = alpha.max(axis=1).round()
+    a1 = alpha.min(axis=1).round()
+
+    # palette: a0, a1 and 6 values interpolated between them
+    weights = np.array([0, 7, 1, 2, 3, 4, 5, 6], np.float32) / 7
+    palette = a0[:, None]*(1 - weights) + a1[:, None]*weights
+    indices = np.abs(alpha[:, :, None] - palette[:, None, :]).argmin(axis=-1).astype(np.uint64)
+    indices[a0 == a1] = 0
+
+    bits = (indices << (3*np.arange(16, dtype=np.uint64))).sum(axis=1, dtype=np.uint64)
+    blocks = np.empty((num_blocks, 8), np.uint8)
+    blocks[:, 0] = a0
+    blocks[:, 1] = a1
+    blocks[:, 2:] = bits.astype('<u8').view(np.uint8).reshape(num_blocks, 8)[:, :6]
+    return blocks
+
+def encode_blocks(pixels):
+    # pixels: (height, width, 3 or 4) uint8 array. return (block format, compressed bytes as a uint8 array)
+    blocks = get_blocks(pixels)
+    color = encode_bc1_blocks(blocks[:, :, :3])
+    if pixels.shape[2] == 3:
+        return g_BC1, color.reshape(-1)
+    alpha = encode_bc3_alpha_blocks(blocks[:, :, 3])
+    return g_BC3, np.concatenate([alpha, color], axis=1).reshape(-1)
+
+def get_compressed_level_nbytes(block_format, width, height, level):
+    w, h = get_mip_level_size(width, height, level)
+    return ((w + 3)//4) * ((h + 3)//4) * g_block_bytes[block_format]
+
+def write_compressed_cache(cache_path, block_format, width, height, levels, source_size, source_mtime, source_hash):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    # write to a temporary file first so that a partially written cache file is never read
+    tmp_path = cache_path + '.tmp%d'%os.getpid()
+    with open(tmp_path, 'wb') as f:
+        f.write(g_compressed_cache_header.pack(g_compressed_cache_magic, block_format, width, height, len(levels),
+                                               source_size, source_mtime, source_hash))
+        for level in levels:
+            f.write(level.data)
+    os.replace(tmp_path, cache_path)
+
+def open_compressed_cache(cache_path, path):
+    # return (block format, width, height, levels) memory-mapped from the cache file, or None if the entry is missing or stale
+    try:
+        with open(cache_path, 'rb') as f:
+            header = f.read(g_compressed_cache_header.size)
+    except OSError:
+        return None
+    if len(header) != g_compressed_cache_header.size:
+        return None
+
+    magic, block_format, width, height, num_levels, source_size, source_mtime, source_hash = g_compressed_cache_header.unpack(header)
+    if magic != g_compressed_cache_magic or block_format not in g_block_bytes:
+        return None
+
+    # cheap check first; only hash the source if its mtime changed but the size did not
+    stat = os.stat(path)
+    if stat.st_size != source_size:
+        return None
+    if stat.st_mtime_ns != source_mtime:
+        if hash_file(path) != source_hash:
+            return None
+        # same content - record the new mtime so the next start skips hashing (optional, e.g. the cache may be read-only)
+        try:
+            with open(cache_path, 'r+b') as f:
+                f.write(g_compressed_cache_header.pack(magic, block_format, width, height, num_levels,
+                                                       source_size, stat.st_mtime_ns, source_hash))
+        except OSError:
+            pass
+
+    data = np.memmap(cache_path, dtype=np.uint8, mode='r', offset=g_compressed_cache_header.size)
+    levels = []
+    offset = 0
+    for level in range(num_levels):
+        nbytes = get_compressed_level_nbytes(block_format, width, height, level)
+        if offset + nbytes > data.size:
+            return None
+        levels.append(data[offset:offset+nbytes])
+        offset += nbytes
+    return block_format, width, height, levels
+
+def load_image(path):
+    img = Image.open(path)
+    img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+
+    # vertically filp the image 
+    # because OpenGL expects 0.0 on y-axis to be on the bottom edge, but images usually have 0.0 at the top of the y-axis
+    img = img.transpose(Image.FLIP_TOP_BOTTOM)
+    return img
+
+def load_compressed_levels(path):
+    # return (block format, width, height, levels, cache_hit); levels are uint8 arrays of compressed blocks
+    cache_path = get_texture_cache_path(path)
+    cached = open_compressed_cache(cache_path, path)
+    if cached is not None:
+        return cached + (True,)
+
+    # cache miss: decode, build the mip chain and compress every level, then store it
+    stat = os.stat(path)
+    img = load_image(path)
+    levels = []
+    for pixels in build_mip_chain(img):
+        block_format, data = encode_blocks(pixels)
+        levels.append(data)
+    width, height = img.width, img.height
+    img.close()
+
+    try:
+        write_compressed_cache(cache_path, block_format, width, height, levels, stat.st_size, stat.st_mtime_ns, hash_file(path))
+    except OSError:
+        print("Failed to write texture cache")
+    return block_format, width, height, levels, False
+
+def set_texture_filter():
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST_MIPMAP_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+
+def create_compressed_texture(path):
+    # return (texture, GPU memory in bytes)
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    set_texture_filter()
+
+    nbytes = 0
+    try:
+        block_format, width, height, levels, cache_hit = load_compressed_levels(path)
+        internal_format = g_GL_COMPRESSED_RGB_S3TC_DXT1_EXT if block_format == g_BC1 else g_GL_COMPRESSED_RGBA_S3TC_DXT5_EXT
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, len(levels)-1)
+
+        # compressed blocks are uploaded as they are; the GPU decodes them when sampling
+        for level, data in enumerate(levels):
+            w, h = get_mip_level_size(width, height, level)
+            glCompressedTexImage2D(GL_TEXTURE_2D, level, internal_format, w, h, 0, data)
+        nbytes = sum(data.size for data in levels)
+
+    except:
+        print("Failed to load texture")
+    return texture, nbytes
+
+def create_uncompressed_texture(path):
+    # return (texture, GPU memory in bytes); fallback when S3TC is not available
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    set_texture_filter()
+
+    nbytes = 0
+    try:
+        img = load_image(path)
+        format = GL_RGBA if img.mode == 'RGBA' else GL_RGB
+
+        # glTexImage2D(target, level, texture internalformat, width, height, border, image data format, image data type, data)
+        glTexImage2D(GL_TEXTURE_2D, 0, format, img.width, img.height, 0, format, GL_UNSIGNED_BYTE, img.tobytes())
+
+        # generate mipmaps
+        glGenerateMipmap(GL_TEXTURE_2D)
+
+        # assume the driver stores 4 bytes per texel; the mip chain adds about 1/3
+        nbytes = img.width*img.height*4*4//3
+        img.close()
+
+    except:
+        print("Failed to load texture")
+    return texture, nbytes
+
+def main():
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '12-compressed-textures', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+
+    # get uniform locations
+    loc_MVP = glGetUniformLocation(shader_program, 'MVP')
+    loc_M = glGetUniformLocation(shader_program, 'M')
+    loc_view_pos = glGetUniformLocation(shader_program, 'view_pos')
+
+    # prepare vaos
+    vao_cube = prepare_vao_cube()
+
+
+    glUseProgram(shader_program)
+
+    ############################################
+    # load textures - compressed (BC1/BC3) if the driver supports S3TC, uncompressed for comparison
+
+    diffuse_path = './320px-Solarsystemscope_texture_8k_earth_daymap.jpg'
+    specular_path = './plain-checkerboard.jpg'
+    # specular_path = './320px-Solarsystemscope_texture_8k_earth_daymap-grayscale.jpg'
+
+    uncompressed_diffuse, uncompressed_diffuse_nbytes = create_uncompressed_texture(diffuse_path)
+    uncompressed_specular, uncompressed_specular_nbytes = create_uncompressed_texture(specular_path)
+    uncompressed_nbytes = uncompressed_diffuse_nbytes + uncompressed_specular_nbytes
+
+    if has_extension('GL_EXT_texture_compression_s3tc'):
+        compressed_diffuse, compressed_diffuse_nbytes = create_compressed_texture(diffuse_path)
+        compressed_specular, compressed_specular_nbytes = create_compressed_texture(specular_path)
+        compressed_nbytes = compressed_diffuse_nbytes + compressed_specular_nbytes
+    else:
+        print("S3TC texture compression is not supported - using uncompressed textures")
+        compressed_diffuse, compressed_specular, compressed_nbytes = uncompressed_diffuse, uncompressed_specular, uncompressed_nbytes
+
+    show_compressed = None
+
+    ############################################
+
+    # for i-th texture unit, sampler uniform variable value should be i
+    glUniform1i(glGetUniformLocation(shader_program, 'texture_diffuse'), 0)
+    glUniform1i(glGetUniformLocation(shader_program, 'texture_specular'), 1)
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        # bind compressed or uncompressed textures
+        if show_compressed != g_show_compressed:
+            show_compressed = g_show_compressed
+            if show_compressed:
+                texture_diffuse, texture_specular, nbytes = compressed_diffuse, compressed_specular, compressed_nbytes
+            else:
+                texture_diffuse, texture_specular, nbytes = uncompressed_diffuse, uncompressed_specular, uncompressed_nbytes
+
+            # activate i-th texture unit by passing GL_TEXTUREi
+            glActiveTexture(GL_TEXTURE0)
+            # texture object is binded on this activated texture unit
+            glBindTexture(GL_TEXTURE_2D, texture_diffuse)
+            glActiveTexture(GL_TEXTURE1)
+            glBindTexture(GL_TEXTURE_2D, texture_specular)
+
+            glfwSetWindowTitle(window, '12-compressed-textures (%s, %.2f MB)'%('compressed' if show_compressed else 'uncompressed', nbytes/(1<<20)))
+
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        # projection matrix
+        P = glm.perspective(45, 1, 1, 20)
+
+        # view matrix
+        view_pos = glm.vec3(5*np.sin(g_cam_ang),g_cam_height,5*np.cos(g_cam_ang))
+        V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+
+        # animating
+        t = glfwGetTime()
+
+        # rotation
+        th = np.radians(t*90)
+        R = glm.rotate(th, glm.vec3(0,1,0))
+
+        M = glm.mat4()
+
+        # # try applying rotation
+        # M = R
+
+        # update uniforms
+        MVP = P*V*M
+        glUseProgram(shader_program)
+        glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
+        glUniformMatrix4fv(loc_M, 1, GL_FALSE, glm.value_ptr(M))
+        glUniform3f(loc_view_pos, view_pos.x, view_pos.y, view_pos.z)
+
+        # draw cube w.r.t. the current frame MVP
+        glBindVertexArray(vao_cube)
+        glDrawArrays(GL_TRIANGLES, 0, 36)
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import os
+import sys
+import time
+import hashlib
+import numpy as np
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+
+g_cam_ang = 0.
+g_cam_height = .1
+
+# textures whose mip chains are generated on the CPU
+g_texture_paths = [
+    './320px-Solarsystemscope_texture_8k_earth_daymap.jpg',
+    './plain-checkerboard.jpg',
+]
+g_texture_index = 0
+
+# mip generation modes cycled with the M key: (filter, gamma-correct sRGB filtering). filter None means glGenerateMipmap
+g_mip_modes = [
+    (None, False),
+    ('box', False),
+    ('kaiser', False),
+    ('lanczos', False),
+    ('lanczos', True),
+]
+g_mip_mode_index = 0
+
+# pregenerated mip chains are stored here (run "python 13-cpu-mipmaps.py pregenerate")
+g_mip_cache_dir = './texture_cache'
+
+# set by the B key; the benchmark runs in the render loop
+g_run_benchmark = False
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_color; 
+layout (location = 2) in vec2 vin_uv; 
+
+out vec4 vout_color;
+out vec2 vout_uv;
+
+uniform mat4 MVP;
+
+void main()
+{
+    // 3D points in homogeneous coordinates
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_color = vec4(vin_color, 1.);
+    vout_uv = vin_uv;
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+in vec4 vout_color;
+in vec2 vout_uv;  // interpolated texture coordinates
+
+out vec4 FragColor;
+
+uniform sampler2D texture1;
+
+void main()
+{
+    FragColor = texture(texture1, vout_uv);
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height, g_mip_mode_index, g_texture_index, g_run_benchmark
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+            elif key==GLFW_KEY_M and action==GLFW_PRESS:
+                g_mip_mode_index = (g_mip_mode_index + 1) % len(g_mip_modes)
+            elif key==GLFW_KEY_T and action==GLFW_PRESS:
+                g_texture_index = (g_texture_index + 1) % len(g_texture_paths)
+            elif key==GLFW_KEY_B and action==GLFW_PRESS:
+                g_run_benchmark = True
+
+def prepare_vao_triangle():
+    # prepare vertex data (in main memory)
+    vertices = glm.array(glm.float32,
+        # position      # color         # texture coordinates
+         0.0, 0.0, 0.0,  1.0, 0.0, 0.0,  0.0, 0.0,  # v0
+         0.5, 0.0, 0.0,  0.0, 1.0, 0.0,  1.0, 0.0,  # v1
+         0.0, 0.5, 0.0,  0.0, 0.0, 1.0,  0.0, 1.0,  # v2
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex colors
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    # configure texture coordinates
+    glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(6*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(2)
+
+    return VAO
+
+
+
+# 1D filter kernels; x is the distance from the sample center in units of output (downsampled) pixels.
+# each entry: (kernel, support radius)
+def box_kernel(x):
+    return (np.abs(x) < .5).astype(np.float64)
+
+def lanczos_kernel(x, a=3):
+    return np.where(np.abs(x) < a, np.sinc(x)*np.sinc(x/a), 0.)
+
+def kaiser_kernel(x, width=3, alpha=4.):
+    # kaiser-windowed sinc
+    t = np.clip(x/width, -1, 1)
+    return np.where(np.abs(x) < width, np.sinc(x)*np.i0(alpha*np.sqrt(1 - t*t))/np.i0(alpha), 0.)
+
+g_mip_filters = {
+    'box': (box_kernel, .5),
+    'kaiser': (kaiser_kernel, 3),
+    'lanczos': (lanczos_kernel, 3),
+}
+
+def srgb_to_linear(c):
+    # c: values in [0, 1]
+    return np.where(c <= .04045, c/12.92, ((c + .055)/1.055)**2.4)
+
+def linear_to_srgb(c):
+    c = np.clip(c, 0, 1)
+    return np.where(c <= .0031308, c*12.92, 1.055*c**(1/2.4) - .055)
+
+def get_downsample_weights(n, m, kernel, radius):
+    # return (indices, weights), both (m, taps): output pixel j is sum_t weights[j,t] * input[indices[j,t]]
+    scale = n / m
+    centers = (np.arange(m) + .5)*scale    # output pixel centers in input pixel units
+    taps = int(np.ceil(2*radius*scale)) + 1
+    first = np.floor(centers - radius*scale).astype(int)
+    indices = first[:, None] + np.arange(taps)[None, :]
+    weights = kernel((indices + .5 - centers[:, None]) / scale)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return np.clip(indices, 0, n-1), weights.astype(np.float32)  # clamp-to-edge at the borders
+
+def downsample_axis(pixels, axis, m, kernel, radius):
+    # downsample pixels (float32) along axis to m samples
+    n = pixels.shape[axis]
+    indices, weights = get_downsample_weights(n, m, kernel, radius)
+    pixels = np.moveaxis(pixels, axis, 0)
+    out = np.zeros((m,) + pixels.shape[1:], np.float32)
+
+    if n == 2*m:
+        # exact halving: the weights are the same for every output sample,
+        # so each tap is a strided slice of the edge-padded input
+        offsets = np.arange(indices.shape[1]) + int(np.floor(1 - radius*2))    # taps of output sample 0, before clamping
+        pad_before = max(0, -offsets[0])
+        pad_after = max(0, offsets[-1] + 2*(m-1) - (n-1))
+        padded = np.pad(pixels, ((pad_before, pad_after),) + ((0, 0),)*(pixels.ndim-1), mode='edge')
+        for t, offset in enumerate(offsets):
+            start = offset + pad_before
+            out += padded[start:start + 2*m:2] * weights[0, t]
+    else:
+        for t in range(indices.shape[1]):
+            out += pixels[indices[:, t]] * weights[:, t].reshape((m,) + (1,)*(pixels.ndim-1))
+
+    return np.moveaxis(out, 0, axis)
+
+def generate_mip_chain(pixels, filter='box', srgb=False):
+    # pixels: (height, width, channels) uint8 array. return a list of uint8 arrays, level 0 first.
+    # each level is filtered from the previous one with the separable kernel g_mip_filters[filter].
+    # with srgb=True, filtering is done on linear values, so dark and bright texels are averaged correctly
+    kernel, radius = g_mip_filters[filter]
+    levels = [pixels]
+    level = pixels.astype(np.float32) / 255
+    if srgb:
+        level = srgb_to_linear(level).astype(np.float32)
+
+    height, width = pixels.shape[:2]
+    while width > 1 or height > 1:
+        width, height = max(1, width//2), max(1, height//2)
+        level = downsample_axis(level, 0, height, kernel, radius)
+        level = downsample_axis(level, 1, width, kernel, radius)
+        level = np.clip(level, 0, 1)    # negative lobes of kaiser/lanczos can overshoot
+        out = linear_to_srgb(level) if srgb else level
+        levels.append(np.round(out*255).astype(np.uint8))
+    return levels
+
+def load_image(path):
+    img = Image.open(path)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    # vertically filp the image 
+    # because OpenGL expects 0.0 on y-axis to be on the bottom edge, but images usually have 0.0 at the top of the y-axis
+    img = img.transpose(Image.FLIP_TOP_BOTTOM)
+
+    pixels = np.asarray(img)
+    img.close()
+    return pixels
+
+def get_mip_cache_path(path, filter, srgb):
+    key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(g_mip_cache_dir, '%s-%s%s.npz'%(key, filter, '-srgb' if srgb else ''))
+
+def load_mip_chain(path, filter, srgb):
+    # runs in a worker process: return the mip chain of the image at path, from the cache if it is newer than the image
+    cache_path = get_mip_cache_path(path, filter, srgb)
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            with np.load(cache_path) as cached:
+                return [cached['level%d'%i] for i in range(len(cached.files))]
+    except (OSError, ValueError, KeyError):
+        pass
+    return generate_mip_chain(load_image(path), filter, srgb)
+
+def save_mip_chain(path, filter, srgb):
+    # runs in a worker process
+    levels = generate_mip_chain(load_image(path), filter, srgb)
+    cache_path = get_mip_cache_path(path, filter, srgb)
+    os.makedirs(g_mip_cache_dir, exist_ok=True)
+    tmp_path = cache_path + '.tmp%d.npz'%os.getpid()
+    np.savez(tmp_path, **{'level%d'%i: level for i, level in enumerate(levels)})
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+def pregenerate_mipmaps():
+    # offline: write the mip chains of all textures and modes to the cache, one process per job
+    jobs = [(path, filter, srgb) for path in g_texture_paths for filter, srgb in g_mip_modes if filter is not None]
+    with ProcessPoolExecutor() as executor:
+        for cache_path in executor.map(save_mip_chain, *zip(*jobs)):
+            print(cache_path)
+
+def create_texture(pixels=None, levels=None):
+    # create a texture from precomputed mip levels, or from level 0 pixels with glGenerateMipmap
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)   # rows of small mip levels are not 4-byte aligned
+
+    if levels is None:
+        height, width = pixels.shape[:2]
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, pixels)
+        glGenerateMipmap(GL_TEXTURE_2D)
+    else:
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, len(levels)-1)
+        for level, pixels in enumerate(levels):
+            height, width = pixels.shape[:2]
+            glTexImage2D(GL_TEXTURE_2D, level, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, pixels)
+
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+    return texture
+
+def make_benchmark_image(size, seed):
+    # smooth random image: upsampled noise
+    rng = np.random.default_rng(seed)
+    small = Image.fromarray(rng.integers(0, 256, (size//64, size//64, 3), dtype=np.uint8))
+    return np.asarray(small.resize((size, size), Image.BICUBIC))
+
+def benchmark_mipmaps(size=4096, num_textures=4):
+    # compare glGenerateMipmap with CPU mip generation (serial and on a process pool) for num_textures size x size images
+    images = [make_benchmark_image(size, seed) for seed in range(num_textures)]
+    print('mipmap benchmark: %d textures of %dx%d'%(num_textures, size, size))
+
+    start = time.perf_counter()
+    textures = [create_texture(pixels) for pixels in images]
+    glFinish()
+    print('  glGenerateMipmap: %.3f s'%(time.perf_counter() - start))
+    glDeleteTextures(textures)
+
+    num_workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        for filter in g_mip_filters:
+            start = time.perf_counter()
+            textures = [create_texture(levels=generate_mip_chain(pixels, filter)) for pixels in images]
+            glFinish()
+            serial = time.perf_counter() - start
+            glDeleteTextures(textures)
+
+            start = time.perf_counter()
+            textures = [create_texture(levels=levels) for levels in executor.map(generate_mip_chain, images, [filter]*num_textures)]
+            glFinish()
+            parallel = time.perf_counter() - start
+            glDeleteTextures(textures)
+
+            print('  %s: %.3f s serial, %.3f s on %d processes'%(filter, serial, parallel, num_workers))
+
+def main():
+    global g_run_benchmark
+
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '13-cpu-mipmaps', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+
+    # get uniform locations
+    loc_MVP = glGetUniformLocation(shader_program, 'MVP')
+    
+    # prepare vaos
+    vao_triangle = prepare_vao_triangle()
+
+    ############################################
+    # textures - one per (image, mip mode)
+    # CPU mip chains of all images and modes are generated in parallel on a process pool
+
+    textures = {}
+    with ProcessPoolExecutor() as executor:
+        futures = {}
+        for path in g_texture_paths:
+            for mode in g_mip_modes:
+                filter, srgb = mode
+                if filter is not None:
+                    futures[(path, mode)] = executor.submit(load_mip_chain, path, filter, srgb)
+
+        for path in g_texture_paths:
+            try:
+                textures[(path, g_mip_modes[0])] = create_texture(load_image(path))
+                for mode in g_mip_modes[1:]:
+                    textures[(path, mode)] = create_texture(levels=futures[(path, mode)].result())
+            except:
+                print("Failed to load texture")
+
+    ############################################
+
+    displayed = None
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        if g_run_benchmark:
+            benchmark_mipmaps()
+            g_run_benchmark = False
+
+        path, mode = g_texture_paths[g_texture_index], g_mip_modes[g_mip_mode_index]
+        if displayed != (path, mode) and (path, mode) in textures:
+            displayed = (path, mode)
+            glBindTexture(GL_TEXTURE_2D, textures[displayed])
+            filter, srgb = mode
+            glfwSetWindowTitle(window, '13-cpu-mipmaps (%s%s)'%(filter if filter is not None else 'glGenerateMipmap', ', srgb' if srgb else ''))
+
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        glUseProgram(shader_program)
+
+        # projection matrix
+        # use orthogonal projection (we'll see details later)
+        P = glm.ortho(-1,1,-1,1,-1,1)
+
+        # view matrix
+        # rotate camera position with g_cam_ang / move camera up & down with g_cam_height
+        V = glm.lookAt(glm.vec3(.1*np.sin(g_cam_ang),g_cam_height,.1*np.cos(g_cam_ang)), glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+        # modeling matrix
+        # small triangle so that the texture is minified and mipmaps are used
+        M = glm.scale(glm.vec3(.5,.5,.5))
+
+        # current frame: P*V*M
+        MVP = P*V*M
+        glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
+
+        # draw triangle w.r.t. the current frame
+        glBindVertexArray(vao_triangle)
+        glDrawArrays(GL_TRIANGLES, 0, 3)
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ['pregenerate']:
+        pregenerate_mipmaps()
+    else:
+        main()
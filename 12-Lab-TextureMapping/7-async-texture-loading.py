@@ -0,0 +1,361 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import time
+import numpy as np
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+
+g_cam_ang = 0.
+g_cam_height = 3.
+
+# textures used by the cube grid; each cube requests its own texture so the scene has many decode jobs
+g_texture_paths = [
+    './320px-Solarsystemscope_texture_8k_earth_daymap.jpg',
+    './320px-Solarsystemscope_texture_8k_earth_daymap-grayscale.jpg',
+    './plain-checkerboard.jpg',
+]
+g_grid_size = 8
+
+# max time (in seconds) the render thread spends uploading decoded textures per frame
+g_upload_budget = .004
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+layout (location = 2) in vec2 vin_uv; 
+
+out vec2 vout_uv;
+
+uniform mat4 MVP;
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_uv = vin_uv;
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+in vec2 vout_uv;  // interpolated texture coordinates
+
+out vec4 FragColor;
+
+uniform sampler2D texture1;
+
+void main()
+{
+    FragColor = texture(texture1, vout_uv);
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += 1.
+            elif key==GLFW_KEY_W:
+                g_cam_height += -1.
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 36 vertices for 12 triangles
+    vertices = glm.array(glm.float32,
+        # position     # normal  # texture coordinates
+        -1 ,  1 ,  1 ,  0, 0, 1,  0.0, 1.0,  # v0
+         1 , -1 ,  1 ,  0, 0, 1,  1.0, 0.0,  # v2
+         1 ,  1 ,  1 ,  0, 0, 1,  1.0, 1.0,  # v1
+
+        -1 ,  1 ,  1 ,  0, 0, 1,  0.0, 1.0,  # v0
+        -1 , -1 ,  1 ,  0, 0, 1,  0.0, 0.0,  # v3
+         1 , -1 ,  1 ,  0, 0, 1,  1.0, 0.0,  # v2
+
+        -1 ,  1 , -1 ,  0, 0,-1,  0.0, 1.0,  # v4
+         1 ,  1 , -1 ,  0, 0,-1,  1.0, 1.0,  # v5
+         1 , -1 , -1 ,  0, 0,-1,  1.0, 0.0,  # v6
+                                             
+        -1 ,  1 , -1 ,  0, 0,-1,  0.0, 1.0,  # v4
+         1 , -1 , -1 ,  0, 0,-1,  1.0, 0.0,  # v6
+        -1 , -1 , -1 ,  0, 0,-1,  0.0, 0.0,  # v7
+
+        -1 ,  1 ,  1 ,  0, 1, 0,  0.0, 1.0,  # v0
+         1 ,  1 ,  1 ,  0, 1, 0,  1.0, 1.0,  # v1
+         1 ,  1 , -1 ,  0, 1, 0,  1.0, 0.0,  # v5
+                                             
+        -1 ,  1 ,  1 ,  0, 1, 0,  0.0, 1.0,  # v0
+         1 ,  1 , -1 ,  0, 1, 0,  1.0, 0.0,  # v5
+        -1 ,  1 , -1 ,  0, 1, 0,  0.0, 0.0,  # v4
+ 
+        -1 , -1 ,  1 ,  0,-1, 0,  0.0, 1.0,  # v3
+         1 , -1 , -1 ,  0,-1, 0,  1.0, 0.0,  # v6
+         1 , -1 ,  1 ,  0,-1, 0,  1.0, 1.0,  # v2
+                                             
+        -1 , -1 ,  1 ,  0,-1, 0,  0.0, 1.0,  # v3
+        -1 , -1 , -1 ,  0,-1, 0,  0.0, 0.0,  # v7
+         1 , -1 , -1 ,  0,-1, 0,  1.0, 0.0,  # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0,  1.0, 1.0,  # v1
+         1 , -1 ,  1 ,  1, 0, 0,  0.0, 1.0,  # v2
+         1 , -1 , -1 ,  1, 0, 0,  0.0, 0.0,  # v6
+                                             
+         1 ,  1 ,  1 ,  1, 0, 0,  1.0, 1.0,  # v1
+         1 , -1 , -1 ,  1, 0, 0,  0.0, 0.0,  # v6
+         1 ,  1 , -1 ,  1, 0, 0,  1.0, 0.0,  # v5
+
+        -1 ,  1 ,  1 , -1, 0, 0,  1.0, 1.0,  # v0
+        -1 , -1 , -1 , -1, 0, 0,  0.0, 0.0,  # v7
+        -1 , -1 ,  1 , -1, 0, 0,  0.0, 1.0,  # v3
+                                             
+        -1 ,  1 ,  1 , -1, 0, 0,  1.0, 1.0,  # v0
+        -1 ,  1 , -1 , -1, 0, 0,  1.0, 0.0,  # v4
+        -1 , -1 , -1 , -1, 0, 0,  0.0, 0.0,  # v7
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    # configure texture coordinates
+    glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(6*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(2)
+
+    return VAO
+
+# rows are copied from the decoded image in strips of about this many bytes
+g_decode_strip_bytes = 1<<20
+
+def decode_image(path):
+    # runs on a worker thread: decode & flip the image without touching any GL state.
+    # return (width, height, pixels) where pixels is a (height, width, 3) uint8 array that can be passed to glTexImage2D as is
+    img = Image.open(path)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    img.load()
+    width, height = img.width, img.height
+
+    # copy the decoded image into the array strip by strip, storing the strips bottom-up.
+    # this vertically flips the image (OpenGL expects 0.0 on y-axis to be on the bottom edge, but images usually have 0.0 at the top of the y-axis)
+    # without FLIP_TOP_BOTTOM, and avoids img.tobytes() which briefly holds two full copies of the pixels
+    pixels = np.empty((height, width, 3), np.uint8)
+    rows = max(1, g_decode_strip_bytes // (width*3))
+    for y0 in range(0, height, rows):
+        y1 = min(height, y0 + rows)
+        pixels[height-y1:height-y0] = np.asarray(img.crop((0, y0, width, y1)))[::-1]
+
+    img.close()
+    return width, height, pixels
+
+class AsyncTextureLoader:
+    def __init__(self, max_workers=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.pending = []   # list of (texture, future) whose image has not been uploaded yet
+
+    def request(self, path):
+        # create the texture object right away with a placeholder image so it can be drawn immediately,
+        # and decode the actual image on the thread pool
+        texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST_MIPMAP_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        placeholder = np.array([[[128,128,128], [ 64, 64, 64]],
+                                [[ 64, 64, 64], [128,128,128]]], np.uint8)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, 2, 2, 0, GL_RGB, GL_UNSIGNED_BYTE, placeholder)
+        glGenerateMipmap(GL_TEXTURE_2D)
+
+        future = self.executor.submit(decode_image, path)
+        self.pending.append((texture, future))
+        return texture
+
+    def upload_completed(self, budget):
+        # upload decoded images until the time budget (in seconds) is used up.
+        # at least one texture is uploaded per call so loading always makes progress.
+        # return the number of uploaded textures
+        start = time.perf_counter()
+        num_uploaded = 0
+        still_pending = []
+        for texture, future in self.pending:
+            if not future.done() or (num_uploaded > 0 and time.perf_counter() - start > budget):
+                still_pending.append((texture, future))
+                continue
+
+            try:
+                width, height, pixels = future.result()
+                glBindTexture(GL_TEXTURE_2D, texture)
+
+                # the array's memory is passed to GL directly; rows of 3-byte pixels are not always 4-byte aligned
+                glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+                glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, pixels)
+                glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+                glGenerateMipmap(GL_TEXTURE_2D)
+            except:
+                print("Failed to load texture")
+            num_uploaded += 1
+
+        self.pending = still_pending
+        return num_uploaded
+
+    def get_num_pending(self):
+        return len(self.pending)
+
+    def shutdown(self):
+        for texture, future in self.pending:
+            future.cancel()
+        self.executor.shutdown(wait=True)
+        self.pending = []
+
+def main():
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '7-async-texture-loading', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+
+    # get uniform locations
+    loc_MVP = glGetUniformLocation(shader_program, 'MVP')
+
+    # prepare vaos
+    vao_cube = prepare_vao_cube()
+
+    ############################################
+    # request textures - returns immediately, decoding is done on the thread pool
+
+    loader = AsyncTextureLoader()
+    textures = []
+    for i in range(g_grid_size*g_grid_size):
+        textures.append(loader.request(g_texture_paths[i % len(g_texture_paths)]))
+
+    ############################################
+
+    glUseProgram(shader_program)
+    glUniform1i(glGetUniformLocation(shader_program, 'texture1'), 0)
+    glActiveTexture(GL_TEXTURE0)
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        # upload textures whose decoding is done, within the per-frame budget
+        if loader.get_num_pending() > 0:
+            loader.upload_completed(g_upload_budget)
+            glfwSetWindowTitle(window, '7-async-texture-loading (%d textures pending)'%loader.get_num_pending())
+
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        # projection matrix
+        P = glm.perspective(45, 1, 1, 50)
+
+        # view matrix
+        view_pos = glm.vec3(15*np.sin(g_cam_ang),g_cam_height,15*np.cos(g_cam_ang))
+        V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+        # draw cube grid, one texture per cube
+        glUseProgram(shader_program)
+        glBindVertexArray(vao_cube)
+        for i in range(g_grid_size):
+            for j in range(g_grid_size):
+                M = glm.translate(glm.vec3(1.5*(i - (g_grid_size-1)*.5), 1.5*(j - (g_grid_size-1)*.5), 0)) * glm.scale(glm.vec3(.5,.5,.5))
+                MVP = P*V*M
+                glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
+                glBindTexture(GL_TEXTURE_2D, textures[i*g_grid_size + j])
+                glDrawArrays(GL_TRIANGLES, 0, 36)
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    loader.shutdown()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
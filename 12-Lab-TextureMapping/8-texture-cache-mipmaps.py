@@ -0,0 +1,491 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import os
+import struct
+import hashlib
+import numpy as np
+from PIL import Image
+
+g_cam_ang = 0.
+g_cam_height = .1
+
+# decoded textures (flipped pixels + full mip chain) are cached here
+g_texture_cache_dir = './texture_cache'
+
+# cache file header: magic, width, height, channels, num_levels, source size, source mtime (ns), source sha256
+# followed by the pixels of each mip level (tightly packed, level 0 first)
+g_texture_cache_magic = b'TXC1'
+g_texture_cache_header = struct.Struct('<4sIIIIQQ32s')
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+layout (location = 2) in vec2 vin_uv; 
+
+out vec3 vout_surface_pos;
+out vec3 vout_normal;
+out vec2 vout_uv;
+
+uniform mat4 MVP;
+uniform mat4 M;
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_surface_pos = vec3(M * vec4(vin_pos, 1));
+    vout_normal = normalize( mat3(inverse(transpose(M)) ) * vin_normal);
+    vout_uv = vin_uv;
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+in vec3 vout_surface_pos;
+in vec3 vout_normal;  // interpolated normal
+in vec2 vout_uv;  // interpolated texture coordinates
+
+out vec4 FragColor;
+
+uniform vec3 view_pos;
+uniform sampler2D texture_diffuse;
+uniform sampler2D texture_specular;
+
+void main()
+{
+    // light and material properties
+    vec3 light_pos = vec3(3,2,4);
+    vec3 light_color = vec3(1,1,1);
+
+    //vec3 material_color = vec3(1,0,0);
+    vec3 material_color = vec3(texture(texture_diffuse, vout_uv));
+
+    float material_shininess = 32.0;
+
+    // light components
+    vec3 light_ambient = 0.1*light_color;
+    vec3 light_diffuse = light_color;
+    vec3 light_specular = light_color;
+
+    // material components
+    vec3 material_ambient = material_color;
+    vec3 material_diffuse = material_color;
+
+    //vec3 material_specular = vec3(1,1,1);  // for non-metal material
+    vec3 material_specular = vec3(texture(texture_specular, vout_uv));
+
+    // ambient
+    vec3 ambient = light_ambient * material_ambient;
+
+    // for diffiuse and specular
+    vec3 normal = normalize(vout_normal);
+    vec3 surface_pos = vout_surface_pos;
+    vec3 light_dir = normalize(light_pos - surface_pos);
+
+    // diffuse
+    float diff = max(dot(normal, light_dir), 0);
+    vec3 diffuse = diff * light_diffuse * material_diffuse;
+
+    // specular
+    vec3 view_dir = normalize(view_pos - surface_pos);
+    vec3 reflect_dir = reflect(-light_dir, normal);
+    float spec = pow( max(dot(view_dir, reflect_dir), 0.0), material_shininess);
+    vec3 specular = spec * light_specular * material_specular;
+
+    vec3 color = ambient + diffuse + specular;
+    FragColor = vec4(color, 1.);
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 36 vertices for 12 triangles
+    vertices = glm.array(glm.float32,
+        # position     # normal  # texture coordinates
+        -1 ,  1 ,  1 ,  0, 0, 1,  0.0, 1.0,  # v0
+         1 , -1 ,  1 ,  0, 0, 1,  1.0, 0.0,  # v2
+         1 ,  1 ,  1 ,  0, 0, 1,  1.0, 1.0,  # v1
+
+        -1 ,  1 ,  1 ,  0, 0, 1,  0.0, 1.0,  # v0
+        -1 , -1 ,  1 ,  0, 0, 1,  0.0, 0.0,  # v3
+         1 , -1 ,  1 ,  0, 0, 1,  1.0, 0.0,  # v2
+
+        -1 ,  1 , -1 ,  0, 0,-1,  0.0, 1.0,  # v4
+         1 ,  1 , -1 ,  0, 0,-1,  1.0, 1.0,  # v5
+         1 , -1 , -1 ,  0, 0,-1,  1.0, 0.0,  # v6
+                                             
+        -1 ,  1 , -1 ,  0, 0,-1,  0.0, 1.0,  # v4
+         1 , -1 , -1 ,  0, 0,-1,  1.0, 0.0,  # v6
+        -1 , -1 , -1 ,  0, 0,-1,  0.0, 0.0,  # v7
+
+        -1 ,  1 ,  1 ,  0, 1, 0,  0.0, 1.0,  # v0
+         1 ,  1 ,  1 ,  0, 1, 0,  1.0, 1.0,  # v1
+         1 ,  1 , -1 ,  0, 1, 0,  1.0, 0.0,  # v5
+                                             
+        -1 ,  1 ,  1 ,  0, 1, 0,  0.0, 1.0,  # v0
+         1 ,  1 , -1 ,  0, 1, 0,  1.0, 0.0,  # v5
+        -1 ,  1 , -1 ,  0, 1, 0,  0.0, 0.0,  # v4
+ 
+        -1 , -1 ,  1 ,  0,-1, 0,  0.0, 1.0,  # v3
+         1 , -1 , -1 ,  0,-1, 0,  1.0, 0.0,  # v6
+         1 , -1 ,  1 ,  0,-1, 0,  1.0, 1.0,  # v2
+                                             
+        -1 , -1 ,  1 ,  0,-1, 0,  0.0, 1.0,  # v3
+        -1 , -1 , -1 ,  0,-1, 0,  0.0, 0.0,  # v7
+         1 , -1 , -1 ,  0,-1, 0,  1.0, 0.0,  # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0,  1.0, 1.0,  # v1
+         1 , -1 ,  1 ,  1, 0, 0,  0.0, 1.0,  # v2
+         1 , -1 , -1 ,  1, 0, 0,  0.0, 0.0,  # v6
+                                             
+         1 ,  1 ,  1 ,  1, 0, 0,  1.0, 1.0,  # v1
+         1 , -1 , -1 ,  1, 0, 0,  0.0, 0.0,  # v6
+         1 ,  1 , -1 ,  1, 0, 0,  1.0, 0.0,  # v5
+
+        -1 ,  1 ,  1 , -1, 0, 0,  1.0, 1.0,  # v0
+        -1 , -1 , -1 , -1, 0, 0,  0.0, 0.0,  # v7
+        -1 , -1 ,  1 , -1, 0, 0,  0.0, 1.0,  # v3
+                                             
+        -1 ,  1 ,  1 , -1, 0, 0,  1.0, 1.0,  # v0
+        -1 ,  1 , -1 , -1, 0, 0,  1.0, 0.0,  # v4
+        -1 , -1 , -1 , -1, 0, 0,  0.0, 0.0,  # v7
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    # configure texture coordinates
+    glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(6*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(2)
+
+    return VAO
+
+def get_texture_cache_path(path):
+    # one cache file per source file
+    key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(g_texture_cache_dir, key + '.tex')
+
+def hash_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1<<20), b''):
+            h.update(chunk)
+    return h.digest()
+
+def get_mip_level_size(width, height, level):
+    return max(1, width >> level), max(1, height >> level)
+
+def get_num_mip_levels(width, height):
+    return int(np.floor(np.log2(max(width, height)))) + 1
+
+def build_mip_chain(img):
+    # img: flipped PIL image. return a list of (height, width, channels) uint8 arrays, level 0 first
+    levels = [np.asarray(img)]
+    for level in range(1, get_num_mip_levels(img.width, img.height)):
+        levels.append(np.asarray(img.resize(get_mip_level_size(img.width, img.height, level), Image.BOX)))
+    return levels
+
+def write_texture_cache(cache_path, levels, source_size, source_mtime, source_hash):
+    height, width, channels = levels[0].shape
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    # write to a temporary file first so that a partially written cache file is never read
+    tmp_path = cache_path + '.tmp%d'%os.getpid()
+    with open(tmp_path, 'wb') as f:
+        f.write(g_texture_cache_header.pack(g_texture_cache_magic, width, height, channels, len(levels),
+                                            source_size, source_mtime, source_hash))
+        for level in levels:
+            f.write(np.ascontiguousarray(level, np.uint8).data)
+    os.replace(tmp_path, cache_path)
+
+def open_texture_cache(cache_path, path):
+    # return (levels, channels) memory-mapped from the cache file, or None if the entry is missing or stale
+    try:
+        with open(cache_path, 'rb') as f:
+            header = f.read(g_texture_cache_header.size)
+    except OSError:
+        return None
+    if len(header) != g_texture_cache_header.size:
+        return None
+
+    magic, width, height, channels, num_levels, source_size, source_mtime, source_hash = g_texture_cache_header.unpack(header)
+    if magic != g_texture_cache_magic:
+        return None
+
+    # cheap check first; only hash the source if its mtime changed but the size did not
+    stat = os.stat(path)
+    if stat.st_size != source_size:
+        return None
+    if stat.st_mtime_ns != source_mtime:
+        if hash_file(path) != source_hash:
+            return None
+        # same content (e.g. touched or copied) - record the new mtime so the next start skips hashing.
+        # optional: a read-only or locked cache is still valid
+        try:
+            with open(cache_path, 'r+b') as f:
+                f.write(g_texture_cache_header.pack(magic, width, height, channels, num_levels,
+                                                    source_size, stat.st_mtime_ns, source_hash))
+        except OSError:
+            pass
+
+    data = np.memmap(cache_path, dtype=np.uint8, mode='r', offset=g_texture_cache_header.size)
+    levels = []
+    offset = 0
+    for level in range(num_levels):
+        w, h = get_mip_level_size(width, height, level)
+        nbytes = w*h*channels
+        if offset + nbytes > data.size:
+            return None
+        levels.append(data[offset:offset+nbytes].reshape(h, w, channels))
+        offset += nbytes
+    return levels, channels
+
+def load_texture_levels(path):
+    # return (levels, channels, cache_hit)
+    cache_path = get_texture_cache_path(path)
+    cached = open_texture_cache(cache_path, path)
+    if cached is not None:
+        levels, channels = cached
+        return levels, channels, True
+
+    # cache miss: decode, flip and build the mip chain, then store it
+    stat = os.stat(path)
+    img = Image.open(path)
+    img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+
+    # vertically filp the image 
+    # because OpenGL expects 0.0 on y-axis to be on the bottom edge, but images usually have 0.0 at the top of the y-axis
+    img = img.transpose(Image.FLIP_TOP_BOTTOM)
+
+    levels = build_mip_chain(img)
+    channels = levels[0].shape[2]
+    img.close()
+
+    try:
+        write_texture_cache(cache_path, levels, stat.st_size, stat.st_mtime_ns, hash_file(path))
+    except OSError:
+        print("Failed to write texture cache")
+    return levels, channels, False
+
+def create_texture_from_levels(levels, channels):
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+
+    # set texture filtering parameters
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST_MIPMAP_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, len(levels)-1)
+
+    # rows of small mip levels are not 4-byte aligned
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+
+    # upload every precomputed level instead of calling glGenerateMipmap
+    format = GL_RGBA if channels == 4 else GL_RGB
+    for level, pixels in enumerate(levels):
+        height, width = pixels.shape[:2]
+        glTexImage2D(GL_TEXTURE_2D, level, format, width, height, 0, format, GL_UNSIGNED_BYTE, pixels)
+
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+    return texture
+
+def main():
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '8-texture-cache-mipmaps', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+
+    # get uniform locations
+    loc_MVP = glGetUniformLocation(shader_program, 'MVP')
+    loc_M = glGetUniformLocation(shader_program, 'M')
+    loc_view_pos = glGetUniformLocation(shader_program, 'view_pos')
+
+    # prepare vaos
+    vao_cube = prepare_vao_cube()
+
+
+    glUseProgram(shader_program)
+
+    ############################################
+    # load textures - decoded pixels and mip chains come from the on-disk cache if it is up to date
+
+    try:
+        levels, channels, cache_hit_diffuse = load_texture_levels('./320px-Solarsystemscope_texture_8k_earth_daymap.jpg')
+        texture_diffuse = create_texture_from_levels(levels, channels)
+        del levels  # drop references to the memory-mapped cache file
+    except:
+        texture_diffuse = glGenTextures(1)  # empty texture, as in the other labs
+        cache_hit_diffuse = False
+        print("Failed to load texture")
+
+    try:
+        levels, channels, cache_hit_specular = load_texture_levels('./plain-checkerboard.jpg')
+        # levels, channels, cache_hit_specular = load_texture_levels('./320px-Solarsystemscope_texture_8k_earth_daymap-grayscale.jpg')
+        texture_specular = create_texture_from_levels(levels, channels)
+        del levels
+    except:
+        texture_specular = glGenTextures(1)
+        cache_hit_specular = False
+        print("Failed to load texture")
+
+    if cache_hit_diffuse and cache_hit_specular:
+        glfwSetWindowTitle(window, '8-texture-cache-mipmaps (loaded from cache)')
+
+    ############################################
+
+    # for i-th texture unit, sampler uniform variable value should be i
+    glUniform1i(glGetUniformLocation(shader_program, 'texture_diffuse'), 0)
+    # activate i-th texture unit by passing GL_TEXTUREi
+    glActiveTexture(GL_TEXTURE0)  
+    # texture object is binded on this activated texture unit
+    glBindTexture(GL_TEXTURE_2D, texture_diffuse)
+
+
+    glUniform1i(glGetUniformLocation(shader_program, 'texture_specular'), 1)
+    glActiveTexture(GL_TEXTURE1)
+    glBindTexture(GL_TEXTURE_2D, texture_specular)
+
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        # projection matrix
+        P = glm.perspective(45, 1, 1, 20)
+
+        # view matrix
+        view_pos = glm.vec3(5*np.sin(g_cam_ang),g_cam_height,5*np.cos(g_cam_ang))
+        V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+
+        # animating
+        t = glfwGetTime()
+
+        # rotation
+        th = np.radians(t*90)
+        R = glm.rotate(th, glm.vec3(0,1,0))
+
+        M = glm.mat4()
+
+        # # try applying rotation
+        # M = R
+
+        # update uniforms
+        MVP = P*V*M
+        glUseProgram(shader_program)
+        glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
+        glUniformMatrix4fv(loc_M, 1, GL_FALSE, glm.value_ptr(M))
+        glUniform3f(loc_view_pos, view_pos.x, view_pos.y, view_pos.z)
+
+        # draw cube w.r.t. the current frame MVP
+        glBindVertexArray(vao_cube)
+        glDrawArrays(GL_TRIANGLES, 0, 36)
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import time
+import numpy as np
+from PIL import Image
+
+g_cam_ang = 0.
+g_cam_height = .1
+
+# images streamed into the cube texture one after another, like frames of a video
+g_texture_paths = [
+    './320px-Solarsystemscope_texture_8k_earth_daymap.jpg',
+    './320px-Solarsystemscope_texture_8k_earth_daymap-grayscale.jpg',
+    './plain-checkerboard.jpg',
+]
+g_switch_interval = .5  # seconds between starting to stream the next image
+
+# images are streamed as tiles; at most g_tiles_per_frame tiles are uploaded per frame
+g_tile_size = 64
+g_tiles_per_frame = 4
+
+# number of pixel unpack buffers in the ring
+g_num_pbos = 3
+
+g_use_pbo = True
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+layout (location = 2) in vec2 vin_uv; 
+
+out vec2 vout_uv;
+
+uniform mat4 MVP;
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_uv = vin_uv;
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+in vec2 vout_uv;  // interpolated texture coordinates
+
+out vec4 FragColor;
+
+uniform sampler2D texture1;
+
+void main()
+{
+    FragColor = texture(texture1, vout_uv);
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height, g_use_pbo
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+            elif key==GLFW_KEY_P and action==GLFW_PRESS:
+                # toggle between pbo streaming and direct glTexSubImage2D
+                g_use_pbo = not g_use_pbo
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 36 vertices for 12 triangles
+    vertices = glm.array(glm.float32,
+        # position     # normal  # texture coordinates
+        -1 ,  1 ,  1 ,  0, 0, 1,  0.0, 1.0,  # v0
+         1 , -1 ,  1 ,  0, 0, 1,  1.0, 0.0,  # v2
+         1 ,  1 ,  1 ,  0, 0, 1,  1.0, 1.0,  # v1
+
+        -1 ,  1 ,  1 ,  0, 0, 1,  0.0, 1.0,  # v0
+        -1 , -1 ,  1 ,  0, 0, 1,  0.0, 0.0,  # v3
+         1 , -1 ,  1 ,  0, 0, 1,  1.0, 0.0,  # v2
+
+        -1 ,  1 , -1 ,  0, 0,-1,  0.0, 1.0,  # v4
+         1 ,  1 , -1 ,  0, 0,-1,  1.0, 1.0,  # v5
+         1 , -1 , -1 ,  0, 0,-1,  1.0, 0.0,  # v6
+                                             
+        -1 ,  1 , -1 ,  0, 0,-1,  0.0, 1.0,  # v4
+         1 , -1 , -1 ,  0, 0,-1,  1.0, 0.0,  # v6
+        -1 , -1 , -1 ,  0, 0,-1,  0.0, 0.0,  # v7
+
+        -1 ,  1 ,  1 ,  0, 1, 0,  0.0, 1.0,  # v0
+         1 ,  1 ,  1 ,  0, 1, 0,  1.0, 1.0,  # v1
+         1 ,  1 , -1 ,  0, 1, 0,  1.0, 0.0,  # v5
+                                             
+        -1 ,  1 ,  1 ,  0, 1, 0,  0.0, 1.0,  # v0
+         1 ,  1 , -1 ,  0, 1, 0,  1.0, 0.0,  # v5
+        -1 ,  1 , -1 ,  0, 1, 0,  0.0, 0.0,  # v4
+ 
+        -1 , -1 ,  1 ,  0,-1, 0,  0.0, 1.0,  # v3
+         1 , -1 , -1 ,  0,-1, 0,  1.0, 0.0,  # v6
+         1 , -1 ,  1 ,  0,-1, 0,  1.0, 1.0,  # v2
+                                             
+        -1 , -1 ,  1 ,  0,-1, 0,  0.0, 1.0,  # v3
+        -1 , -1 , -1 ,  0,-1, 0,  0.0, 0.0,  # v7
+         1 , -1 , -1 ,  0,-1, 0,  1.0, 0.0,  # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0,  1.0, 1.0,  # v1
+         1 , -1 ,  1 ,  1, 0, 0,  0.0, 1.0,  # v2
+         1 , -1 , -1 ,  1, 0, 0,  0.0, 0.0,  # v6
+                                             
+         1 ,  1 ,  1 ,  1, 0, 0,  1.0, 1.0,  # v1
+         1 , -1 , -1 ,  1, 0, 0,  0.0, 0.0,  # v6
+         1 ,  1 , -1 ,  1, 0, 0,  1.0, 0.0,  # v5
+
+        -1 ,  1 ,  1 , -1, 0, 0,  1.0, 1.0,  # v0
+        -1 , -1 , -1 , -1, 0, 0,  0.0, 0.0,  # v7
+        -1 , -1 ,  1 , -1, 0, 0,  0.0, 1.0,  # v3
+                                             
+        -1 ,  1 ,  1 , -1, 0, 0,  1.0, 1.0,  # v0
+        -1 ,  1 , -1 , -1, 0, 0,  1.0, 0.0,  # v4
+        -1 , -1 , -1 , -1, 0, 0,  0.0, 0.0,  # v7
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    # configure texture coordinates
+    glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, 8 * glm.sizeof(glm.float32), ctypes.c_void_p(6*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(2)
+
+    return VAO
+
+def load_image(path, size=None):
+    # return a (height, width, 3) uint8 array, resized to size=(width, height) if given
+    img = Image.open(path)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    if size is not None and img.size != size:
+        img = img.resize(size, Image.BILINEAR)
+
+    # vertically filp the image 
+    # because OpenGL expects 0.0 on y-axis to be on the bottom edge, but images usually have 0.0 at the top of the y-axis
+    img = img.transpose(Image.FLIP_TOP_BOTTOM)
+
+    pixels = np.asarray(img)
+    img.close()
+    return pixels
+
+class PixelUnpackBufferRing:
+    # ring of pixel unpack buffers (PBOs).
+    # the CPU writes the next tile into one buffer while the GPU may still be reading the previous ones,
+    # so glTexSubImage2D returns without waiting for the driver to consume client memory.
+    def __init__(self, num_buffers, buffer_size):
+        self.buffer_size = buffer_size
+        self.pbos = glGenBuffers(num_buffers)
+        if num_buffers == 1:
+            self.pbos = [self.pbos]
+        self.fences = [None]*num_buffers
+        self.index = 0
+
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_UNPACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_UNPACK_BUFFER, buffer_size, None, GL_STREAM_DRAW)
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+
+    def upload(self, texture, x, y, pixels):
+        # upload pixels ((height, width, 3) uint8 array, may be a non-contiguous view) to the region of texture starting at (x, y)
+        height, width = pixels.shape[:2]
+        nbytes = width*height*3
+        assert nbytes <= self.buffer_size
+
+        pbo = self.pbos[self.index]
+
+        # wait until the GPU has finished reading this buffer the last time it was used
+        # (with enough buffers in the ring, this normally returns immediately)
+        fence = self.fences[self.index]
+        if fence is not None:
+            glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 1000000000)
+            glDeleteSync(fence)
+
+        # map the buffer and copy the tile into it - this is the only CPU copy of the pixels
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, pbo)
+        ptr = glMapBufferRange(GL_PIXEL_UNPACK_BUFFER, 0, nbytes, GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT)
+        mapped = np.ctypeslib.as_array((ctypes.c_ubyte*nbytes).from_address(ptr))
+        mapped.reshape(height, width, 3)[:] = pixels
+        glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER)
+
+        # with a PBO bound, the data argument is an offset into the buffer
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexSubImage2D(GL_TEXTURE_2D, 0, x, y, width, height, GL_RGB, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+
+        self.fences[self.index] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self.index = (self.index + 1) % len(self.pbos)
+
+    def delete(self):
+        for fence in self.fences:
+            if fence is not None:
+                glDeleteSync(fence)
+        glDeleteBuffers(len(self.pbos), self.pbos)
+
+def upload_tile_direct(texture, x, y, pixels):
+    # upload without a PBO - glTexSubImage2D copies from client memory before returning
+    glBindTexture(GL_TEXTURE_2D, texture)
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+    glTexSubImage2D(GL_TEXTURE_2D, 0, x, y, pixels.shape[1], pixels.shape[0], GL_RGB, GL_UNSIGNED_BYTE, np.ascontiguousarray(pixels))
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+
+class TextureStreamer:
+    # streams whole images into a texture, a few tiles per frame
+    def __init__(self, width, height, ring):
+        self.width = width
+        self.height = height
+        self.ring = ring
+        self.tiles = []  # queue of (x, y, pixels view)
+
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, None)
+
+    def stream(self, pixels, tile_size):
+        # queue pixels (must have the texture's size) as tiles; tiles of an image still being streamed are replaced
+        self.tiles = []
+        for y in range(0, self.height, tile_size):
+            for x in range(0, self.width, tile_size):
+                self.tiles.append((x, y, pixels[y:y+tile_size, x:x+tile_size]))
+
+    def update(self, max_tiles, use_pbo):
+        # upload up to max_tiles queued tiles. return the number of uploaded tiles
+        num_uploaded = min(max_tiles, len(self.tiles))
+        for x, y, pixels in self.tiles[:num_uploaded]:
+            if use_pbo:
+                self.ring.upload(self.texture, x, y, pixels)
+            else:
+                upload_tile_direct(self.texture, x, y, pixels)
+        self.tiles = self.tiles[num_uploaded:]
+        return num_uploaded
+
+def main():
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '9-pbo-texture-streaming', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+
+    # get uniform locations
+    loc_MVP = glGetUniformLocation(shader_program, 'MVP')
+
+    # prepare vaos
+    vao_cube = prepare_vao_cube()
+
+    ############################################
+    # streamed texture
+
+    # all streamed images share the size of the first one that loads
+    images = []
+    size = None
+    for path in g_texture_paths:
+        try:
+            images.append(load_image(path, size))
+            size = images[0].shape[1::-1]
+        except:
+            print("Failed to load texture")
+    if not images:
+        # no image could be loaded - stream a single white texel so the cube is still drawn
+        images.append(np.full((1, 1, 3), 255, np.uint8))
+    height, width = images[0].shape[:2]
+
+    ring = PixelUnpackBufferRing(g_num_pbos, g_tile_size*g_tile_size*3)
+    streamer = TextureStreamer(width, height, ring)
+    streamer.stream(images[0], g_tile_size)
+    image_index = 0
+    last_switch_time = glfwGetTime()
+
+    ############################################
+
+    glUseProgram(shader_program)
+    glUniform1i(glGetUniformLocation(shader_program, 'texture1'), 0)
+    glActiveTexture(GL_TEXTURE0)
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        # start streaming the next image
+        t = glfwGetTime()
+        if t - last_switch_time > g_switch_interval:
+            image_index = (image_index + 1) % len(images)
+            streamer.stream(images[image_index], g_tile_size)
+            last_switch_time = t
+
+        # upload a few tiles and measure how long the CPU is blocked
+        start = time.perf_counter()
+        num_uploaded = streamer.update(g_tiles_per_frame, g_use_pbo)
+        if num_uploaded > 0:
+            glfwSetWindowTitle(window, '9-pbo-texture-streaming (%s, %.3f ms for %d tiles)'%('pbo' if g_use_pbo else 'direct', (time.perf_counter() - start)*1000, num_uploaded))
+
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        # projection matrix
+        P = glm.perspective(45, 1, 1, 20)
+
+        # view matrix
+        view_pos = glm.vec3(5*np.sin(g_cam_ang),g_cam_height,5*np.cos(g_cam_ang))
+        V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+        M = glm.mat4()
+
+        # update uniforms
+        MVP = P*V*M
+        glUseProgram(shader_program)
+        glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
+
+        # draw cube w.r.t. the current frame MVP
+        glBindTexture(GL_TEXTURE_2D, streamer.texture)
+        glBindVertexArray(vao_cube)
+        glDrawArrays(GL_TRIANGLES, 0, 36)
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    ring.delete()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
@@ -79,17 +79,46 @@ class Node:
         self.shape_transform = shape_transform
         self.color = color
 
+        # dirty flags
+        # dirty: global_transform of this node (and its whole subtree) should be recomputed
+        # subtree_dirty: this node or any of its descendants is dirty
+        self.dirty = False
+        self.subtree_dirty = False
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        self.dirty = True
+        # let the ancestors know that there is a dirty node in their subtrees
+        node = self
+        while node is not None and not node.subtree_dirty:
+            node.subtree_dirty = True
+            node = node.parent
+
     def set_transform(self, transform):
         self.transform = transform
-
-    def update_tree_global_transform(self):
-        if self.parent is not None:
-            self.global_transform = self.parent.get_global_transform() * self.transform
-        else:
-            self.global_transform = self.transform
+        self.mark_dirty()
+
+    def update_tree_global_transform(self, parent_updated=False):
+        # skip clean branches: nothing to do if neither this subtree nor any ancestor has been changed
+        if not (parent_updated or self.subtree_dirty):
+            return 0
+
+        # returns the number of recomputed global transforms
+        num_updated = 0
+        updated = parent_updated or self.dirty
+        if updated:
+            if self.parent is not None:
+                self.global_transform = self.parent.get_global_transform() * self.transform
+            else:
+                self.global_transform = self.transform
+            num_updated += 1
+
+        self.dirty = False
+        self.subtree_dirty = False
 
         for child in self.children:
-            child.update_tree_global_transform()
+            num_updated += child.update_tree_global_transform(updated)
+        return num_updated
 
     def get_global_transform(self):
         return self.global_transform
@@ -273,6 +302,8 @@ def main():
     base = Node(None, glm.scale((.2,.2,0.)), glm.vec3(0,0,1))
     arm = Node(base, glm.translate((.5,0,.01)) * glm.scale((.5,.1,0.)), glm.vec3(1,0,0))
 
+    prev_num_updated = -1
+
     # loop until the user closes the window
     while not glfwWindowShouldClose(window):
         # enable depth test (we'll see details later)
@@ -296,8 +327,11 @@ def main():
         base.set_transform(glm.translate((glm.sin(t),0,0)))
         arm.set_transform(glm.translate((.2, 0, 0)) * glm.rotate(t, (0,0,1)))
 
-        # recursively update global transformations of all nodes
-        base.update_tree_global_transform()
+        # recursively update global transformations of changed nodes
+        num_updated = base.update_tree_global_transform()
+        if num_updated != prev_num_updated:
+            glfwSetWindowTitle(window, '1-hierarchical (%d matrices updated)'%num_updated)
+            prev_num_updated = num_updated
 
         # draw nodes
         glUseProgram(shader_for_box)
@@ -0,0 +1,353 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import numpy as np
+
+g_cam_ang = 0.
+g_cam_height = .1
+
+# number of cubes along each axis of the cube array (5x5x5 ~ 100x100x100)
+g_grid_size = 5
+g_grid_size_changed = True
+
+g_vertex_shader_src_instanced = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_color; 
+layout (location = 2) in mat4 vin_model;    // per-instance model matrix - occupies locations 2,3,4,5
+
+out vec4 vout_color;
+
+uniform mat4 MVP;
+
+void main()
+{
+    // 3D points in homogeneous coordinates
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+
+    gl_Position = MVP * vin_model * p3D_in_hcoord;
+
+    vout_color = vec4(vin_color, 1.);
+}
+'''
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_color; 
+
+out vec4 vout_color;
+
+uniform mat4 MVP;
+
+void main()
+{
+    // 3D points in homogeneous coordinates
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_color = vec4(vin_color, 1.);
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+in vec4 vout_color;
+
+out vec4 FragColor;
+
+void main()
+{
+    FragColor = vout_color;
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height, g_grid_size, g_grid_size_changed
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+            elif key==GLFW_KEY_UP:
+                g_grid_size = min(g_grid_size + 5, 100)
+                g_grid_size_changed = True
+            elif key==GLFW_KEY_DOWN:
+                g_grid_size = max(g_grid_size - 5, 5)
+                g_grid_size_changed = True
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 8 vertices
+    vertices = glm.array(glm.float32,
+        # position      color
+        -1 ,  1 ,  1 ,  1, 1, 1, # v0
+         1 ,  1 ,  1 ,  1, 1, 1, # v1
+         1 , -1 ,  1 ,  1, 1, 1, # v2
+        -1 , -1 ,  1 ,  1, 1, 1, # v3
+        -1 ,  1 , -1 ,  1, 1, 1, # v4
+         1 ,  1 , -1 ,  1, 1, 1, # v5
+         1 , -1 , -1 ,  1, 1, 1, # v6
+        -1 , -1 , -1 ,  1, 1, 1, # v7
+    )
+
+    # prepare index data
+    # 12 triangles
+    indices = glm.array(glm.uint32,
+        0,2,1,
+        0,3,2,
+        4,5,6,
+        4,6,7,
+        0,1,5,
+        0,5,4,
+        3,6,2,
+        3,7,6,
+        1,2,6,
+        1,6,5,
+        0,7,3,
+        0,4,7,
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # create and activate EBO (element buffer object)
+    EBO = glGenBuffers(1)   # create a buffer object ID and store it to EBO variable
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, EBO)  # activate EBO as an element buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # copy index data to EBO
+    glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy index data to the currently bound element buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex colors
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    # create instance VBO for per-cube model matrices (filled by update_cube_array_instances())
+    VBO_instance = glGenBuffers(1)
+    glBindBuffer(GL_ARRAY_BUFFER, VBO_instance)
+
+    # configure per-instance model matrices
+    # a mat4 attribute is passed as 4 vec4 attributes (one per column) at consecutive locations
+    for i in range(4):
+        glVertexAttribPointer(2+i, 4, GL_FLOAT, GL_FALSE, 16 * glm.sizeof(glm.float32), ctypes.c_void_p(4*i*glm.sizeof(glm.float32)))
+        glEnableVertexAttribArray(2+i)
+        glVertexAttribDivisor(2+i, 1)   # advance this attribute once per instance, not once per vertex
+
+    return VAO, VBO_instance
+
+def build_cube_array_model_matrices(n):
+    # model matrices of n*n*n cubes, equivalent to
+    # glm.translate(glm.vec3(1*i, 1*j, 1*k)) * glm.scale(glm.vec3(.5,.5,.5)) for all i, j, k in range(n)
+    i, j, k = np.meshgrid(np.arange(n), np.arange(n), np.arange(n), indexing='ij')
+    translations = np.stack([i.ravel(), j.ravel(), k.ravel()], axis=1)
+
+    # (N,4,4) array stored in column-major order (same as glm): models[:, c] is the c-th column
+    models = np.zeros((n*n*n, 4, 4), dtype=np.float32)
+    models[:, 0, 0] = .5
+    models[:, 1, 1] = .5
+    models[:, 2, 2] = .5
+    models[:, 3, :3] = translations
+    models[:, 3, 3] = 1.
+    return models
+
+def update_cube_array_instances(vbo_instance, n):
+    models = build_cube_array_model_matrices(n)
+
+    # upload all model matrices at once
+    glBindBuffer(GL_ARRAY_BUFFER, vbo_instance)
+    glBufferData(GL_ARRAY_BUFFER, models.nbytes, models, GL_STATIC_DRAW)
+    return len(models)
+
+def prepare_vao_frame():
+    # prepare vertex data (in main memory)
+    vertices = glm.array(glm.float32,
+        # position        # color
+         0.0, 0.0, 0.0,  1.0, 0.0, 0.0, # x-axis start
+         1.0, 0.0, 0.0,  1.0, 0.0, 0.0, # x-axis end 
+         0.0, 0.0, 0.0,  0.0, 1.0, 0.0, # y-axis start
+         0.0, 1.0, 0.0,  0.0, 1.0, 0.0, # y-axis end 
+         0.0, 0.0, 0.0,  0.0, 0.0, 1.0, # z-axis start
+         0.0, 0.0, 1.0,  0.0, 0.0, 1.0, # z-axis end 
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex colors
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    return VAO
+
+def draw_frame(vao, MVP, loc_MVP):
+    glBindVertexArray(vao)
+    glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
+    glDrawArrays(GL_LINES, 0, 6)
+
+def draw_cube_array_instanced(vao, MVP, loc_MVP, num_instances):
+    glBindVertexArray(vao)
+    glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
+    # draw all cubes with a single draw call
+    glDrawElementsInstanced(GL_TRIANGLES, 36, GL_UNSIGNED_INT, None, num_instances)
+
+def main():
+    global g_grid_size_changed
+
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '4-cube-array-instanced', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders
+    shader_for_frame = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+    shader_for_cubes = load_shaders(g_vertex_shader_src_instanced, g_fragment_shader_src)
+
+    # get uniform locations
+    loc_MVP_frame = glGetUniformLocation(shader_for_frame, 'MVP')
+    loc_MVP_cubes = glGetUniformLocation(shader_for_cubes, 'MVP')
+    
+    # prepare vaos
+    vao_cube, vbo_cube_instance = prepare_vao_cube()
+    vao_frame = prepare_vao_frame()
+    num_cubes = 0
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        # rebuild per-cube model matrices only when the grid size is changed (UP / DOWN key)
+        if g_grid_size_changed:
+            num_cubes = update_cube_array_instances(vbo_cube_instance, g_grid_size)
+            glfwSetWindowTitle(window, '4-cube-array-instanced (%d cubes)'%num_cubes)
+            g_grid_size_changed = False
+
+        # enable depth test (we'll see details later)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        # render in "wireframe mode"
+        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
+
+        # projection matrix
+        P = glm.perspective(45, 1, 1, 10)
+
+        # view matrix
+        # rotate camera position with g_cam_ang / move camera up & down with g_cam_height
+        V = glm.lookAt(glm.vec3(5*np.sin(g_cam_ang),g_cam_height,5*np.cos(g_cam_ang)), glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+        # draw world frame
+        glUseProgram(shader_for_frame)
+        draw_frame(vao_frame, P*V*glm.mat4(), loc_MVP_frame)
+
+        # scale down the whole array so that it occupies the same space as the 5x5x5 array
+        M = glm.scale(glm.vec3(5/g_grid_size))
+
+        # draw cube array w.r.t. the current frame MVP
+        glUseProgram(shader_for_cubes)
+        draw_cube_array_instanced(vao_cube, P*V*M, loc_MVP_cubes, num_cubes)
+
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
+
+
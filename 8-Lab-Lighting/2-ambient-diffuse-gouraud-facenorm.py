@@ -17,6 +17,7 @@ out vec4 vout_color;
 
 uniform mat4 MVP;
 uniform mat4 M;
+uniform mat3 normal_matrix;  // inverse transpose of the upper-left 3x3 of M, computed on the CPU
 
 void main()
 {
@@ -40,7 +41,7 @@ void main()
     vec3 ambient = light_ambient * material_ambient;
 
     // diffuse
-    vec3 normal = normalize( mat3(inverse(transpose(M)) ) * vin_normal);
+    vec3 normal = normalize( normal_matrix * vin_normal);
     vec3 surface_pos = vec3(M * vec4(vin_pos, 1));
     vec3 light_dir = normalize(light_pos - surface_pos);
     float diff = max(dot(normal, light_dir), 0);
@@ -224,6 +225,7 @@ def main():
     # get uniform locations
     loc_MVP = glGetUniformLocation(shader_program, 'MVP')
     loc_M = glGetUniformLocation(shader_program, 'M')
+    loc_normal_matrix = glGetUniformLocation(shader_program, 'normal_matrix')
     
     # prepare vaos
     vao_cube = prepare_vao_cube()
@@ -262,6 +264,10 @@ def main():
         glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
         glUniformMatrix4fv(loc_M, 1, GL_FALSE, glm.value_ptr(M))
 
+        # normal matrix: computed once per object instead of once per vertex in the shader
+        normal_matrix = glm.transpose(glm.inverse(glm.mat3(M)))
+        glUniformMatrix3fv(loc_normal_matrix, 1, GL_FALSE, glm.value_ptr(normal_matrix))
+
         # draw cube w.r.t. the current frame MVP
         glBindVertexArray(vao_cube)
         glDrawArrays(GL_TRIANGLES, 0, 36)
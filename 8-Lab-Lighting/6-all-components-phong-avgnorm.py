@@ -18,6 +18,7 @@ out vec3 vout_normal;
 
 uniform mat4 MVP;
 uniform mat4 M;
+uniform mat3 normal_matrix;  // inverse transpose of the upper-left 3x3 of M, computed on the CPU
 
 void main()
 {
@@ -25,7 +26,7 @@ void main()
     gl_Position = MVP * p3D_in_hcoord;
 
     vout_surface_pos = vec3(M * vec4(vin_pos, 1));
-    vout_normal = normalize( mat3(inverse(transpose(M)) ) * vin_normal);
+    vout_normal = normalize( normal_matrix * vin_normal);
 }
 '''
 
@@ -225,6 +226,7 @@ def main():
     # get uniform locations
     loc_MVP = glGetUniformLocation(shader_program, 'MVP')
     loc_M = glGetUniformLocation(shader_program, 'M')
+    loc_normal_matrix = glGetUniformLocation(shader_program, 'normal_matrix')
     loc_view_pos = glGetUniformLocation(shader_program, 'view_pos')
 
     # prepare vaos
@@ -261,6 +263,10 @@ def main():
         glUseProgram(shader_program)
         glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
         glUniformMatrix4fv(loc_M, 1, GL_FALSE, glm.value_ptr(M))
+
+        # normal matrix: computed once per object instead of once per vertex in the shader
+        normal_matrix = glm.transpose(glm.inverse(glm.mat3(M)))
+        glUniformMatrix3fv(loc_normal_matrix, 1, GL_FALSE, glm.value_ptr(normal_matrix))
         glUniform3f(loc_view_pos, view_pos.x, view_pos.y, view_pos.z)
 
         # draw cube w.r.t. the current frame MVP
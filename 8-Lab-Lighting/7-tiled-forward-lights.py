@@ -0,0 +1,493 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import time
+import numpy as np
+
+g_cam_ang = 0.
+g_cam_height = 6.
+
+# point lights moving over the cube grid
+g_num_lights = 128
+g_light_radius = 2.
+
+# extra lights placed outside the view (UP/DOWN keys); culling should make them nearly free
+g_num_outside_lights = 0
+
+# lights are culled per screen tile of g_tile_size x g_tile_size pixels
+g_tile_size = 32
+g_use_culling = True
+
+g_grid_size = 12
+g_near = 1.
+g_far = 50.
+
+g_run_benchmark = False
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+
+out vec3 vout_surface_pos;
+out vec3 vout_normal;
+
+uniform mat4 MVP;
+uniform mat4 M;
+uniform mat3 normal_matrix;  // inverse transpose of the upper-left 3x3 of M, computed on the CPU
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_surface_pos = vec3(M * vec4(vin_pos, 1));
+    vout_normal = normalize(normal_matrix * vin_normal);
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+in vec3 vout_surface_pos;
+in vec3 vout_normal;  // interpolated normal
+
+out vec4 FragColor;
+
+uniform vec3 view_pos;
+uniform vec3 material_color;
+
+// 2 texels per light: (position, radius), (color, 0)
+uniform samplerBuffer light_data;
+
+// per tile: (offset, count) into tile_light_indices
+uniform isamplerBuffer tile_light_ranges;
+uniform isamplerBuffer tile_light_indices;
+uniform int tile_size;
+uniform int num_tiles_x;
+
+void main()
+{
+    // material properties
+    float material_shininess = 32.0;
+
+    // material components
+    vec3 material_ambient = material_color;
+    vec3 material_diffuse = material_color;
+    vec3 material_specular = vec3(1,1,1);  // for non-metal material
+
+    // ambient
+    vec3 color = 0.05 * material_ambient;
+
+    // for diffiuse and specular
+    vec3 normal = normalize(vout_normal);
+    vec3 surface_pos = vout_surface_pos;
+    vec3 view_dir = normalize(view_pos - surface_pos);
+
+    // only the lights whose screen-space bounds overlap this fragment's tile
+    ivec2 tile = ivec2(gl_FragCoord.xy) / tile_size;
+    ivec2 range = texelFetch(tile_light_ranges, tile.y*num_tiles_x + tile.x).xy;
+
+    for (int i = range.x; i < range.x + range.y; i++)
+    {
+        int light = texelFetch(tile_light_indices, i).x;
+        vec4 light_pos_radius = texelFetch(light_data, 2*light);
+        vec3 light_pos = light_pos_radius.xyz;
+        vec3 light_color = texelFetch(light_data, 2*light+1).rgb;
+
+        // light fades out to 0 at its radius
+        float dist = length(light_pos - surface_pos);
+        float attenuation = clamp(1. - dist/light_pos_radius.w, 0., 1.);
+        attenuation *= attenuation;
+
+        // diffuse
+        vec3 light_dir = (light_pos - surface_pos) / dist;
+        float diff = max(dot(normal, light_dir), 0);
+        vec3 diffuse = diff * light_color * material_diffuse;
+
+        // specular
+        vec3 reflect_dir = reflect(-light_dir, normal);
+        float spec = pow( max(dot(view_dir, reflect_dir), 0.0), material_shininess);
+        vec3 specular = spec * light_color * material_specular;
+
+        color += attenuation * (diffuse + specular);
+    }
+
+    FragColor = vec4(color, 1.);
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height, g_num_outside_lights, g_use_culling, g_run_benchmark
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .5
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.5
+            elif key==GLFW_KEY_UP:
+                g_num_outside_lights += 128
+            elif key==GLFW_KEY_DOWN:
+                g_num_outside_lights = max(0, g_num_outside_lights - 128)
+            elif key==GLFW_KEY_C and action==GLFW_PRESS:
+                g_use_culling = not g_use_culling
+            elif key==GLFW_KEY_B and action==GLFW_PRESS:
+                g_run_benchmark = True
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 36 vertices for 12 triangles
+    vertices = glm.array(glm.float32,
+        # position      normal
+        -1 ,  1 ,  1 ,  0, 0, 1, # v0
+         1 , -1 ,  1 ,  0, 0, 1, # v2
+         1 ,  1 ,  1 ,  0, 0, 1, # v1
+
+        -1 ,  1 ,  1 ,  0, 0, 1, # v0
+        -1 , -1 ,  1 ,  0, 0, 1, # v3
+         1 , -1 ,  1 ,  0, 0, 1, # v2
+
+        -1 ,  1 , -1 ,  0, 0,-1, # v4
+         1 ,  1 , -1 ,  0, 0,-1, # v5
+         1 , -1 , -1 ,  0, 0,-1, # v6
+
+        -1 ,  1 , -1 ,  0, 0,-1, # v4
+         1 , -1 , -1 ,  0, 0,-1, # v6
+        -1 , -1 , -1 ,  0, 0,-1, # v7
+
+        -1 ,  1 ,  1 ,  0, 1, 0, # v0
+         1 ,  1 ,  1 ,  0, 1, 0, # v1
+         1 ,  1 , -1 ,  0, 1, 0, # v5
+
+        -1 ,  1 ,  1 ,  0, 1, 0, # v0
+         1 ,  1 , -1 ,  0, 1, 0, # v5
+        -1 ,  1 , -1 ,  0, 1, 0, # v4
+ 
+        -1 , -1 ,  1 ,  0,-1, 0, # v3
+         1 , -1 , -1 ,  0,-1, 0, # v6
+         1 , -1 ,  1 ,  0,-1, 0, # v2
+
+        -1 , -1 ,  1 ,  0,-1, 0, # v3
+        -1 , -1 , -1 ,  0,-1, 0, # v7
+         1 , -1 , -1 ,  0,-1, 0, # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0, # v1
+         1 , -1 ,  1 ,  1, 0, 0, # v2
+         1 , -1 , -1 ,  1, 0, 0, # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0, # v1
+         1 , -1 , -1 ,  1, 0, 0, # v6
+         1 ,  1 , -1 ,  1, 0, 0, # v5
+
+        -1 ,  1 ,  1 , -1, 0, 0, # v0
+        -1 , -1 , -1 , -1, 0, 0, # v7
+        -1 , -1 ,  1 , -1, 0, 0, # v3
+
+        -1 ,  1 ,  1 , -1, 0, 0, # v0
+        -1 ,  1 , -1 , -1, 0, 0, # v4
+        -1 , -1 , -1 , -1, 0, 0, # v7
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    return VAO
+
+class TextureBuffer:
+    # buffer object exposed to shaders as a samplerBuffer / isamplerBuffer
+    def __init__(self, internal_format, dtype):
+        self.internal_format = internal_format
+        self.dtype = dtype
+        self.buffer = glGenBuffers(1)
+        self.texture = glGenTextures(1)
+        glBindBuffer(GL_TEXTURE_BUFFER, self.buffer)
+        glBufferData(GL_TEXTURE_BUFFER, 16, None, GL_STREAM_DRAW)
+        glBindTexture(GL_TEXTURE_BUFFER, self.texture)
+        glTexBuffer(GL_TEXTURE_BUFFER, internal_format, self.buffer)
+
+    def update(self, data):
+        data = np.ascontiguousarray(data, self.dtype)
+        if data.size == 0:
+            data = np.zeros(4, self.dtype)
+        glBindBuffer(GL_TEXTURE_BUFFER, self.buffer)
+        glBufferData(GL_TEXTURE_BUFFER, data.nbytes, data, GL_STREAM_DRAW)  # reallocating avoids waiting for the previous frame
+
+    def bind(self, unit):
+        glActiveTexture(GL_TEXTURE0 + unit)
+        glBindTexture(GL_TEXTURE_BUFFER, self.texture)
+
+def get_light_screen_bounds(positions, radii, V, P, width, height):
+    # conservative pixel rectangles (x0, y0, x1, y1) of the light spheres and a mask of lights that may affect the screen
+    V = np.array(V, np.float32)
+    P = np.array(P, np.float32)
+    centers = positions @ V[:3, :3].T + V[:3, 3]  # view space; the camera looks along -z
+    z = centers[:, 2]
+
+    # lights entirely behind the near plane or beyond the far plane do not affect the screen
+    visible = (z - radii < -g_near) & (z + radii > -g_far)
+
+    # project the 8 corners of each sphere's view-space bounding box
+    corners = centers[:, None, :] + radii[:, None, None] * np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], np.float32)
+    clip = corners @ P[:3, :3].T + P[:3, 3]
+    w = corners @ P[3, :3] + P[3, 3]
+    ndc = clip[:, :, :2] / w[:, :, None]
+    bounds = np.concatenate([ndc.min(axis=1), ndc.max(axis=1)], axis=1)
+
+    # spheres crossing the near plane cover the whole screen
+    crossing = z + radii > -g_near
+    bounds[crossing] = (-1, -1, 1, 1)
+
+    bounds = (bounds*.5 + .5) * np.array([width, height, width, height], np.float32)
+    visible &= (bounds[:, 2] >= 0) & (bounds[:, 3] >= 0) & (bounds[:, 0] < width) & (bounds[:, 1] < height)
+    return bounds, visible
+
+def cull_lights_tiled(positions, radii, V, P, width, height, tile_size):
+    # assign lights to screen tiles. return (ranges, indices): ranges[tile] = (offset, count) of the tile's lights in indices
+    num_tiles_x = (width + tile_size - 1) // tile_size
+    num_tiles_y = (height + tile_size - 1) // tile_size
+
+    bounds, visible = get_light_screen_bounds(positions, radii, V, P, width, height)
+    lights = np.nonzero(visible)[0]
+    x0 = np.clip(bounds[lights, 0] // tile_size, 0, num_tiles_x-1).astype(np.int64)
+    y0 = np.clip(bounds[lights, 1] // tile_size, 0, num_tiles_y-1).astype(np.int64)
+    x1 = np.clip(bounds[lights, 2] // tile_size, 0, num_tiles_x-1).astype(np.int64)
+    y1 = np.clip(bounds[lights, 3] // tile_size, 0, num_tiles_y-1).astype(np.int64)
+
+    # one (tile, light) pair per tile covered by each light's rectangle
+    w = x1 - x0 + 1
+    counts = w * (y1 - y0 + 1)
+    starts = np.cumsum(counts) - counts
+    local = np.arange(counts.sum()) - np.repeat(starts, counts)
+    tiles = (np.repeat(y0, counts) + local // np.repeat(w, counts)) * num_tiles_x + np.repeat(x0, counts) + local % np.repeat(w, counts)
+
+    # group the pairs by tile
+    order = np.argsort(tiles, kind='stable')
+    indices = np.repeat(lights, counts)[order]
+    tile_counts = np.bincount(tiles, minlength=num_tiles_x*num_tiles_y)
+    ranges = np.stack([np.cumsum(tile_counts) - tile_counts, tile_counts], axis=1)
+    return ranges.astype(np.int32), indices.astype(np.int32)
+
+def all_lights_per_tile(num_lights, width, height, tile_size):
+    # no culling: every tile gets every light
+    num_tiles = ((width + tile_size - 1) // tile_size) * ((height + tile_size - 1) // tile_size)
+    ranges = np.tile(np.array([[0, num_lights]], np.int32), (num_tiles, 1))
+    return ranges, np.arange(num_lights, dtype=np.int32)
+
+def make_lights(num_lights, num_outside_lights, t, view_pos):
+    # return positions, colors, radii. lights move in circles over the grid; outside lights are put behind the camera
+    rng = np.random.default_rng(0)
+    phase = rng.random(num_lights) * 2*np.pi
+    orbit = rng.random(num_lights) * g_grid_size*.5
+    speed = rng.random(num_lights)*.5 + .25
+    positions = np.stack([orbit*np.cos(phase + t*speed), np.full(num_lights, .2), orbit*np.sin(phase + t*speed)], axis=1)
+    colors = rng.random((num_lights, 3))*.8 + .2
+    radii = np.full(num_lights, g_light_radius)
+
+    if num_outside_lights > 0:
+        back = np.array(view_pos) / np.linalg.norm(view_pos)
+        outside = back*(np.linalg.norm(view_pos) + 5) + (rng.random((num_outside_lights, 3)) - .5)*4
+        positions = np.concatenate([positions, outside])
+        colors = np.concatenate([colors, rng.random((num_outside_lights, 3))])
+        radii = np.concatenate([radii, np.full(num_outside_lights, g_light_radius)])
+
+    return positions.astype(np.float32), colors.astype(np.float32), radii.astype(np.float32)
+
+def draw_scene(vao, P, V, view_pos, unif_locs):
+    # grid of cubes on a floor
+    glUniform3f(unif_locs['view_pos'], view_pos.x, view_pos.y, view_pos.z)
+    glBindVertexArray(vao)
+
+    cubes = [(glm.translate((0,-.6,0)) * glm.scale((g_grid_size*.5+1, .1, g_grid_size*.5+1)), glm.vec3(.8,.8,.8))]
+    for i in range(g_grid_size):
+        for j in range(g_grid_size):
+            M = glm.translate((i - (g_grid_size-1)*.5, 0, j - (g_grid_size-1)*.5)) * glm.scale((.3,.5,.3))
+            cubes.append((M, glm.vec3(.9,.9,.9)))
+
+    for M, color in cubes:
+        MVP = P*V*M
+        normal_matrix = glm.transpose(glm.inverse(glm.mat3(M)))
+        glUniformMatrix4fv(unif_locs['MVP'], 1, GL_FALSE, glm.value_ptr(MVP))
+        glUniformMatrix4fv(unif_locs['M'], 1, GL_FALSE, glm.value_ptr(M))
+        glUniformMatrix3fv(unif_locs['normal_matrix'], 1, GL_FALSE, glm.value_ptr(normal_matrix))
+        glUniform3f(unif_locs['material_color'], color.r, color.g, color.b)
+        glDrawArrays(GL_TRIANGLES, 0, 36)
+
+def render_frame(vao, unif_locs, buffers, width, height, num_outside_lights, use_culling, t):
+    # cull lights on the CPU, upload light & tile data, and draw the scene
+    light_data_buffer, tile_ranges_buffer, tile_indices_buffer = buffers
+
+    glViewport(0, 0, width, height)
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    glEnable(GL_DEPTH_TEST)
+
+    # projection matrix
+    P = glm.perspective(45, width/height, g_near, g_far)
+
+    # view matrix
+    view_pos = glm.vec3(12*np.sin(g_cam_ang),g_cam_height,12*np.cos(g_cam_ang))
+    V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+    positions, colors, radii = make_lights(g_num_lights, num_outside_lights, t, view_pos)
+    if use_culling:
+        ranges, indices = cull_lights_tiled(positions, radii, V, P, width, height, g_tile_size)
+    else:
+        ranges, indices = all_lights_per_tile(len(positions), width, height, g_tile_size)
+
+    light_data = np.zeros((len(positions), 2, 4), np.float32)
+    light_data[:, 0, :3] = positions
+    light_data[:, 0, 3] = radii
+    light_data[:, 1, :3] = colors
+    light_data_buffer.update(light_data)
+    tile_ranges_buffer.update(ranges)
+    tile_indices_buffer.update(indices)
+
+    glUniform1i(unif_locs['num_tiles_x'], (width + g_tile_size - 1) // g_tile_size)
+    draw_scene(vao, P, V, view_pos, unif_locs)
+    return ranges[:, 1].sum()
+
+def benchmark_light_culling(window, vao, unif_locs, buffers, num_frames=20):
+    # per-frame time while adding lights outside the view, with and without culling
+    width, height = glfwGetFramebufferSize(window)
+    print('light culling benchmark: %d lights in view, %d frames each'%(g_num_lights, num_frames))
+    print('  outside lights   culled (ms)   not culled (ms)')
+    for num_outside_lights in (0, 128, 256, 512, 1024):
+        times = []
+        for use_culling in (True, False):
+            render_frame(vao, unif_locs, buffers, width, height, num_outside_lights, use_culling, 0.)
+            glFinish()
+            start = time.perf_counter()
+            for i in range(num_frames):
+                render_frame(vao, unif_locs, buffers, width, height, num_outside_lights, use_culling, 0.)
+                glFinish()
+            times.append((time.perf_counter() - start) / num_frames * 1000)
+        print('  %14d   %11.2f   %15.2f'%(num_outside_lights, times[0], times[1]))
+
+def main():
+    global g_run_benchmark
+
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '7-tiled-forward-lights', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders & get uniform locations
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+    unif_names = ['MVP', 'M', 'normal_matrix', 'view_pos', 'material_color', 'num_tiles_x']
+    unif_locs = {}
+    for name in unif_names:
+        unif_locs[name] = glGetUniformLocation(shader_program, name)
+
+    # prepare vaos
+    vao_cube = prepare_vao_cube()
+
+    # light data & per-tile light lists, read by the fragment shader with texelFetch
+    buffers = (TextureBuffer(GL_RGBA32F, np.float32), TextureBuffer(GL_RG32I, np.int32), TextureBuffer(GL_R32I, np.int32))
+
+    glUseProgram(shader_program)
+    for unit, (name, buffer) in enumerate(zip(['light_data', 'tile_light_ranges', 'tile_light_indices'], buffers)):
+        glUniform1i(glGetUniformLocation(shader_program, name), unit)
+        buffer.bind(unit)
+    glUniform1i(glGetUniformLocation(shader_program, 'tile_size'), g_tile_size)
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        if g_run_benchmark:
+            benchmark_light_culling(window, vao_cube, unif_locs, buffers)
+            g_run_benchmark = False
+
+        width, height = glfwGetFramebufferSize(window)
+        num_pairs = render_frame(vao_cube, unif_locs, buffers, width, height, g_num_outside_lights, g_use_culling, glfwGetTime())
+        glfwSetWindowTitle(window, '7-tiled-forward-lights (%d lights, culling %s, %d tile-light pairs)'%(g_num_lights + g_num_outside_lights, 'on' if g_use_culling else 'off', num_pairs))
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
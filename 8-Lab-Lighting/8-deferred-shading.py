@@ -0,0 +1,568 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import time
+import numpy as np
+
+g_cam_ang = 0.
+g_cam_height = 2.
+
+# dense scene: g_grid_size x g_grid_size x g_num_layers cubes, drawn back to front so that forward shading pays for overdraw
+g_grid_size = 10
+g_num_layers = 4
+g_num_lights = 8
+
+g_use_deferred = True
+
+# what the lighting pass displays (V key)
+g_gbuffer_view_names = ['lit', 'position', 'normal', 'albedo', 'specular']
+g_gbuffer_view = 0
+
+g_run_benchmark = False
+
+# the Phong equations of 4-all-components-phong-facenorm.py, shared by the forward shader and the deferred lighting pass
+g_phong_src = '''
+#define MAX_LIGHTS 32
+
+uniform vec3 view_pos;
+uniform int num_lights;
+uniform vec3 light_positions[MAX_LIGHTS];
+uniform vec3 light_colors[MAX_LIGHTS];
+
+vec3 phong(vec3 surface_pos, vec3 normal, vec3 material_color, vec3 material_specular)
+{
+    // material properties
+    float material_shininess = 32.0;
+
+    // material components
+    vec3 material_ambient = material_color;
+    vec3 material_diffuse = material_color;
+
+    vec3 color = vec3(0);
+    for (int i = 0; i < num_lights; i++)
+    {
+        // light and material properties
+        vec3 light_pos = light_positions[i];
+        vec3 light_color = light_colors[i];
+
+        // light components
+        vec3 light_ambient = 0.1*light_color;
+        vec3 light_diffuse = light_color;
+        vec3 light_specular = light_color;
+
+        // ambient
+        vec3 ambient = light_ambient * material_ambient;
+
+        // for diffiuse and specular
+        vec3 light_dir = normalize(light_pos - surface_pos);
+
+        // diffuse
+        float diff = max(dot(normal, light_dir), 0);
+        vec3 diffuse = diff * light_diffuse * material_diffuse;
+
+        // specular
+        vec3 view_dir = normalize(view_pos - surface_pos);
+        vec3 reflect_dir = reflect(-light_dir, normal);
+        float spec = pow( max(dot(view_dir, reflect_dir), 0.0), material_shininess);
+        vec3 specular = spec * light_specular * material_specular;
+
+        color += ambient + diffuse + specular;
+    }
+    return color;
+}
+'''
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+
+out vec3 vout_surface_pos;
+out vec3 vout_normal;
+
+uniform mat4 MVP;
+uniform mat4 M;
+uniform mat3 normal_matrix;  // inverse transpose of the upper-left 3x3 of M, computed on the CPU
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_surface_pos = vec3(M * vec4(vin_pos, 1));
+    vout_normal = normalize( normal_matrix * vin_normal);
+}
+'''
+
+# forward shading: every rasterized fragment runs the full light loop, even if it is overdrawn later
+g_forward_fragment_shader_src = '''
+#version 330 core
+''' + g_phong_src + '''
+in vec3 vout_surface_pos;
+in vec3 vout_normal;  // interpolated normal
+
+out vec4 FragColor;
+
+uniform vec3 material_color;
+uniform float material_specular;
+
+void main()
+{
+    vec3 color = phong(vout_surface_pos, normalize(vout_normal), material_color, vec3(material_specular));
+    FragColor = vec4(color, 1.);
+}
+'''
+
+# geometry pass: write surface attributes to the G-buffer, no lighting
+g_gbuffer_fragment_shader_src = '''
+#version 330 core
+
+in vec3 vout_surface_pos;
+in vec3 vout_normal;  // interpolated normal
+
+layout (location = 0) out vec4 gbuffer_position;
+layout (location = 1) out vec4 gbuffer_normal;
+layout (location = 2) out vec4 gbuffer_albedo_specular;
+
+uniform vec3 material_color;
+uniform float material_specular;
+
+void main()
+{
+    gbuffer_position = vec4(vout_surface_pos, 1.);
+    gbuffer_normal = vec4(normalize(vout_normal), 0.);
+    gbuffer_albedo_specular = vec4(material_color, material_specular);
+}
+'''
+
+# lighting pass: one full-screen triangle, the light loop runs once per pixel
+g_lighting_vertex_shader_src = '''
+#version 330 core
+
+void main()
+{
+    // full-screen triangle from gl_VertexID, no vertex buffer needed
+    vec2 p = vec2((gl_VertexID << 1) & 2, gl_VertexID & 2);
+    gl_Position = vec4(p*2. - 1., 0., 1.);
+}
+'''
+
+g_lighting_fragment_shader_src = '''
+#version 330 core
+''' + g_phong_src + '''
+out vec4 FragColor;
+
+uniform sampler2D gbuffer_position;
+uniform sampler2D gbuffer_normal;
+uniform sampler2D gbuffer_albedo_specular;
+uniform int gbuffer_view;
+
+void main()
+{
+    ivec2 pixel = ivec2(gl_FragCoord.xy);
+    vec4 position = texelFetch(gbuffer_position, pixel, 0);
+    if (position.w == 0.)   // background
+        discard;
+    vec3 normal = texelFetch(gbuffer_normal, pixel, 0).xyz;
+    vec4 albedo_specular = texelFetch(gbuffer_albedo_specular, pixel, 0);
+
+    vec3 color;
+    if (gbuffer_view == 1)
+        color = fract(position.xyz);
+    else if (gbuffer_view == 2)
+        color = normal*.5 + .5;
+    else if (gbuffer_view == 3)
+        color = albedo_specular.rgb;
+    else if (gbuffer_view == 4)
+        color = vec3(albedo_specular.a);
+    else
+        color = phong(position.xyz, normal, albedo_specular.rgb, vec3(albedo_specular.a));
+    FragColor = vec4(color, 1.);
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height, g_use_deferred, g_gbuffer_view, g_run_benchmark
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+            elif key==GLFW_KEY_D and action==GLFW_PRESS:
+                g_use_deferred = not g_use_deferred
+            elif key==GLFW_KEY_V and action==GLFW_PRESS:
+                g_gbuffer_view = (g_gbuffer_view + 1) % len(g_gbuffer_view_names)
+            elif key==GLFW_KEY_B and action==GLFW_PRESS:
+                g_run_benchmark = True
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 36 vertices for 12 triangles
+    vertices = glm.array(glm.float32,
+        # position      normal
+        -1 ,  1 ,  1 ,  0, 0, 1, # v0
+         1 , -1 ,  1 ,  0, 0, 1, # v2
+         1 ,  1 ,  1 ,  0, 0, 1, # v1
+
+        -1 ,  1 ,  1 ,  0, 0, 1, # v0
+        -1 , -1 ,  1 ,  0, 0, 1, # v3
+         1 , -1 ,  1 ,  0, 0, 1, # v2
+
+        -1 ,  1 , -1 ,  0, 0,-1, # v4
+         1 ,  1 , -1 ,  0, 0,-1, # v5
+         1 , -1 , -1 ,  0, 0,-1, # v6
+
+        -1 ,  1 , -1 ,  0, 0,-1, # v4
+         1 , -1 , -1 ,  0, 0,-1, # v6
+        -1 , -1 , -1 ,  0, 0,-1, # v7
+
+        -1 ,  1 ,  1 ,  0, 1, 0, # v0
+         1 ,  1 ,  1 ,  0, 1, 0, # v1
+         1 ,  1 , -1 ,  0, 1, 0, # v5
+
+        -1 ,  1 ,  1 ,  0, 1, 0, # v0
+         1 ,  1 , -1 ,  0, 1, 0, # v5
+        -1 ,  1 , -1 ,  0, 1, 0, # v4
+ 
+        -1 , -1 ,  1 ,  0,-1, 0, # v3
+         1 , -1 , -1 ,  0,-1, 0, # v6
+         1 , -1 ,  1 ,  0,-1, 0, # v2
+
+        -1 , -1 ,  1 ,  0,-1, 0, # v3
+        -1 , -1 , -1 ,  0,-1, 0, # v7
+         1 , -1 , -1 ,  0,-1, 0, # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0, # v1
+         1 , -1 ,  1 ,  1, 0, 0, # v2
+         1 , -1 , -1 ,  1, 0, 0, # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0, # v1
+         1 , -1 , -1 ,  1, 0, 0, # v6
+         1 ,  1 , -1 ,  1, 0, 0, # v5
+
+        -1 ,  1 ,  1 , -1, 0, 0, # v0
+        -1 , -1 , -1 , -1, 0, 0, # v7
+        -1 , -1 ,  1 , -1, 0, 0, # v3
+
+        -1 ,  1 ,  1 , -1, 0, 0, # v0
+        -1 ,  1 , -1 , -1, 0, 0, # v4
+        -1 , -1 , -1 , -1, 0, 0, # v7
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    return VAO
+
+class GBuffer:
+    # FBO with position / normal / albedo+specular color attachments and a depth buffer
+    def __init__(self, width, height):
+        self.fbo = glGenFramebuffers(1)
+        self.textures = []
+        self.depth = glGenRenderbuffers(1)
+        self.width = self.height = 0
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        if (width, height) == (self.width, self.height):
+            return
+        self.width, self.height = width, height
+
+        if self.textures:
+            glDeleteTextures(self.textures)
+        self.textures = list(glGenTextures(3))
+
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        # positions need float precision; normals are fine with half floats; albedo & specular in 8 bits
+        for i, (internal_format, type) in enumerate([(GL_RGBA32F, GL_FLOAT), (GL_RGBA16F, GL_FLOAT), (GL_RGBA8, GL_UNSIGNED_BYTE)]):
+            glBindTexture(GL_TEXTURE_2D, self.textures[i])
+            glTexImage2D(GL_TEXTURE_2D, 0, internal_format, width, height, 0, GL_RGBA, type, None)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+            glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0 + i, GL_TEXTURE_2D, self.textures[i], 0)
+        glDrawBuffers(3, [GL_COLOR_ATTACHMENT0, GL_COLOR_ATTACHMENT1, GL_COLOR_ATTACHMENT2])
+
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth)
+
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            print('ERROR::FRAMEBUFFER::GBUFFER_INCOMPLETE')
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+    def bind_textures(self):
+        for i, texture in enumerate(self.textures):
+            glActiveTexture(GL_TEXTURE0 + i)
+            glBindTexture(GL_TEXTURE_2D, texture)
+
+def get_uniform_locations(shader_program, names):
+    locs = {}
+    for name in names:
+        locs[name] = glGetUniformLocation(shader_program, name)
+    return locs
+
+def set_lights(unif_locs, view_pos):
+    glUniform3f(unif_locs['view_pos'], view_pos.x, view_pos.y, view_pos.z)
+    glUniform1i(unif_locs['num_lights'], len(g_light_positions))
+    glUniform3fv(unif_locs['light_positions'], len(g_light_positions), g_light_positions)
+    glUniform3fv(unif_locs['light_colors'], len(g_light_colors), g_light_colors)
+
+def make_lights(num_lights):
+    # lights in a ring above the scene; total light intensity does not depend on num_lights
+    ang = np.arange(num_lights) * 2*np.pi / num_lights
+    positions = np.stack([4*np.cos(ang), np.full(num_lights, 3.), 4*np.sin(ang)], axis=1)
+    colors = np.random.default_rng(0).random((num_lights, 3))*.5 + .5
+    colors *= 2. / num_lights
+    return positions.astype(np.float32), colors.astype(np.float32)
+
+g_light_positions, g_light_colors = make_lights(g_num_lights)
+
+def get_view_pos():
+    return glm.vec3(5*np.sin(g_cam_ang),g_cam_height,5*np.cos(g_cam_ang))
+
+def get_scene_objects(view_pos):
+    # (M, normal_matrix, material_color, material_specular) of each cube, sorted back to front (worst case for forward shading).
+    # only changes with the camera, so callers build it once per camera change instead of every frame
+    rng = np.random.default_rng(1)
+    objects = []
+    for k in range(g_num_layers):
+        for i in range(g_grid_size):
+            for j in range(g_grid_size):
+                pos = glm.vec3(i - (g_grid_size-1)*.5, k*.6 - 1., j - (g_grid_size-1)*.5) * .5
+                M = glm.translate(pos) * glm.rotate(float(rng.random())*np.pi, (0,1,0)) * glm.scale((.2,.2,.2))
+                color = glm.vec3(*(rng.random(3)*.7 + .3))
+                normal_matrix = glm.transpose(glm.inverse(glm.mat3(M)))
+                objects.append((glm.distance(pos, view_pos), M, normal_matrix, color, float(rng.random())))
+    objects.sort(key=lambda obj: -obj[0])
+    return [obj[1:] for obj in objects]
+
+def draw_objects(vao, P, V, objects, unif_locs):
+    glBindVertexArray(vao)
+    PV = P*V
+    for M, normal_matrix, color, specular in objects:
+        MVP = PV*M
+        glUniformMatrix4fv(unif_locs['MVP'], 1, GL_FALSE, glm.value_ptr(MVP))
+        glUniformMatrix4fv(unif_locs['M'], 1, GL_FALSE, glm.value_ptr(M))
+        glUniformMatrix3fv(unif_locs['normal_matrix'], 1, GL_FALSE, glm.value_ptr(normal_matrix))
+        glUniform3f(unif_locs['material_color'], color.r, color.g, color.b)
+        glUniform1f(unif_locs['material_specular'], specular)
+        glDrawArrays(GL_TRIANGLES, 0, 36)
+
+def render_forward(programs, vao, P, V, view_pos, objects):
+    forward_program, forward_locs = programs['forward']
+    glBindFramebuffer(GL_FRAMEBUFFER, 0)
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    glEnable(GL_DEPTH_TEST)
+
+    glUseProgram(forward_program)
+    set_lights(forward_locs, view_pos)
+    draw_objects(vao, P, V, objects, forward_locs)
+
+def render_deferred(programs, vao, P, V, view_pos, objects, gbuffer, vao_empty):
+    gbuffer_program, gbuffer_locs = programs['gbuffer']
+    lighting_program, lighting_locs = programs['lighting']
+
+    # geometry pass
+    glBindFramebuffer(GL_FRAMEBUFFER, gbuffer.fbo)
+    glClearColor(0, 0, 0, 0)    # position.w == 0 marks the background
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    glEnable(GL_DEPTH_TEST)
+
+    glUseProgram(gbuffer_program)
+    draw_objects(vao, P, V, objects, gbuffer_locs)
+
+    # lighting pass
+    glBindFramebuffer(GL_FRAMEBUFFER, 0)
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    glDisable(GL_DEPTH_TEST)
+
+    glUseProgram(lighting_program)
+    set_lights(lighting_locs, view_pos)
+    glUniform1i(lighting_locs['gbuffer_view'], g_gbuffer_view)
+    gbuffer.bind_textures()
+    glBindVertexArray(vao_empty)
+    glDrawArrays(GL_TRIANGLES, 0, 3)
+
+def render_frame(programs, vao, gbuffer, vao_empty, width, height, use_deferred, objects):
+    glViewport(0, 0, width, height)
+
+    # projection matrix
+    P = glm.perspective(45, width/height, 1, 20)
+
+    # view matrix
+    view_pos = get_view_pos()
+    V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+    if use_deferred:
+        gbuffer.resize(width, height)
+        render_deferred(programs, vao, P, V, view_pos, objects, gbuffer, vao_empty)
+    else:
+        render_forward(programs, vao, P, V, view_pos, objects)
+
+def benchmark_shading(window, programs, vao, gbuffer, vao_empty, num_frames=10):
+    # per-frame time of forward vs. deferred shading for increasing light counts
+    global g_light_positions, g_light_colors
+    width, height = glfwGetFramebufferSize(window)
+    saved_lights = g_light_positions, g_light_colors
+    objects = get_scene_objects(get_view_pos())    # scene setup is not part of the measured shading cost
+
+    print('shading benchmark: %d cubes, %dx%d pixels, %d frames each'%(g_grid_size*g_grid_size*g_num_layers, width, height, num_frames))
+    print('  lights   forward (ms)   deferred (ms)')
+    for num_lights in (1, 4, 8, 16, 32):
+        g_light_positions, g_light_colors = make_lights(num_lights)
+        times = []
+        for use_deferred in (False, True):
+            render_frame(programs, vao, gbuffer, vao_empty, width, height, use_deferred, objects)
+            glFinish()
+            start = time.perf_counter()
+            for i in range(num_frames):
+                render_frame(programs, vao, gbuffer, vao_empty, width, height, use_deferred, objects)
+                glFinish()
+            times.append((time.perf_counter() - start) / num_frames * 1000)
+        print('  %6d   %12.2f   %13.2f'%(num_lights, times[0], times[1]))
+
+    g_light_positions, g_light_colors = saved_lights
+
+def main():
+    global g_run_benchmark
+
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '8-deferred-shading', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders & get uniform locations
+    light_names = ['view_pos', 'num_lights', 'light_positions', 'light_colors']
+    object_names = ['MVP', 'M', 'normal_matrix', 'material_color', 'material_specular']
+    programs = {}
+    shader_program = load_shaders(g_vertex_shader_src, g_forward_fragment_shader_src)
+    programs['forward'] = (shader_program, get_uniform_locations(shader_program, object_names + light_names))
+    shader_program = load_shaders(g_vertex_shader_src, g_gbuffer_fragment_shader_src)
+    programs['gbuffer'] = (shader_program, get_uniform_locations(shader_program, object_names))
+    shader_program = load_shaders(g_lighting_vertex_shader_src, g_lighting_fragment_shader_src)
+    programs['lighting'] = (shader_program, get_uniform_locations(shader_program, light_names + ['gbuffer_view']))
+
+    # G-buffer textures are bound to units 0, 1, 2
+    glUseProgram(shader_program)
+    for i, name in enumerate(['gbuffer_position', 'gbuffer_normal', 'gbuffer_albedo_specular']):
+        glUniform1i(glGetUniformLocation(shader_program, name), i)
+
+    # prepare vaos
+    vao_cube = prepare_vao_cube()
+    vao_empty = glGenVertexArrays(1)    # core profile needs a bound vao even without vertex attributes
+
+    width, height = glfwGetFramebufferSize(window)
+    gbuffer = GBuffer(width, height)
+
+    objects = None
+    objects_view_pos = None
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        if g_run_benchmark:
+            benchmark_shading(window, programs, vao_cube, gbuffer, vao_empty)
+            g_run_benchmark = False
+
+        # rebuild the back-to-front object list only when the camera moves
+        view_pos = get_view_pos()
+        if view_pos != objects_view_pos:
+            objects = get_scene_objects(view_pos)
+            objects_view_pos = view_pos
+
+        width, height = glfwGetFramebufferSize(window)
+        render_frame(programs, vao_cube, gbuffer, vao_empty, width, height, g_use_deferred, objects)
+        glfwSetWindowTitle(window, '8-deferred-shading (%s, %s)'%('deferred' if g_use_deferred else 'forward', g_gbuffer_view_names[g_gbuffer_view]))
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
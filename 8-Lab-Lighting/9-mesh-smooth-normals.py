@@ -0,0 +1,515 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import sys
+import time
+import numpy as np
+
+g_cam_ang = 0.
+g_cam_height = .1
+
+# demo meshes (M key), crease angles in degrees (C key) and normal weighting (A key)
+g_mesh_names = ['cube', 'cylinder', 'sphere']
+g_mesh_index = 0
+g_crease_angles = [180., 60., 30.]
+g_crease_index = 0
+g_weightings = ['angle', 'area']
+g_weighting_index = 0
+g_mesh_changed = True
+
+g_vertex_shader_src = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+
+out vec3 vout_surface_pos;
+out vec3 vout_normal;
+
+uniform mat4 MVP;
+uniform mat4 M;
+uniform mat3 normal_matrix;  // inverse transpose of the upper-left 3x3 of M, computed on the CPU
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_surface_pos = vec3(M * vec4(vin_pos, 1));
+    vout_normal = normalize( normal_matrix * vin_normal);
+}
+'''
+
+g_fragment_shader_src = '''
+#version 330 core
+
+in vec3 vout_surface_pos;
+in vec3 vout_normal;  // interpolated normal
+
+out vec4 FragColor;
+
+uniform vec3 view_pos;
+
+void main()
+{
+    // light and material properties
+    vec3 light_pos = vec3(3,2,4);
+    vec3 light_color = vec3(1,1,1);
+    vec3 material_color = vec3(1,0,0);
+    float material_shininess = 32.0;
+
+    // light components
+    vec3 light_ambient = 0.1*light_color;
+    vec3 light_diffuse = light_color;
+    vec3 light_specular = light_color;
+
+    // material components
+    vec3 material_ambient = material_color;
+    vec3 material_diffuse = material_color;
+    vec3 material_specular = vec3(1,1,1);  // for non-metal material
+
+    // ambient
+    vec3 ambient = light_ambient * material_ambient;
+
+    // for diffiuse and specular
+    vec3 normal = normalize(vout_normal);
+    vec3 surface_pos = vout_surface_pos;
+    vec3 light_dir = normalize(light_pos - surface_pos);
+
+    // diffuse
+    float diff = max(dot(normal, light_dir), 0);
+    vec3 diffuse = diff * light_diffuse * material_diffuse;
+
+    // specular
+    vec3 view_dir = normalize(view_pos - surface_pos);
+    vec3 reflect_dir = reflect(-light_dir, normal);
+    float spec = pow( max(dot(view_dir, reflect_dir), 0.0), material_shininess);
+    vec3 specular = spec * light_specular * material_specular;
+
+    vec3 color = ambient + diffuse + specular;
+    FragColor = vec4(color, 1.);
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height, g_mesh_index, g_crease_index, g_weighting_index, g_mesh_changed
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+            elif key==GLFW_KEY_M and action==GLFW_PRESS:
+                g_mesh_index = (g_mesh_index + 1) % len(g_mesh_names)
+                g_mesh_changed = True
+            elif key==GLFW_KEY_C and action==GLFW_PRESS:
+                g_crease_index = (g_crease_index + 1) % len(g_crease_angles)
+                g_mesh_changed = True
+            elif key==GLFW_KEY_A and action==GLFW_PRESS:
+                g_weighting_index = (g_weighting_index + 1) % len(g_weightings)
+                g_mesh_changed = True
+
+def hash_cells(cells, dims):
+    # cell coordinates -> row-major cell index wrapped to 64 bits. nearby cells get nearby keys, which keeps the neighbor lookups
+    # cache friendly. for very large grids different cells can share a key, so matches are always checked against the coordinates
+    c = cells.astype(np.uint64)
+    return (c[:, 0] * dims[1] + c[:, 1]) * dims[2] + c[:, 2]
+
+def weld_vertices(positions, tolerance):
+    # merge vertices closer than tolerance using a hash grid with cell size = tolerance.
+    # return (welded positions, remap) where remap[i] is the welded index of positions[i]
+    cells = np.floor(positions / tolerance).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    dims = (cells.max(axis=0) + 2).astype(np.uint64)
+    hashes = hash_cells(cells, dims)
+
+    # vertices in the same cell are merged
+    order = np.argsort(hashes)
+    sorted_cells = cells[order]
+    is_new = np.ones(len(order), bool)
+    is_new[1:] = np.any(sorted_cells[1:] != sorted_cells[:-1], axis=1)
+    if np.any(is_new[1:] & (hashes[order[1:]] == hashes[order[:-1]])):
+        # cells sharing a key: also sort by coordinates so that each cell stays contiguous
+        order = np.lexsort((cells[:, 2], cells[:, 1], cells[:, 0], hashes))
+        sorted_cells = cells[order]
+        is_new[1:] = np.any(sorted_cells[1:] != sorted_cells[:-1], axis=1)
+    remap = np.empty(len(order), np.int64)
+    remap[order] = np.cumsum(is_new) - 1
+    first = order[is_new]
+    reps = positions[first]
+    rep_cells = cells[first]
+    keys = hashes[first]    # sorted
+
+    # end of each run of equal keys
+    run_ends = np.append(np.nonzero(keys[1:] != keys[:-1])[0] + 1, len(keys))
+    run_ends = np.repeat(run_ends, np.diff(run_ends, prepend=0))
+
+    # vertices within tolerance can also straddle a cell boundary: compare each cell with its 13 forward neighbors
+    edges = []
+    for offset in [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1) if (x, y, z) > (0, 0, 0)]:
+        neighbor_cells = rep_cells + offset
+        neighbor_keys = hash_cells(neighbor_cells, dims)
+        start = np.minimum(np.searchsorted(keys, neighbor_keys), len(keys)-1)
+        counts = np.where(keys[start] == neighbor_keys, run_ends[start] - start, 0)
+
+        # every cell with a matching hash is a candidate; keep the ones with matching coordinates
+        i = np.repeat(np.arange(len(keys)), counts)
+        j = np.repeat(start, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        same = np.all(rep_cells[j] == neighbor_cells[i], axis=1)
+        i, j = i[same], j[same]
+        close = np.linalg.norm(reps[i] - reps[j], axis=1) <= tolerance
+        edges.append((i[close], j[close]))
+
+    # merge connected cells by propagating the smallest label
+    a = np.concatenate([e[0] for e in edges])
+    b = np.concatenate([e[1] for e in edges])
+    labels = np.arange(len(keys))
+    while len(a):
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, a, labels[b])
+        np.minimum.at(new_labels, b, labels[a])
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    roots, labels = np.unique(labels, return_inverse=True)
+    return reps[roots], labels.reshape(-1)[remap]
+
+def get_corner_weights(p, face_normals, weighting):
+    # weight of each triangle corner's contribution to its vertex normal
+    if weighting == 'area':
+        return np.repeat(np.linalg.norm(face_normals, axis=1)[:, None], 3, axis=1)   # twice the triangle area
+    # angle at each corner
+    a = np.roll(p, -1, axis=1) - p
+    b = np.roll(p, -2, axis=1) - p
+    return np.arctan2(np.linalg.norm(np.cross(a, b), axis=2), np.einsum('ijk,ijk->ij', a, b))
+
+def get_creased_normals(corner_vertices, corner_unit_normals, contributions, crease_angle, max_pairs):
+    # for each corner, sum the contributions of the corners sharing its vertex whose face normals are within crease_angle.
+    # every pair of corners sharing a vertex is compared, in chunks of at most max_pairs pairs
+    cos_crease = np.cos(np.radians(crease_angle))
+    order = np.argsort(corner_vertices, kind='stable')
+    _, starts, counts = np.unique(corner_vertices[order], return_index=True, return_counts=True)
+    degrees = np.repeat(counts, counts)
+    group_starts = np.repeat(starts, counts)
+    pair_ends = np.cumsum(degrees)
+
+    normals = np.empty((len(order), 3))
+    chunk_start = 0
+    while chunk_start < len(order):
+        base = pair_ends[chunk_start] - degrees[chunk_start]
+        chunk_end = max(np.searchsorted(pair_ends, base + max_pairs, side='right'), chunk_start + 1)
+        d = degrees[chunk_start:chunk_end]
+        rows = np.repeat(np.arange(chunk_end - chunk_start), d)
+        local = np.arange(len(rows)) - np.repeat(np.cumsum(d) - d, d)
+        me = order[chunk_start + rows]
+        other = order[np.repeat(group_starts[chunk_start:chunk_end], d) + local]
+
+        keep = np.einsum('ij,ij->i', corner_unit_normals[me], corner_unit_normals[other]) >= cos_crease
+        w = contributions[other] * keep[:, None]
+        normals[order[chunk_start:chunk_end]] = np.stack([np.bincount(rows, w[:, k], chunk_end - chunk_start) for k in range(3)], axis=1)
+        chunk_start = chunk_end
+    return normals
+
+def compute_corner_normals(positions, triangles, crease_angle=180., weighting='angle', max_pairs=1<<22):
+    # smooth normal for each triangle corner, shape (len(triangles)*3, 3).
+    # a corner only averages faces around its vertex whose normals are within crease_angle (degrees) of its own face normal
+    p = positions[triangles]
+    face_normals = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+    lengths = np.linalg.norm(face_normals, axis=1)
+    unit_normals = face_normals / np.maximum(lengths, 1e-30)[:, None]
+    weights = get_corner_weights(p, face_normals, weighting)
+
+    corner_vertices = triangles.reshape(-1)
+    corner_faces = np.repeat(np.arange(len(triangles)), 3)
+    contributions = (weights[:, :, None] * unit_normals[:, None, :]).reshape(-1, 3)
+    corner_unit_normals = unit_normals[corner_faces]
+
+    # smooth normal of each vertex
+    sums = np.stack([np.bincount(corner_vertices, contributions[:, k], len(positions)) for k in range(3)], axis=1)
+    normals = sums[corner_vertices]
+
+    if crease_angle < 180.:
+        # if every face normal around a vertex is within crease_angle/2 of the average, no pair of them can be a crease.
+        # only the remaining vertices need the pairwise test
+        average = sums / np.maximum(np.linalg.norm(sums, axis=1), 1e-30)[:, None]
+        near_average = np.einsum('ij,ij->i', corner_unit_normals, average[corner_vertices]) >= np.cos(np.radians(crease_angle*.5))
+        creased = np.bincount(corner_vertices, ~near_average, len(positions)) > 0
+        corners = np.nonzero(creased[corner_vertices])[0]
+        normals[corners] = get_creased_normals(corner_vertices[corners], corner_unit_normals[corners], contributions[corners], crease_angle, max_pairs)
+
+    # fall back to the face normal where the weights cancel out
+    lengths = np.linalg.norm(normals, axis=1)
+    bad = lengths < 1e-12
+    normals[bad] = corner_unit_normals[bad]
+    lengths[bad] = 1.
+    return normals / lengths[:, None]
+
+def build_indexed_mesh(positions, triangles, corner_normals):
+    # share one vertex between corners with the same position and normal.
+    # return (interleaved float32 vertices [x,y,z,nx,ny,nz], uint32 indices)
+    corner_normals = corner_normals.astype(np.float32)
+    normal_bits = corner_normals.view(np.int32)
+    corner_vertices = triangles.reshape(-1)
+    order = np.lexsort((normal_bits[:, 2], normal_bits[:, 1], normal_bits[:, 0], corner_vertices))
+
+    # corners of a smoothing group have bitwise identical normals
+    keys = np.column_stack([corner_vertices, normal_bits])[order]
+    is_new = np.ones(len(order), bool)
+    is_new[1:] = np.any(keys[1:] != keys[:-1], axis=1)
+    indices = np.empty(len(order), np.uint32)
+    indices[order] = np.cumsum(is_new) - 1
+
+    first = order[is_new]
+    vertices = np.empty((len(first), 6), np.float32)
+    vertices[:, :3] = positions[corner_vertices[first]]
+    vertices[:, 3:] = corner_normals[first]
+    return vertices, indices.reshape(-1, 3)
+
+def preprocess_mesh(positions, triangles=None, tolerance=None, crease_angle=180., weighting='angle'):
+    # weld, compute smooth normals and build an indexed interleaved mesh.
+    # positions: (n,3); triangles: (m,3) vertex indices, or None for a triangle soup (every 3 positions form a triangle)
+    positions = np.asarray(positions, np.float64).reshape(-1, 3)
+    if triangles is None:
+        triangles = np.arange(len(positions)).reshape(-1, 3)
+    triangles = np.asarray(triangles, np.int64).reshape(-1, 3)
+    if tolerance is None:
+        tolerance = 1e-6 * max(np.linalg.norm(positions.max(axis=0) - positions.min(axis=0)), 1e-30)
+
+    welded, remap = weld_vertices(positions, tolerance)
+    triangles = remap[triangles]
+
+    # welding can collapse tiny triangles
+    triangles = triangles[(triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 2] != triangles[:, 0])]
+
+    normals = compute_corner_normals(welded, triangles, crease_angle, weighting)
+    return build_indexed_mesh(welded, triangles, normals)
+
+def make_cube_soup():
+    # 12 triangles, 36 corners (same as the facenorm labs)
+    v = np.array([[-1,1,1], [1,1,1], [1,-1,1], [-1,-1,1], [-1,1,-1], [1,1,-1], [1,-1,-1], [-1,-1,-1]], np.float64)
+    tris = [0,2,1, 0,3,2, 4,5,6, 4,6,7, 0,1,5, 0,5,4, 3,6,2, 3,7,6, 1,2,6, 1,6,5, 0,7,3, 0,4,7]
+    return v[tris]
+
+def make_cylinder_soup(segments=32):
+    # side and caps as separate triangles; the cap edges are 90 degree creases
+    ang = np.arange(segments + 1) * 2*np.pi / segments
+    ring = np.stack([np.cos(ang), np.sin(ang)], axis=1)
+    top = np.column_stack([ring[:, 0], np.ones(segments + 1), ring[:, 1]])
+    bottom = top * (1, -1, 1)
+    i = np.arange(segments)
+    side = np.stack([top[i], bottom[i+1], bottom[i], top[i], top[i+1], bottom[i+1]], axis=1).reshape(-1, 3, 3)
+    top_cap = np.stack([np.broadcast_to((0, 1, 0), (segments, 3)), top[i+1], top[i]], axis=1)
+    bottom_cap = np.stack([np.broadcast_to((0, -1, 0), (segments, 3)), bottom[i], bottom[i+1]], axis=1)
+    return np.concatenate([side, top_cap, bottom_cap]).reshape(-1, 3)
+
+def make_sphere_soup(num_lat=16, num_lon=32):
+    # uv sphere with every quad split into 2 triangles of its own (no shared vertices)
+    lat = np.linspace(0, np.pi, num_lat + 1)
+    lon = np.linspace(0, 2*np.pi, num_lon + 1)
+    lat, lon = np.meshgrid(lat, lon, indexing='ij')
+    p = np.stack([np.sin(lat)*np.sin(lon), np.cos(lat), np.sin(lat)*np.cos(lon)], axis=2)
+    p00, p01, p10, p11 = p[:-1, :-1], p[:-1, 1:], p[1:, :-1], p[1:, 1:]
+    quads = np.stack([p00, p10, p11, p00, p11, p01], axis=2).reshape(-1, 2, 3, 3)
+
+    # the triangles touching the poles are degenerate on one side; drop them
+    quads = quads.reshape(num_lat, num_lon, 2, 3, 3)
+    tris = np.concatenate([quads[0, :, 0], quads[1:-1].reshape(-1, 3, 3), quads[-1, :, 1]])
+    return tris.reshape(-1, 3)
+
+def make_mesh(name):
+    if name == 'cube':
+        return make_cube_soup()
+    elif name == 'cylinder':
+        return make_cylinder_soup()
+    else:
+        return make_sphere_soup()
+
+def benchmark_preprocess(num_lat=1000, num_lon=1000):
+    # time each stage on a large triangle soup with slightly jittered duplicate vertices
+    soup = make_sphere_soup(num_lat, num_lon)
+    soup += np.random.default_rng(0).normal(scale=1e-8, size=soup.shape)
+    print('mesh preprocessing benchmark: %d triangles, %d corners'%(len(soup)//3, len(soup)))
+
+    start = time.perf_counter()
+    tolerance = 1e-6 * np.linalg.norm(soup.max(axis=0) - soup.min(axis=0))
+    welded, remap = weld_vertices(soup, tolerance)
+    triangles = remap.reshape(-1, 3)
+    t_weld = time.perf_counter()
+    normals = compute_corner_normals(welded, triangles, 60.)
+    t_normals = time.perf_counter()
+    vertices, indices = build_indexed_mesh(welded, triangles, normals)
+    t_build = time.perf_counter()
+
+    print('  weld:    %6.2f s (%d -> %d vertices)'%(t_weld - start, len(soup), len(welded)))
+    print('  normals: %6.2f s'%(t_normals - t_weld))
+    print('  build:   %6.2f s (%d vertices, %d triangles)'%(t_build - t_normals, len(vertices), len(indices)))
+    print('  total:   %6.2f s'%(t_build - start))
+
+def prepare_vao_mesh(vertices, indices):
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO & EBO
+    VBO = glGenBuffers(1)
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)
+    EBO = glGenBuffers(1)
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, EBO)
+
+    # copy vertex & index data
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+    glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    return VAO, [VBO, EBO]
+
+def main():
+    global g_mesh_changed
+
+    if 'benchmark' in sys.argv[1:]:
+        benchmark_preprocess()
+        return
+
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '9-mesh-smooth-normals', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders
+    shader_program = load_shaders(g_vertex_shader_src, g_fragment_shader_src)
+
+    # get uniform locations
+    loc_MVP = glGetUniformLocation(shader_program, 'MVP')
+    loc_M = glGetUniformLocation(shader_program, 'M')
+    loc_normal_matrix = glGetUniformLocation(shader_program, 'normal_matrix')
+    loc_view_pos = glGetUniformLocation(shader_program, 'view_pos')
+
+    vao_mesh = None
+    buffers = []
+    num_indices = 0
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        # rebuild the mesh when the mesh or normal settings change
+        if g_mesh_changed:
+            vertices, indices = preprocess_mesh(make_mesh(g_mesh_names[g_mesh_index]), crease_angle=g_crease_angles[g_crease_index], weighting=g_weightings[g_weighting_index])
+            if vao_mesh is not None:
+                glDeleteVertexArrays(1, [vao_mesh])
+                glDeleteBuffers(len(buffers), buffers)
+            vao_mesh, buffers = prepare_vao_mesh(vertices, indices)
+            num_indices = indices.size
+            glfwSetWindowTitle(window, '9-mesh-smooth-normals (%s, crease %g, %s weighting, %d vertices)'%(g_mesh_names[g_mesh_index], g_crease_angles[g_crease_index], g_weightings[g_weighting_index], len(vertices)))
+            g_mesh_changed = False
+
+        # enable depth test (we'll see details later)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        # projection matrix
+        P = glm.perspective(45, 1, 1, 20)
+
+        # view matrix
+        view_pos = glm.vec3(5*np.sin(g_cam_ang),g_cam_height,5*np.cos(g_cam_ang))
+        V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+        M = glm.mat4()
+
+        # update uniforms
+        MVP = P*V*M
+        glUseProgram(shader_program)
+        glUniformMatrix4fv(loc_MVP, 1, GL_FALSE, glm.value_ptr(MVP))
+        glUniformMatrix4fv(loc_M, 1, GL_FALSE, glm.value_ptr(M))
+
+        # normal matrix: computed once per object instead of once per vertex in the shader
+        normal_matrix = glm.transpose(glm.inverse(glm.mat3(M)))
+        glUniformMatrix3fv(loc_normal_matrix, 1, GL_FALSE, glm.value_ptr(normal_matrix))
+        glUniform3f(loc_view_pos, view_pos.x, view_pos.y, view_pos.z)
+
+        # draw the preprocessed mesh
+        glBindVertexArray(vao_mesh)
+        glDrawElements(GL_TRIANGLES, num_indices, GL_UNSIGNED_INT, None)
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,7 @@ out vec3 vout_normal;
 
 uniform mat4 MVP;
 uniform mat4 M;
+uniform mat3 normal_matrix;  // inverse transpose of the upper-left 3x3 of M, computed on the CPU
 
 void main()
 {
@@ -25,7 +26,7 @@ void main()
     gl_Position = MVP * p3D_in_hcoord;
 
     vout_surface_pos = vec3(M * vec4(vin_pos, 1));
-    vout_normal = normalize( mat3(inverse(transpose(M)) ) * vin_normal);
+    vout_normal = normalize( normal_matrix * vin_normal);
 }
 '''
 
@@ -287,9 +288,13 @@ def draw_frame(vao, MVP, unif_locs):
     glBindVertexArray(vao)
     glDrawArrays(GL_LINES, 0, 6)
 
-def draw_cube(vao, MVP, M, matcolor, unif_locs):
+def draw_cube(vao, MVP, M, matcolor, unif_locs, normal_matrix=None):
+    # normal matrix is computed once per cube here (or passed in, if already computed) instead of per vertex in the shader
+    if normal_matrix is None:
+        normal_matrix = glm.transpose(glm.inverse(glm.mat3(M)))
     glUniformMatrix4fv(unif_locs['MVP'], 1, GL_FALSE, glm.value_ptr(MVP))
     glUniformMatrix4fv(unif_locs['M'], 1, GL_FALSE, glm.value_ptr(M))
+    glUniformMatrix3fv(unif_locs['normal_matrix'], 1, GL_FALSE, glm.value_ptr(normal_matrix))
     glUniform3f(unif_locs['material_color'], matcolor.r, matcolor.g, matcolor.b)
     glBindVertexArray(vao)
     glDrawArrays(GL_TRIANGLES, 0, 36)
@@ -315,7 +320,7 @@ def main():
 
     # load shaders & get uniform locations
     shader_lighting = load_shaders(g_vertex_shader_src_lighting, g_fragment_shader_src_lighting)
-    unif_names = ['MVP', 'M', 'view_pos', 'material_color']
+    unif_names = ['MVP', 'M', 'normal_matrix', 'view_pos', 'material_color']
     unif_locs_lighting = {}
     for name in unif_names:
         unif_locs_lighting[name] = glGetUniformLocation(shader_lighting, name)
@@ -0,0 +1,591 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import numpy as np
+
+g_cam_ang = 0.
+g_cam_height = .1
+
+# True: slerp by exp & log maps of rotation matrices / False: slerp by quaternions
+g_use_exp_log = False
+
+g_vertex_shader_src_lighting = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+
+out vec3 vout_surface_pos;
+out vec3 vout_normal;
+
+uniform mat4 MVP;
+uniform mat4 M;
+uniform mat3 normal_matrix;  // inverse transpose of the upper-left 3x3 of M, computed on the CPU
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_surface_pos = vec3(M * vec4(vin_pos, 1));
+    vout_normal = normalize( normal_matrix * vin_normal);
+}
+'''
+
+g_fragment_shader_src_lighting = '''
+#version 330 core
+
+in vec3 vout_surface_pos;
+in vec3 vout_normal;
+
+out vec4 FragColor;
+
+uniform vec3 view_pos;
+uniform vec3 material_color;
+
+void main()
+{
+    // light and material properties
+    vec3 light_pos = vec3(3,2,4);
+    vec3 light_color = vec3(1,1,1);
+    float material_shininess = 32.0;
+
+    // light components
+    vec3 light_ambient = 0.1*light_color;
+    vec3 light_diffuse = light_color;
+    vec3 light_specular = light_color;
+
+    // material components
+    vec3 material_ambient = material_color;
+    vec3 material_diffuse = material_color;
+    vec3 material_specular = vec3(1,1,1);  // for non-metal material
+
+    // ambient
+    vec3 ambient = light_ambient * material_ambient;
+
+    // for diffiuse and specular
+    vec3 normal = normalize(vout_normal);
+    vec3 surface_pos = vout_surface_pos;
+    vec3 light_dir = normalize(light_pos - surface_pos);
+
+    // diffuse
+    float diff = max(dot(normal, light_dir), 0);
+    vec3 diffuse = diff * light_diffuse * material_diffuse;
+
+    // specular
+    vec3 view_dir = normalize(view_pos - surface_pos);
+    vec3 reflect_dir = reflect(-light_dir, normal);
+    float spec = pow( max(dot(view_dir, reflect_dir), 0.0), material_shininess);
+    vec3 specular = spec * light_specular * material_specular;
+
+    vec3 color = ambient + diffuse + specular;
+    FragColor = vec4(color, 1.);
+}
+'''
+
+g_vertex_shader_src_color = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_color; 
+
+out vec4 vout_color;
+
+uniform mat4 MVP;
+
+void main()
+{
+    // 3D points in homogeneous coordinates
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_color = vec4(vin_color, 1.);
+}
+'''
+
+g_fragment_shader_src_color = '''
+#version 330 core
+
+in vec4 vout_color;
+
+out vec4 FragColor;
+
+void main()
+{
+    FragColor = vout_color;
+}
+'''
+
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height, g_use_exp_log
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+            elif key==GLFW_KEY_E and action==GLFW_PRESS:
+                g_use_exp_log = not g_use_exp_log
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 36 vertices for 12 triangles
+    vertices = glm.array(glm.float32,
+        # position      normal
+        -1 ,  1 ,  1 ,  0, 0, 1, # v0
+         1 , -1 ,  1 ,  0, 0, 1, # v2
+         1 ,  1 ,  1 ,  0, 0, 1, # v1
+
+        -1 ,  1 ,  1 ,  0, 0, 1, # v0
+        -1 , -1 ,  1 ,  0, 0, 1, # v3
+         1 , -1 ,  1 ,  0, 0, 1, # v2
+
+        -1 ,  1 , -1 ,  0, 0,-1, # v4
+         1 ,  1 , -1 ,  0, 0,-1, # v5
+         1 , -1 , -1 ,  0, 0,-1, # v6
+
+        -1 ,  1 , -1 ,  0, 0,-1, # v4
+         1 , -1 , -1 ,  0, 0,-1, # v6
+        -1 , -1 , -1 ,  0, 0,-1, # v7
+
+        -1 ,  1 ,  1 ,  0, 1, 0, # v0
+         1 ,  1 ,  1 ,  0, 1, 0, # v1
+         1 ,  1 , -1 ,  0, 1, 0, # v5
+
+        -1 ,  1 ,  1 ,  0, 1, 0, # v0
+         1 ,  1 , -1 ,  0, 1, 0, # v5
+        -1 ,  1 , -1 ,  0, 1, 0, # v4
+ 
+        -1 , -1 ,  1 ,  0,-1, 0, # v3
+         1 , -1 , -1 ,  0,-1, 0, # v6
+         1 , -1 ,  1 ,  0,-1, 0, # v2
+
+        -1 , -1 ,  1 ,  0,-1, 0, # v3
+        -1 , -1 , -1 ,  0,-1, 0, # v7
+         1 , -1 , -1 ,  0,-1, 0, # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0, # v1
+         1 , -1 ,  1 ,  1, 0, 0, # v2
+         1 , -1 , -1 ,  1, 0, 0, # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0, # v1
+         1 , -1 , -1 ,  1, 0, 0, # v6
+         1 ,  1 , -1 ,  1, 0, 0, # v5
+
+        -1 ,  1 ,  1 , -1, 0, 0, # v0
+        -1 , -1 , -1 , -1, 0, 0, # v7
+        -1 , -1 ,  1 , -1, 0, 0, # v3
+
+        -1 ,  1 ,  1 , -1, 0, 0, # v0
+        -1 ,  1 , -1 , -1, 0, 0, # v4
+        -1 , -1 , -1 , -1, 0, 0, # v7
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    return VAO
+
+def prepare_vao_frame():
+    # prepare vertex data (in main memory)
+    vertices = glm.array(glm.float32,
+        # position # color
+         0, 0, 0,  1, 0, 0, # x-axis start
+         1, 0, 0,  1, 0, 0, # x-axis end 
+         0, 0, 0,  0, 1, 0, # y-axis start
+         0, 1, 0,  0, 1, 0, # y-axis end 
+         0, 0, 0,  0, 0, 1, # z-axis start
+         0, 0, 1,  0, 0, 1, # z-axis end 
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex colors
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    return VAO
+
+def draw_frame(vao, MVP, unif_locs):
+    glUniformMatrix4fv(unif_locs['MVP'], 1, GL_FALSE, glm.value_ptr(MVP))
+    glBindVertexArray(vao)
+    glDrawArrays(GL_LINES, 0, 6)
+
+def draw_cube(vao, MVP, M, matcolor, unif_locs, normal_matrix=None):
+    # normal matrix is computed once per cube here (or passed in, if already computed) instead of per vertex in the shader
+    if normal_matrix is None:
+        normal_matrix = glm.transpose(glm.inverse(glm.mat3(M)))
+    glUniformMatrix4fv(unif_locs['MVP'], 1, GL_FALSE, glm.value_ptr(MVP))
+    glUniformMatrix4fv(unif_locs['M'], 1, GL_FALSE, glm.value_ptr(M))
+    glUniformMatrix3fv(unif_locs['normal_matrix'], 1, GL_FALSE, glm.value_ptr(normal_matrix))
+    glUniform3f(unif_locs['material_color'], matcolor.r, matcolor.g, matcolor.b)
+    glBindVertexArray(vao)
+    glDrawArrays(GL_TRIANGLES, 0, 36)
+
+def ZYXEulerToRotMat(angles):
+    zang, yang, xang = angles
+    Rx = glm.rotate(xang, (1,0,0))
+    Ry = glm.rotate(yang, (0,1,0))
+    Rz = glm.rotate(zang, (0,0,1))
+    return glm.mat3(Rz * Ry * Rx)
+
+# batched versions of rotation operations
+# - quaternions: (N,4) arrays in (w, x, y, z) order, same as glm.quat(w, x, y, z)
+# - rotation matrices: (N,3,3) arrays in the usual math (row-major) convention, same as np.array(glm.mat3)
+
+eps = 1e-6
+
+def rotmats_to_quats(R):
+    # Shepperd's method: pick the largest of 4w^2, 4x^2, 4y^2, 4z^2 for each matrix
+    # to avoid dividing by a small number, then compute the others from it
+    m00, m11, m22 = R[:,0,0], R[:,1,1], R[:,2,2]
+    trace = m00 + m11 + m22
+    diag = np.stack([trace, m00, m11, m22], axis=1)
+    case = np.argmax(diag, axis=1)
+
+    q = np.empty((len(R), 4), dtype=R.dtype)
+
+    c = case == 0
+    s = np.sqrt(1. + trace[c]) * 2   # s = 4w
+    q[c, 0] = .25 * s
+    q[c, 1] = (R[c,2,1] - R[c,1,2]) / s
+    q[c, 2] = (R[c,0,2] - R[c,2,0]) / s
+    q[c, 3] = (R[c,1,0] - R[c,0,1]) / s
+
+    c = case == 1
+    s = np.sqrt(1. + m00[c] - m11[c] - m22[c]) * 2   # s = 4x
+    q[c, 0] = (R[c,2,1] - R[c,1,2]) / s
+    q[c, 1] = .25 * s
+    q[c, 2] = (R[c,0,1] + R[c,1,0]) / s
+    q[c, 3] = (R[c,0,2] + R[c,2,0]) / s
+
+    c = case == 2
+    s = np.sqrt(1. + m11[c] - m00[c] - m22[c]) * 2   # s = 4y
+    q[c, 0] = (R[c,0,2] - R[c,2,0]) / s
+    q[c, 1] = (R[c,0,1] + R[c,1,0]) / s
+    q[c, 2] = .25 * s
+    q[c, 3] = (R[c,1,2] + R[c,2,1]) / s
+
+    c = case == 3
+    s = np.sqrt(1. + m22[c] - m00[c] - m11[c]) * 2   # s = 4z
+    q[c, 0] = (R[c,1,0] - R[c,0,1]) / s
+    q[c, 1] = (R[c,0,2] + R[c,2,0]) / s
+    q[c, 2] = (R[c,1,2] + R[c,2,1]) / s
+    q[c, 3] = .25 * s
+
+    return q
+
+def quats_to_rotmats(q):
+    w, x, y, z = q[:,0], q[:,1], q[:,2], q[:,3]
+    R = np.empty((len(q), 3, 3), dtype=q.dtype)
+    R[:,0,0] = 1 - 2*(y*y + z*z)
+    R[:,0,1] = 2*(x*y - w*z)
+    R[:,0,2] = 2*(x*z + w*y)
+    R[:,1,0] = 2*(x*y + w*z)
+    R[:,1,1] = 1 - 2*(x*x + z*z)
+    R[:,1,2] = 2*(y*z - w*x)
+    R[:,2,0] = 2*(x*z - w*y)
+    R[:,2,1] = 2*(y*z + w*x)
+    R[:,2,2] = 1 - 2*(x*x + y*y)
+    return R
+
+def slerp_quats(q1, q2, t):
+    # t: scalar or (N,) array
+    t = np.broadcast_to(np.asarray(t, dtype=q1.dtype), (len(q1),))[:, np.newaxis]
+
+    # q and -q represent the same rotation - flip q2 to take the shortest arc
+    cos_theta = np.sum(q1 * q2, axis=1)
+    sign = np.where(cos_theta < 0, -1., 1.).astype(q1.dtype)
+    q2 = q2 * sign[:, np.newaxis]
+    cos_theta = np.minimum(cos_theta * sign, 1.)[:, np.newaxis]
+
+    theta = np.arccos(cos_theta)
+    sin_theta = np.sin(theta)
+
+    # for almost the same orientations, use lerp instead to avoid dividing by ~0
+    small = sin_theta < eps
+    safe_sin_theta = np.where(small, 1., sin_theta)
+    w1 = np.where(small, 1 - t, np.sin((1 - t) * theta) / safe_sin_theta)
+    w2 = np.where(small, t, np.sin(t * theta) / safe_sin_theta)
+
+    q = w1 * q1 + w2 * q2
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+def slerp(R1, R2, t):
+    # batched version of slerp() in 2-slerp.py - R1, R2: (N,3,3), t: scalar or (N,)
+    return quats_to_rotmats(slerp_quats(rotmats_to_quats(R1), rotmats_to_quats(R2), t))
+
+def skew(v):
+    # (N,3) vectors -> (N,3,3) skew-symmetric matrices, skew(v) @ u == cross(v, u)
+    K = np.zeros((len(v), 3, 3), dtype=v.dtype)
+    K[:,0,1] = -v[:,2]
+    K[:,0,2] = v[:,1]
+    K[:,1,0] = v[:,2]
+    K[:,1,2] = -v[:,0]
+    K[:,2,0] = -v[:,1]
+    K[:,2,1] = v[:,0]
+    return K
+
+def exp(rotvecs):
+    # batched version of exp() in 2-slerp.py - (N,3) rotation vectors -> (N,3,3) rotation matrices
+    # Rodrigues' formula: R = I + a*K + b*K^2 (K = skew(rotvec)),
+    # where a = sin(angle)/angle, b = (1-cos(angle))/angle^2
+    angles = np.linalg.norm(rotvecs, axis=1)
+    small = angles < 1e-4
+
+    # Taylor expansions of a and b for small angles instead of dividing by ~0
+    safe_angles = np.where(small, 1., angles)
+    a2 = angles * angles
+    a = np.where(small, 1. - a2/6. + a2*a2/120., np.sin(angles) / safe_angles)
+    b = np.where(small, .5 - a2/24. + a2*a2/720., (1. - np.cos(angles)) / (safe_angles*safe_angles))
+
+    K = skew(rotvecs)
+    R = np.eye(3, dtype=rotvecs.dtype) + a[:, np.newaxis, np.newaxis] * K + b[:, np.newaxis, np.newaxis] * (K @ K)
+    return R
+
+def log(rotmats):
+    # batched version of log() in 2-slerp.py - (N,3,3) rotation matrices -> (N,3) rotation vectors (angle in [0, pi])
+    R = rotmats
+    cos_angles = np.clip((R[:,0,0] + R[:,1,1] + R[:,2,2] - 1.) * .5, -1., 1.)
+
+    # R - R^T = 2*sin(angle)*skew(axis)
+    w = np.stack([R[:,2,1] - R[:,1,2], R[:,0,2] - R[:,2,0], R[:,1,0] - R[:,0,1]], axis=1)
+    sin_angles = .5 * np.linalg.norm(w, axis=1)
+
+    # atan2 keeps the angle accurate near 0 and pi, unlike arccos(cos_angles)
+    angles = np.arctan2(sin_angles, cos_angles)
+
+    # angle/(2*sin(angle)), with its Taylor expansion for small angles
+    small = angles < 1e-4
+    safe_sin_angles = np.where(small, 1., sin_angles)
+    a2 = angles * angles
+    k = np.where(small, .5 + a2/12. + 7.*a2*a2/720., angles / (2. * safe_sin_angles))
+    rotvecs = k[:, np.newaxis] * w
+
+    # near pi, sin(angle) ~ 0 and w loses precision
+    # use the symmetric part instead: (R + R^T)/2 = I + (1-cos(angle))*(axis*axis^T - I)
+    near_pi = cos_angles < -.9
+    if np.any(near_pi):
+        Rp = R[near_pi]
+        c = cos_angles[near_pi]
+        S = .5 * (Rp + np.transpose(Rp, (0,2,1)))
+        A = (S - np.eye(3)) / (1. - c)[:, np.newaxis, np.newaxis] + np.eye(3)   # axis*axis^T
+
+        # take the column of axis*axis^T with the largest diagonal element (= axis * axis[i])
+        i = np.argmax(np.diagonal(A, axis1=1, axis2=2), axis=1)
+        n = np.arange(len(Rp))
+        axes = A[n, :, i] / np.sqrt(A[n, i, i])[:, np.newaxis]
+
+        # axis and -axis are the same rotation at exactly pi, otherwise follow the sign of w
+        sign = np.where(np.sum(axes * w[near_pi], axis=1) < 0, -1., 1.)
+        rotvecs[near_pi] = (sign * angles[near_pi])[:, np.newaxis] * axes
+
+    return rotvecs
+
+def slerp_exp_log(R1, R2, t):
+    # same as slerp() in 2-slerp.py: R1 * exp(t * log(R1^T * R2)), for (N,3,3) arrays
+    t = np.broadcast_to(np.asarray(t, dtype=R1.dtype), (len(R1),))[:, np.newaxis]
+    return R1 @ exp(t * log(np.transpose(R1, (0,2,1)) @ R2))
+
+def random_rotmats(n, rng):
+    # uniformly distributed random rotations from normalized 4D gaussian samples
+    q = rng.standard_normal((n, 4))
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return quats_to_rotmats(q)
+
+def main():
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '4-batch-slerp', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders & get uniform locations
+    shader_lighting = load_shaders(g_vertex_shader_src_lighting, g_fragment_shader_src_lighting)
+    unif_names = ['MVP', 'M', 'normal_matrix', 'view_pos', 'material_color']
+    unif_locs_lighting = {}
+    for name in unif_names:
+        unif_locs_lighting[name] = glGetUniformLocation(shader_lighting, name)
+
+    shader_color = load_shaders(g_vertex_shader_src_color, g_fragment_shader_src_color)
+    unif_names = ['MVP']
+    unif_locs_color = {}
+    for name in unif_names:
+        unif_locs_color[name] = glGetUniformLocation(shader_color, name)
+
+    # prepare vaos
+    vao_cube = prepare_vao_cube()
+    vao_frame = prepare_vao_frame()
+
+    # a grid of num_grid x num_grid axis-cube sets, each of which has its own start & end orientations
+    num_grid = 5
+    num_sets = num_grid * num_grid
+    rng = np.random.default_rng(0)
+    R1 = random_rotmats(num_sets, rng)
+    R2 = random_rotmats(num_sets, rng)
+    positions = [glm.vec3(i - (num_grid-1)/2, j - (num_grid-1)/2, 0) for i in range(num_grid) for j in range(num_grid)]
+
+    # the first set uses the same orientations as 2-slerp.py
+    R1[0] = np.array(ZYXEulerToRotMat((-np.pi*.5, np.pi*.5, 0)))
+    R2[0] = np.array(ZYXEulerToRotMat((0, 0, np.pi*.5)))
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        # enable depth test (we'll see details later)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        # projection matrix
+        P = glm.perspective(45, 1, 1, 20)
+
+        # view matrix
+        view_pos = glm.vec3(5*np.sin(g_cam_ang),g_cam_height,5*np.cos(g_cam_ang))
+        V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+        # draw world frame
+        glUseProgram(shader_color)
+        draw_frame(vao_frame, P*V, unif_locs_color)
+
+        # t is repeatedly increasing from 0.0 to 1.0
+        t = glfwGetTime() % 3 / 3
+
+        # slerp all orientations with a single call
+        # each set has a different phase
+        ts = (t + np.arange(num_sets) / num_sets) % 1.
+        if g_use_exp_log:
+            R = slerp_exp_log(R1, R2, ts)
+        else:
+            R = slerp(R1, R2, ts)
+
+        # set view_pos uniform in shader_lighting
+        glUseProgram(shader_lighting)
+        glUniform3f(unif_locs_lighting['view_pos'], view_pos.x, view_pos.y, view_pos.z)
+
+        # normal matrices of all sets in one batch.
+        # the 4 cubes of a set share the linear part R*S of M, so they share a normal matrix
+        normal_matrices = np.linalg.inv(R * .1).transpose(0, 2, 1)
+
+        # draw cubes
+        for i in range(num_sets):
+            M = glm.translate(positions[i]) * glm.mat4(glm.mat3(R[i])) * glm.scale((.1, .1, .1))
+            normal_matrix = glm.mat3(normal_matrices[i])
+
+            Mo = M * glm.mat4()
+            draw_cube(vao_cube, P*V*Mo, Mo, glm.vec3(.5,.5,.5), unif_locs_lighting, normal_matrix)
+
+            Mx = M * glm.translate((2.5,0,0))
+            draw_cube(vao_cube, P*V*Mx, Mx, glm.vec3(1,0,0), unif_locs_lighting, normal_matrix)
+
+            My = M * glm.translate((0,2.5,0))
+            draw_cube(vao_cube, P*V*My, My, glm.vec3(0,1,0), unif_locs_lighting, normal_matrix)
+
+            Mz = M * glm.translate((0,0,2.5))
+            draw_cube(vao_cube, P*V*Mz, Mz, glm.vec3(0,0,1), unif_locs_lighting, normal_matrix)
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
+
+
@@ -0,0 +1,494 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import numpy as np
+
+g_cam_ang = 0.
+g_cam_height = .1
+
+g_vertex_shader_src_lighting = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+
+out vec3 vout_surface_pos;
+out vec3 vout_normal;
+
+uniform mat4 MVP;
+uniform mat4 M;
+uniform mat3 normal_matrix;  // inverse transpose of the upper-left 3x3 of M, computed on the CPU
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_surface_pos = vec3(M * vec4(vin_pos, 1));
+    vout_normal = normalize( normal_matrix * vin_normal);
+}
+'''
+
+g_fragment_shader_src_lighting = '''
+#version 330 core
+
+in vec3 vout_surface_pos;
+in vec3 vout_normal;
+
+out vec4 FragColor;
+
+uniform vec3 view_pos;
+uniform vec3 material_color;
+
+void main()
+{
+    // light and material properties
+    vec3 light_pos = vec3(3,2,4);
+    vec3 light_color = vec3(1,1,1);
+    float material_shininess = 32.0;
+
+    // light components
+    vec3 light_ambient = 0.1*light_color;
+    vec3 light_diffuse = light_color;
+    vec3 light_specular = light_color;
+
+    // material components
+    vec3 material_ambient = material_color;
+    vec3 material_diffuse = material_color;
+    vec3 material_specular = vec3(1,1,1);  // for non-metal material
+
+    // ambient
+    vec3 ambient = light_ambient * material_ambient;
+
+    // for diffiuse and specular
+    vec3 normal = normalize(vout_normal);
+    vec3 surface_pos = vout_surface_pos;
+    vec3 light_dir = normalize(light_pos - surface_pos);
+
+    // diffuse
+    float diff = max(dot(normal, light_dir), 0);
+    vec3 diffuse = diff * light_diffuse * material_diffuse;
+
+    // specular
+    vec3 view_dir = normalize(view_pos - surface_pos);
+    vec3 reflect_dir = reflect(-light_dir, normal);
+    float spec = pow( max(dot(view_dir, reflect_dir), 0.0), material_shininess);
+    vec3 specular = spec * light_specular * material_specular;
+
+    vec3 color = ambient + diffuse + specular;
+    FragColor = vec4(color, 1.);
+}
+'''
+
+g_vertex_shader_src_color = '''
+#version 330 core
+
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_color; 
+
+out vec4 vout_color;
+
+uniform mat4 MVP;
+
+void main()
+{
+    // 3D points in homogeneous coordinates
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+
+    gl_Position = MVP * p3D_in_hcoord;
+
+    vout_color = vec4(vin_color, 1.);
+}
+'''
+
+g_fragment_shader_src_color = '''
+#version 330 core
+
+in vec4 vout_color;
+
+out vec4 FragColor;
+
+void main()
+{
+    FragColor = vout_color;
+}
+'''
+
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 36 vertices for 12 triangles
+    vertices = glm.array(glm.float32,
+        # position      normal
+        -1 ,  1 ,  1 ,  0, 0, 1, # v0
+         1 , -1 ,  1 ,  0, 0, 1, # v2
+         1 ,  1 ,  1 ,  0, 0, 1, # v1
+
+        -1 ,  1 ,  1 ,  0, 0, 1, # v0
+        -1 , -1 ,  1 ,  0, 0, 1, # v3
+         1 , -1 ,  1 ,  0, 0, 1, # v2
+
+        -1 ,  1 , -1 ,  0, 0,-1, # v4
+         1 ,  1 , -1 ,  0, 0,-1, # v5
+         1 , -1 , -1 ,  0, 0,-1, # v6
+
+        -1 ,  1 , -1 ,  0, 0,-1, # v4
+         1 , -1 , -1 ,  0, 0,-1, # v6
+        -1 , -1 , -1 ,  0, 0,-1, # v7
+
+        -1 ,  1 ,  1 ,  0, 1, 0, # v0
+         1 ,  1 ,  1 ,  0, 1, 0, # v1
+         1 ,  1 , -1 ,  0, 1, 0, # v5
+
+        -1 ,  1 ,  1 ,  0, 1, 0, # v0
+         1 ,  1 , -1 ,  0, 1, 0, # v5
+        -1 ,  1 , -1 ,  0, 1, 0, # v4
+ 
+        -1 , -1 ,  1 ,  0,-1, 0, # v3
+         1 , -1 , -1 ,  0,-1, 0, # v6
+         1 , -1 ,  1 ,  0,-1, 0, # v2
+
+        -1 , -1 ,  1 ,  0,-1, 0, # v3
+        -1 , -1 , -1 ,  0,-1, 0, # v7
+         1 , -1 , -1 ,  0,-1, 0, # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0, # v1
+         1 , -1 ,  1 ,  1, 0, 0, # v2
+         1 , -1 , -1 ,  1, 0, 0, # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0, # v1
+         1 , -1 , -1 ,  1, 0, 0, # v6
+         1 ,  1 , -1 ,  1, 0, 0, # v5
+
+        -1 ,  1 ,  1 , -1, 0, 0, # v0
+        -1 , -1 , -1 , -1, 0, 0, # v7
+        -1 , -1 ,  1 , -1, 0, 0, # v3
+
+        -1 ,  1 ,  1 , -1, 0, 0, # v0
+        -1 ,  1 , -1 , -1, 0, 0, # v4
+        -1 , -1 , -1 , -1, 0, 0, # v7
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    return VAO
+
+def prepare_vao_frame():
+    # prepare vertex data (in main memory)
+    vertices = glm.array(glm.float32,
+        # position # color
+         0, 0, 0,  1, 0, 0, # x-axis start
+         1, 0, 0,  1, 0, 0, # x-axis end 
+         0, 0, 0,  0, 1, 0, # y-axis start
+         0, 1, 0,  0, 1, 0, # y-axis end 
+         0, 0, 0,  0, 0, 1, # z-axis start
+         0, 0, 1,  0, 0, 1, # z-axis end 
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex colors
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    return VAO
+
+class ShaderProgram:
+    # wraps a program built by load_shaders().
+    # all active uniforms are looked up once (name -> location, type, array size), and set() skips the glUniform* call
+    # when the value is the same as the one last uploaded to the program.
+    def __init__(self, vertex_shader_source, fragment_shader_source):
+        self.program = load_shaders(vertex_shader_source, fragment_shader_source)
+        self.uniforms = {}  # name -> (location, type, size); arrays are stored without the '[0]' suffix
+        self.values = {}    # name -> last uploaded data
+        self.num_uploads = 0
+        self.num_skipped = 0
+
+        for i in range(glGetProgramiv(self.program, GL_ACTIVE_UNIFORMS)):
+            name, size, type = glGetActiveUniform(self.program, i)
+            name = name.decode()
+            location = glGetUniformLocation(self.program, name)
+            if location == -1:  # uniform in a uniform block
+                continue
+            if name.endswith('[0]'):
+                name = name[:-3]
+            self.uniforms[name] = (location, int(type), int(size))
+
+    def use(self):
+        glUseProgram(self.program)
+
+    def set(self, name, value):
+        # the program must be in use. names of inactive uniforms are ignored, as glUniform* ignores location -1.
+        # value: a number, a glm vector / matrix, a numpy array, or a sequence of them for array uniforms
+        if name.endswith('[0]'):
+            name = name[:-3]
+        if name not in self.uniforms:
+            return
+        location, type, size = self.uniforms[name]
+        if type not in g_uniform_types:
+            raise TypeError('uniform %s has unsupported type 0x%04X'%(name, type))
+        dtype, shape, upload = g_uniform_types[type]
+
+        # copy the value, so later changes to the caller's object are detected
+        data = np.array(value, dtype)
+        if len(shape) == 2:
+            data = data.reshape((-1,) + shape).swapaxes(1, 2)   # (row, column) as in glm / numpy -> column-major as in OpenGL
+        data = np.ascontiguousarray(data).reshape(-1)
+
+        element_size = int(np.prod(shape))
+        count = data.size // element_size
+        if data.size != count * element_size or not 1 <= count <= size:
+            raise ValueError('uniform %s expects 1 to %d values of shape %s, got %d numbers'%(name, size, shape, data.size))
+
+        if name in self.values and np.array_equal(self.values[name], data):
+            self.num_skipped += 1
+            return
+        upload(location, count, data)
+        self.values[name] = data
+        self.num_uploads += 1
+
+    def reset_stats(self):
+        self.num_uploads = 0
+        self.num_skipped = 0
+
+def matrix_upload(glUniformMatrix):
+    return lambda location, count, data: glUniformMatrix(location, count, GL_FALSE, data)
+
+# uniform type -> (numpy dtype, shape of one value, upload function(location, count, data))
+# shapes of matrices are (rows, columns): GLSL matCxR has C columns and R rows
+g_uniform_types = {
+    GL_FLOAT: (np.float32, (), glUniform1fv),
+    GL_FLOAT_VEC2: (np.float32, (2,), glUniform2fv),
+    GL_FLOAT_VEC3: (np.float32, (3,), glUniform3fv),
+    GL_FLOAT_VEC4: (np.float32, (4,), glUniform4fv),
+    GL_INT: (np.int32, (), glUniform1iv),
+    GL_INT_VEC2: (np.int32, (2,), glUniform2iv),
+    GL_INT_VEC3: (np.int32, (3,), glUniform3iv),
+    GL_INT_VEC4: (np.int32, (4,), glUniform4iv),
+    GL_UNSIGNED_INT: (np.uint32, (), glUniform1uiv),
+    GL_UNSIGNED_INT_VEC2: (np.uint32, (2,), glUniform2uiv),
+    GL_UNSIGNED_INT_VEC3: (np.uint32, (3,), glUniform3uiv),
+    GL_UNSIGNED_INT_VEC4: (np.uint32, (4,), glUniform4uiv),
+    GL_BOOL: (np.int32, (), glUniform1iv),
+    GL_BOOL_VEC2: (np.int32, (2,), glUniform2iv),
+    GL_BOOL_VEC3: (np.int32, (3,), glUniform3iv),
+    GL_BOOL_VEC4: (np.int32, (4,), glUniform4iv),
+    GL_FLOAT_MAT2: (np.float32, (2,2), matrix_upload(glUniformMatrix2fv)),
+    GL_FLOAT_MAT3: (np.float32, (3,3), matrix_upload(glUniformMatrix3fv)),
+    GL_FLOAT_MAT4: (np.float32, (4,4), matrix_upload(glUniformMatrix4fv)),
+    GL_FLOAT_MAT2x3: (np.float32, (3,2), matrix_upload(glUniformMatrix2x3fv)),
+    GL_FLOAT_MAT2x4: (np.float32, (4,2), matrix_upload(glUniformMatrix2x4fv)),
+    GL_FLOAT_MAT3x2: (np.float32, (2,3), matrix_upload(glUniformMatrix3x2fv)),
+    GL_FLOAT_MAT3x4: (np.float32, (4,3), matrix_upload(glUniformMatrix3x4fv)),
+    GL_FLOAT_MAT4x2: (np.float32, (2,4), matrix_upload(glUniformMatrix4x2fv)),
+    GL_FLOAT_MAT4x3: (np.float32, (3,4), matrix_upload(glUniformMatrix4x3fv)),
+}
+
+# samplers are set to texture unit numbers
+for sampler_type in [GL_SAMPLER_1D, GL_SAMPLER_2D, GL_SAMPLER_3D, GL_SAMPLER_CUBE, GL_SAMPLER_2D_RECT, GL_SAMPLER_BUFFER,
+                     GL_SAMPLER_1D_ARRAY, GL_SAMPLER_2D_ARRAY, GL_SAMPLER_2D_MULTISAMPLE, GL_SAMPLER_2D_MULTISAMPLE_ARRAY,
+                     GL_SAMPLER_1D_SHADOW, GL_SAMPLER_2D_SHADOW, GL_SAMPLER_CUBE_SHADOW, GL_SAMPLER_2D_RECT_SHADOW,
+                     GL_SAMPLER_1D_ARRAY_SHADOW, GL_SAMPLER_2D_ARRAY_SHADOW,
+                     GL_INT_SAMPLER_1D, GL_INT_SAMPLER_2D, GL_INT_SAMPLER_3D, GL_INT_SAMPLER_CUBE, GL_INT_SAMPLER_2D_RECT,
+                     GL_INT_SAMPLER_BUFFER, GL_INT_SAMPLER_1D_ARRAY, GL_INT_SAMPLER_2D_ARRAY,
+                     GL_INT_SAMPLER_2D_MULTISAMPLE, GL_INT_SAMPLER_2D_MULTISAMPLE_ARRAY,
+                     GL_UNSIGNED_INT_SAMPLER_1D, GL_UNSIGNED_INT_SAMPLER_2D, GL_UNSIGNED_INT_SAMPLER_3D,
+                     GL_UNSIGNED_INT_SAMPLER_CUBE, GL_UNSIGNED_INT_SAMPLER_2D_RECT, GL_UNSIGNED_INT_SAMPLER_BUFFER,
+                     GL_UNSIGNED_INT_SAMPLER_1D_ARRAY, GL_UNSIGNED_INT_SAMPLER_2D_ARRAY,
+                     GL_UNSIGNED_INT_SAMPLER_2D_MULTISAMPLE, GL_UNSIGNED_INT_SAMPLER_2D_MULTISAMPLE_ARRAY]:
+    g_uniform_types[int(sampler_type)] = (np.int32, (), glUniform1iv)
+
+def draw_frame(vao, MVP, shader):
+    shader.set('MVP', MVP)
+    glBindVertexArray(vao)
+    glDrawArrays(GL_LINES, 0, 6)
+
+def draw_cube(vao, MVP, M, matcolor, shader):
+    shader.set('MVP', MVP)
+    shader.set('M', M)
+    shader.set('normal_matrix', glm.transpose(glm.inverse(glm.mat3(M))))
+    shader.set('material_color', matcolor)
+    glBindVertexArray(vao)
+    glDrawArrays(GL_TRIANGLES, 0, 36)
+
+def main():
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '5-shader-program-uniform-cache', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders - uniform locations are queried by ShaderProgram
+    shader_lighting = ShaderProgram(g_vertex_shader_src_lighting, g_fragment_shader_src_lighting)
+    shader_color = ShaderProgram(g_vertex_shader_src_color, g_fragment_shader_src_color)
+
+    # prepare vaos
+    vao_cube = prepare_vao_cube()
+    vao_frame = prepare_vao_frame()
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        # enable depth test (we'll see details later)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        shader_lighting.reset_stats()
+        shader_color.reset_stats()
+
+        # projection matrix
+        P = glm.perspective(45, 1, 1, 20)
+
+        # view matrix
+        view_pos = glm.vec3(5*np.sin(g_cam_ang),g_cam_height,5*np.cos(g_cam_ang))
+        V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+        # draw world frame - MVP is only uploaded when the camera moves
+        shader_color.use()
+        draw_frame(vao_frame, P*V, shader_color)
+
+        # ZYX Euler angles
+        t = glfwGetTime()
+        xang = t
+        yang = glm.radians(30)
+        zang = glm.radians(30)
+        Rx = glm.rotate(xang, (1,0,0))
+        Ry = glm.rotate(yang, (0,1,0))
+        Rz = glm.rotate(zang, (0,0,1))
+        M = glm.mat4(Rz * Ry * Rx)
+
+        # set view_pos uniform in shader_lighting - skipped unless the camera moved
+        shader_lighting.use()
+        shader_lighting.set('view_pos', view_pos)
+
+        # draw cubes
+        M = M * glm.scale((.25, .25, .25))
+
+        Mo = M * glm.mat4()
+        draw_cube(vao_cube, P*V*Mo, Mo, glm.vec3(.5,.5,.5), shader_lighting)
+
+        Mx = M * glm.translate((2.5,0,0))
+        draw_cube(vao_cube, P*V*Mx, Mx, glm.vec3(1,0,0), shader_lighting)
+
+        My = M * glm.translate((0,2.5,0))
+        draw_cube(vao_cube, P*V*My, My, glm.vec3(0,1,0), shader_lighting)
+
+        Mz = M * glm.translate((0,0,2.5))
+        draw_cube(vao_cube, P*V*Mz, Mz, glm.vec3(0,0,1), shader_lighting)
+
+        num_uploads = shader_lighting.num_uploads + shader_color.num_uploads
+        num_skipped = shader_lighting.num_skipped + shader_color.num_skipped
+        glfwSetWindowTitle(window, '5-shader-program-uniform-cache (%d uniform uploads, %d skipped)'%(num_uploads, num_skipped))
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,484 @@
+from OpenGL.GL import *
+from glfw.GLFW import *
+import glm
+import ctypes
+import numpy as np
+
+g_cam_ang = 0.
+g_cam_height = .1
+
+# uniform block binding points shared by all programs
+g_frame_block_binding = 0
+g_object_block_binding = 1
+
+# lights in the per-frame block: (position, color)
+g_max_lights = 8
+g_lights = [
+    (glm.vec3(3,2,4), glm.vec3(1,1,1)),
+    (glm.vec3(-3,1,-2), glm.vec3(.3,.3,.6)),
+]
+
+# per-frame data shared by every program (std140 layout)
+g_frame_block_src = '''
+struct Light
+{
+    vec4 position;
+    vec4 color;
+};
+
+layout (std140) uniform Frame
+{
+    mat4 P;
+    mat4 V;
+    vec4 view_pos;
+    int num_lights;
+    Light lights[%d];
+};
+'''%g_max_lights
+
+# per-object data; each object's block is a range of one buffer bound with glBindBufferRange
+g_object_block_src = '''
+layout (std140) uniform Object
+{
+    mat4 M;
+    mat3 normal_matrix;
+    vec4 material_color;
+};
+'''
+
+g_vertex_shader_src_lighting = '''
+#version 330 core
+''' + g_frame_block_src + g_object_block_src + '''
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_normal; 
+
+out vec3 vout_surface_pos;
+out vec3 vout_normal;
+
+void main()
+{
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+    vec4 surface_pos = M * p3D_in_hcoord;
+    gl_Position = P * V * surface_pos;
+
+    vout_surface_pos = vec3(surface_pos);
+    vout_normal = normalize(normal_matrix * vin_normal);
+}
+'''
+
+g_fragment_shader_src_lighting = '''
+#version 330 core
+''' + g_frame_block_src + g_object_block_src + '''
+in vec3 vout_surface_pos;
+in vec3 vout_normal;
+
+out vec4 FragColor;
+
+void main()
+{
+    // material properties
+    float material_shininess = 32.0;
+
+    // material components
+    vec3 material_ambient = material_color.rgb;
+    vec3 material_diffuse = material_color.rgb;
+    vec3 material_specular = vec3(1,1,1);  // for non-metal material
+
+    // for diffiuse and specular
+    vec3 normal = normalize(vout_normal);
+    vec3 surface_pos = vout_surface_pos;
+    vec3 view_dir = normalize(view_pos.xyz - surface_pos);
+
+    vec3 color = vec3(0);
+    for (int i = 0; i < num_lights; i++)
+    {
+        vec3 light_pos = lights[i].position.xyz;
+        vec3 light_color = lights[i].color.rgb;
+
+        // light components
+        vec3 light_ambient = 0.1*light_color;
+        vec3 light_diffuse = light_color;
+        vec3 light_specular = light_color;
+
+        // ambient
+        vec3 ambient = light_ambient * material_ambient;
+
+        // diffuse
+        vec3 light_dir = normalize(light_pos - surface_pos);
+        float diff = max(dot(normal, light_dir), 0);
+        vec3 diffuse = diff * light_diffuse * material_diffuse;
+
+        // specular
+        vec3 reflect_dir = reflect(-light_dir, normal);
+        float spec = pow( max(dot(view_dir, reflect_dir), 0.0), material_shininess);
+        vec3 specular = spec * light_specular * material_specular;
+
+        color += ambient + diffuse + specular;
+    }
+    FragColor = vec4(color, 1.);
+}
+'''
+
+g_vertex_shader_src_color = '''
+#version 330 core
+''' + g_frame_block_src + '''
+layout (location = 0) in vec3 vin_pos; 
+layout (location = 1) in vec3 vin_color; 
+
+out vec4 vout_color;
+
+void main()
+{
+    // 3D points in homogeneous coordinates
+    vec4 p3D_in_hcoord = vec4(vin_pos.xyz, 1.0);
+
+    gl_Position = P * V * p3D_in_hcoord;
+
+    vout_color = vec4(vin_color, 1.);
+}
+'''
+
+g_fragment_shader_src_color = '''
+#version 330 core
+
+in vec4 vout_color;
+
+out vec4 FragColor;
+
+void main()
+{
+    FragColor = vout_color;
+}
+'''
+
+def load_shaders(vertex_shader_source, fragment_shader_source):
+    # build and compile our shader program
+    # ------------------------------------
+    
+    # vertex shader 
+    vertex_shader = glCreateShader(GL_VERTEX_SHADER)    # create an empty shader object
+    glShaderSource(vertex_shader, vertex_shader_source) # provide shader source code
+    glCompileShader(vertex_shader)                      # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(vertex_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(vertex_shader)
+        print("ERROR::SHADER::VERTEX::COMPILATION_FAILED\n" + infoLog.decode())
+        
+    # fragment shader
+    fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)    # create an empty shader object
+    glShaderSource(fragment_shader, fragment_shader_source) # provide shader source code
+    glCompileShader(fragment_shader)                        # compile the shader object
+    
+    # check for shader compile errors
+    success = glGetShaderiv(fragment_shader, GL_COMPILE_STATUS)
+    if (not success):
+        infoLog = glGetShaderInfoLog(fragment_shader)
+        print("ERROR::SHADER::FRAGMENT::COMPILATION_FAILED\n" + infoLog.decode())
+
+    # link shaders
+    shader_program = glCreateProgram()               # create an empty program object
+    glAttachShader(shader_program, vertex_shader)    # attach the shader objects to the program object
+    glAttachShader(shader_program, fragment_shader)
+    glLinkProgram(shader_program)                    # link the program object
+
+    # check for linking errors
+    success = glGetProgramiv(shader_program, GL_LINK_STATUS)
+    if (not success):
+        infoLog = glGetProgramInfoLog(shader_program)
+        print("ERROR::SHADER::PROGRAM::LINKING_FAILED\n" + infoLog.decode())
+        
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    return shader_program    # return the shader program
+
+
+def key_callback(window, key, scancode, action, mods):
+    global g_cam_ang, g_cam_height
+    if key==GLFW_KEY_ESCAPE and action==GLFW_PRESS:
+        glfwSetWindowShouldClose(window, GLFW_TRUE);
+    else:
+        if action==GLFW_PRESS or action==GLFW_REPEAT:
+            if key==GLFW_KEY_1:
+                g_cam_ang += np.radians(-10)
+            elif key==GLFW_KEY_3:
+                g_cam_ang += np.radians(10)
+            elif key==GLFW_KEY_2:
+                g_cam_height += .1
+            elif key==GLFW_KEY_W:
+                g_cam_height += -.1
+
+def prepare_vao_cube():
+    # prepare vertex data (in main memory)
+    # 36 vertices for 12 triangles
+    vertices = glm.array(glm.float32,
+        # position      normal
+        -1 ,  1 ,  1 ,  0, 0, 1, # v0
+         1 , -1 ,  1 ,  0, 0, 1, # v2
+         1 ,  1 ,  1 ,  0, 0, 1, # v1
+
+        -1 ,  1 ,  1 ,  0, 0, 1, # v0
+        -1 , -1 ,  1 ,  0, 0, 1, # v3
+         1 , -1 ,  1 ,  0, 0, 1, # v2
+
+        -1 ,  1 , -1 ,  0, 0,-1, # v4
+         1 ,  1 , -1 ,  0, 0,-1, # v5
+         1 , -1 , -1 ,  0, 0,-1, # v6
+
+        -1 ,  1 , -1 ,  0, 0,-1, # v4
+         1 , -1 , -1 ,  0, 0,-1, # v6
+        -1 , -1 , -1 ,  0, 0,-1, # v7
+
+        -1 ,  1 ,  1 ,  0, 1, 0, # v0
+         1 ,  1 ,  1 ,  0, 1, 0, # v1
+         1 ,  1 , -1 ,  0, 1, 0, # v5
+
+        -1 ,  1 ,  1 ,  0, 1, 0, # v0
+         1 ,  1 , -1 ,  0, 1, 0, # v5
+        -1 ,  1 , -1 ,  0, 1, 0, # v4
+ 
+        -1 , -1 ,  1 ,  0,-1, 0, # v3
+         1 , -1 , -1 ,  0,-1, 0, # v6
+         1 , -1 ,  1 ,  0,-1, 0, # v2
+
+        -1 , -1 ,  1 ,  0,-1, 0, # v3
+        -1 , -1 , -1 ,  0,-1, 0, # v7
+         1 , -1 , -1 ,  0,-1, 0, # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0, # v1
+         1 , -1 ,  1 ,  1, 0, 0, # v2
+         1 , -1 , -1 ,  1, 0, 0, # v6
+
+         1 ,  1 ,  1 ,  1, 0, 0, # v1
+         1 , -1 , -1 ,  1, 0, 0, # v6
+         1 ,  1 , -1 ,  1, 0, 0, # v5
+
+        -1 ,  1 ,  1 , -1, 0, 0, # v0
+        -1 , -1 , -1 , -1, 0, 0, # v7
+        -1 , -1 ,  1 , -1, 0, 0, # v3
+
+        -1 ,  1 ,  1 , -1, 0, 0, # v0
+        -1 ,  1 , -1 , -1, 0, 0, # v4
+        -1 , -1 , -1 , -1, 0, 0, # v7
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex normals
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    return VAO
+
+def prepare_vao_frame():
+    # prepare vertex data (in main memory)
+    vertices = glm.array(glm.float32,
+        # position # color
+         0, 0, 0,  1, 0, 0, # x-axis start
+         1, 0, 0,  1, 0, 0, # x-axis end 
+         0, 0, 0,  0, 1, 0, # y-axis start
+         0, 1, 0,  0, 1, 0, # y-axis end 
+         0, 0, 0,  0, 0, 1, # z-axis start
+         0, 0, 1,  0, 0, 1, # z-axis end 
+    )
+
+    # create and activate VAO (vertex array object)
+    VAO = glGenVertexArrays(1)  # create a vertex array object ID and store it to VAO variable
+    glBindVertexArray(VAO)      # activate VAO
+
+    # create and activate VBO (vertex buffer object)
+    VBO = glGenBuffers(1)   # create a buffer object ID and store it to VBO variable
+    glBindBuffer(GL_ARRAY_BUFFER, VBO)  # activate VBO as a vertex buffer object
+
+    # copy vertex data to VBO
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices.ptr, GL_STATIC_DRAW) # allocate GPU memory for and copy vertex data to the currently bound vertex buffer
+
+    # configure vertex positions
+    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), None)
+    glEnableVertexAttribArray(0)
+
+    # configure vertex colors
+    glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * glm.sizeof(glm.float32), ctypes.c_void_p(3*glm.sizeof(glm.float32)))
+    glEnableVertexAttribArray(1)
+
+    return VAO
+
+def bind_uniform_blocks(shader_program):
+    # connect the program's uniform blocks to the shared binding points
+    for name, binding in (('Frame', g_frame_block_binding), ('Object', g_object_block_binding)):
+        index = glGetUniformBlockIndex(shader_program, name)
+        if index != GL_INVALID_INDEX:
+            glUniformBlockBinding(shader_program, index, binding)
+
+def to_std140_mat4(M):
+    # glm matrix -> 16 floats in column-major order
+    return np.array(M, np.float32).T.reshape(-1)
+
+class FrameUniformBuffer:
+    # per-frame camera & light data, uploaded once per frame and bound once for all programs
+    size = 160 + g_max_lights*32
+
+    def __init__(self):
+        self.ubo = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferData(GL_UNIFORM_BUFFER, self.size, None, GL_DYNAMIC_DRAW)
+        glBindBufferBase(GL_UNIFORM_BUFFER, g_frame_block_binding, self.ubo)
+        self.data = np.zeros(self.size//4, np.float32)
+
+    def update(self, P, V, view_pos, lights):
+        # lights: up to g_max_lights (position, color) pairs
+        assert len(lights) <= g_max_lights, 'at most %d lights fit in the Frame block'%g_max_lights
+        data = self.data
+        data[0:16] = to_std140_mat4(P)
+        data[16:32] = to_std140_mat4(V)
+        data[32:35] = view_pos
+        data[36:37].view(np.int32)[0] = len(lights)
+        for i, (position, color) in enumerate(lights):
+            data[40 + i*8 : 43 + i*8] = position
+            data[44 + i*8 : 47 + i*8] = color
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, data.nbytes, data)
+
+class ObjectUniformBuffer:
+    # per-object model matrix, normal matrix and color of all objects in a frame, in one buffer.
+    # each object's block starts at a multiple of GL_UNIFORM_BUFFER_OFFSET_ALIGNMENT so it can be bound with glBindBufferRange
+    block_size = 128
+
+    def __init__(self, max_objects):
+        alignment = glGetIntegerv(GL_UNIFORM_BUFFER_OFFSET_ALIGNMENT)
+        self.stride = (self.block_size + alignment - 1) // alignment * alignment
+        self.max_objects = max_objects
+        self.ubo = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferData(GL_UNIFORM_BUFFER, self.stride*max_objects, None, GL_DYNAMIC_DRAW)
+        self.data = np.zeros((max_objects, self.stride//4), np.float32)
+
+    def update(self, Ms, colors):
+        # Ms: list of glm.mat4, colors: list of glm.vec3. all normal matrices are computed in one batch
+        n = len(Ms)
+        assert n <= self.max_objects
+        M = np.array([np.array(M, np.float32) for M in Ms])
+        normal_matrix = np.linalg.inv(M[:, :3, :3]).transpose(0, 2, 1)
+
+        data = self.data
+        data[:n, 0:16] = M.transpose(0, 2, 1).reshape(n, 16)
+        # std140 mat3: 3 columns, each padded to a vec4
+        data[:n, 16:28].reshape(n, 3, 4)[:, :, :3] = normal_matrix.transpose(0, 2, 1)
+        data[:n, 28:31] = np.array(colors, np.float32)
+
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, n*self.stride, data[:n])
+
+    def bind(self, i):
+        glBindBufferRange(GL_UNIFORM_BUFFER, g_object_block_binding, self.ubo, i*self.stride, self.block_size)
+
+def draw_frame(vao):
+    glBindVertexArray(vao)
+    glDrawArrays(GL_LINES, 0, 6)
+
+def draw_cube(vao, object_index, object_ubo):
+    object_ubo.bind(object_index)
+    glBindVertexArray(vao)
+    glDrawArrays(GL_TRIANGLES, 0, 36)
+
+def main():
+    # initialize glfw
+    if not glfwInit():
+        return
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MAJOR, 3)   # OpenGL 3.3
+    glfwWindowHint(GLFW_CONTEXT_VERSION_MINOR, 3)
+    glfwWindowHint(GLFW_OPENGL_PROFILE, GLFW_OPENGL_CORE_PROFILE)  # Do not allow legacy OpenGl API calls
+    glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE) # for macOS
+
+    # create a window and OpenGL context
+    window = glfwCreateWindow(800, 800, '6-uniform-buffer-objects', None, None)
+    if not window:
+        glfwTerminate()
+        return
+    glfwMakeContextCurrent(window)
+
+    # register event callbacks
+    glfwSetKeyCallback(window, key_callback);
+
+    # load shaders & bind uniform blocks - no per-program uniform locations needed
+    shader_lighting = load_shaders(g_vertex_shader_src_lighting, g_fragment_shader_src_lighting)
+    bind_uniform_blocks(shader_lighting)
+
+    shader_color = load_shaders(g_vertex_shader_src_color, g_fragment_shader_src_color)
+    bind_uniform_blocks(shader_color)
+
+    # prepare uniform buffers
+    frame_ubo = FrameUniformBuffer()
+    object_ubo = ObjectUniformBuffer(16)
+
+    # prepare vaos
+    vao_cube = prepare_vao_cube()
+    vao_frame = prepare_vao_frame()
+
+    # loop until the user closes the window
+    while not glfwWindowShouldClose(window):
+        # enable depth test (we'll see details later)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+
+        # projection matrix
+        P = glm.perspective(45, 1, 1, 20)
+
+        # view matrix
+        view_pos = glm.vec3(5*np.sin(g_cam_ang),g_cam_height,5*np.cos(g_cam_ang))
+        V = glm.lookAt(view_pos, glm.vec3(0,0,0), glm.vec3(0,1,0))
+
+        # upload camera & lights once; every program reads them from the Frame block
+        frame_ubo.update(P, V, view_pos, g_lights)
+
+        # ZYX Euler angles
+        t = glfwGetTime()
+        xang = t
+        yang = glm.radians(30)
+        zang = glm.radians(30)
+        Rx = glm.rotate(xang, (1,0,0))
+        Ry = glm.rotate(yang, (0,1,0))
+        Rz = glm.rotate(zang, (0,0,1))
+        M = glm.mat4(Rz * Ry * Rx)
+
+        # cube transforms & colors, uploaded together
+        M = M * glm.scale((.25, .25, .25))
+        Ms = [M * glm.mat4(), M * glm.translate((2.5,0,0)), M * glm.translate((0,2.5,0)), M * glm.translate((0,0,2.5))]
+        colors = [glm.vec3(.5,.5,.5), glm.vec3(1,0,0), glm.vec3(0,1,0), glm.vec3(0,0,1)]
+        object_ubo.update(Ms, colors)
+
+        # draw world frame
+        glUseProgram(shader_color)
+        draw_frame(vao_frame)
+
+        # draw cubes
+        glUseProgram(shader_lighting)
+        for i in range(len(Ms)):
+            draw_cube(vao_cube, i, object_ubo)
+
+        # swap front and back buffers
+        glfwSwapBuffers(window)
+
+        # poll events
+        glfwPollEvents()
+
+    # terminate glfw
+    glfwTerminate()
+
+if __name__ == "__main__":
+    main()